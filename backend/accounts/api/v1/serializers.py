@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from common.utils import get_image_url
+from common.utils import get_image_url, get_thumbnails
 
 User = get_user_model()
 
@@ -9,6 +9,7 @@ class UserSerializer(serializers.ModelSerializer):
     """Public representation of the user used in API responses."""
 
     profile_picture_url = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = User
@@ -21,12 +22,13 @@ class UserSerializer(serializers.ModelSerializer):
             "last_name",
             "profile_picture",
             "profile_picture_url",
+            "thumbnails",
             "is_active",
             "is_superuser",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "username", "is_active", "is_superuser", "created_at", "updated_at", "profile_picture_url"]
+        read_only_fields = ["id", "username", "is_active", "is_superuser", "created_at", "updated_at", "profile_picture_url", "thumbnails"]
         extra_kwargs = {
             'profile_picture': {'required': False, 'allow_null': True}
         }
@@ -38,6 +40,10 @@ class UserSerializer(serializers.ModelSerializer):
             return get_image_url(request, obj.profile_picture)
         return None
 
+    def get_thumbnails(self, obj):
+        """Get srcsets of the profile picture's resized variants."""
+        return get_thumbnails(self.context.get('request'), obj.profile_picture, obj.profile_picture_variants)
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
@@ -16,6 +16,18 @@ class LoginRequest(Serializer):
     password: str
 
 
+class RefreshRequest(Serializer):
+    """Refresh token to exchange for a new pair."""
+
+    refresh: str
+
+
+class LogoutRequest(Serializer):
+    """Refresh token to revoke along with the access token (optional)."""
+
+    refresh: str | None = None
+
+
 class RegisterRequest(Serializer):
     """Payload for user registration."""
 
@@ -1,35 +1,42 @@
 """
 Accounts API v2 – Django Bolt endpoints.
 Replica of v1 auth and user endpoints using Bolt.
-Uses Depends(get_current_user_async), model_validator in schemas, Conflict for duplicates.
+Uses Depends(get_current_user_async) (served from common.user_cache), model_validator in schemas,
+Conflict for duplicates. Password hashing runs on common.hashing's bounded
+pool; 429 when it is saturated.
 """
+from typing import Annotated
+
 from asgiref.sync import sync_to_async
 
 from django.db.models import Q
-from django.contrib.auth import aauthenticate, get_user_model
-
-from django_bolt import Depends, Request
-from django_bolt.auth import (
-    AllowAny,
-    IsAuthenticated,
-    JWTAuthentication,
-    create_jwt_for_user,
-)
+from django.contrib.auth import get_user_model
+
+from django_bolt import Depends, Request, UploadFile
+from django_bolt.auth import AllowAny, IsAuthenticated, JWTAuthentication
 from django_bolt.exceptions import BadRequest, Conflict, Unauthorized
+from django_bolt.param_functions import File
 
-from common.deps import get_current_user_async
-from common.utils import get_bolt_base_url
+from common.deps import AuthClaims, get_current_claims, get_current_user_async
+from common.hashing import Overloaded, hashing_pool, overloaded
+from common.thumbnails import srcsets
+from common.uploads import UploadRejected, clear_image, max_image_size, store_image, upload_error
+from common.user_cache import user_cache
+from common.utils import absolute_url_builder, get_bolt_base_url
 from core.api import api
 
+from accounts.tokens import InvalidToken, decode_refresh, issue_tokens, revoke
+
 from .schemas import (
     LoginRequest,
+    LogoutRequest,
     PasswordChangeRequest,
+    RefreshRequest,
     RegisterRequest,
     UpdateProfileRequest,
 )
 
 User = get_user_model()
-JWT_EXPIRY = 3600
 
 
 def _user_payload(user, base_url: str | None = None):
@@ -43,16 +50,40 @@ def _user_payload(user, base_url: str | None = None):
         "last_name": user.last_name or "",
         "profile_picture": str(user.profile_picture) if user.profile_picture else None,
         "profile_picture_url": None,
+        "thumbnails": srcsets(
+            user.profile_picture.storage,
+            user.profile_picture_variants,
+            absolute_url_builder(base_url),
+        ),
         "is_active": user.is_active,
         "is_superuser": getattr(user, "is_superuser", False),
         "created_at": user.created_at.isoformat() if hasattr(user, "created_at") and user.created_at else None,
         "updated_at": user.updated_at.isoformat() if hasattr(user, "updated_at") and user.updated_at else None,
     }
     if base_url and user.profile_picture:
-        data["profile_picture_url"] = base_url + user.profile_picture.url
+        data["profile_picture_url"] = absolute_url_builder(base_url)(user.profile_picture.url)
     return data
 
 
+async def _check_password(user, raw_password: str) -> bool:
+    """User.check_password on the hashing pool, saving an upgraded hash."""
+    try:
+        ok, upgraded = await hashing_pool.verify(raw_password, user.password)
+    except Overloaded:
+        raise overloaded()
+    if upgraded:
+        user.password = upgraded
+        await sync_to_async(user.save)(update_fields=["password"])
+    return ok
+
+
+async def _make_password(raw_password: str) -> str:
+    try:
+        return await hashing_pool.make(raw_password)
+    except Overloaded:
+        raise overloaded()
+
+
 # ---- Auth (public) ----
 
 
@@ -63,19 +94,17 @@ def _user_payload(user, base_url: str | None = None):
     tags=["accounts", "auth"],
 )
 async def login(body: LoginRequest):
-    user = await aauthenticate(
-        username=body.username,
-        password=body.password,
-    )
+    # ModelBackend.authenticate, with the hashing moved to the hashing pool
+    user = await User._default_manager.filter(**{User.USERNAME_FIELD: body.username}).afirst()
     if user is None:
+        # Hash anyway so unknown usernames take as long as wrong passwords
+        await _make_password(body.password)
         raise Unauthorized(detail="Invalid credentials.")
-    token = await sync_to_async(create_jwt_for_user)(user, expires_in=JWT_EXPIRY)
+    if not await _check_password(user, body.password) or not user.is_active:
+        raise Unauthorized(detail="Invalid credentials.")
+    tokens = await sync_to_async(issue_tokens)(user)
     payload = await sync_to_async(_user_payload)(user)
-    return {
-        "access": token,
-        "refresh": token,
-        "user": payload,
-    }
+    return {**tokens, "user": payload}
 
 
 @api.post(
@@ -90,30 +119,59 @@ async def register(body: RegisterRequest):
         Q(username=body.username) | Q(email=body.email)
     ).aexists():
         raise Conflict(detail="Username or email already exists.")
-    user = await sync_to_async(User.objects.create_user)(
-        username=body.username,
-        email=body.email,
-        password=body.password,
+    user = User(
+        username=User.normalize_username(body.username),
+        email=User.objects.normalize_email(body.email),
+        password=await _make_password(body.password),
         name=getattr(body, "name", "") or "",
         first_name=getattr(body, "first_name", "") or "",
         last_name=getattr(body, "last_name", "") or "",
     )
-    token = await sync_to_async(create_jwt_for_user)(user, expires_in=JWT_EXPIRY)
+    await sync_to_async(user.save)()
+    tokens = await sync_to_async(issue_tokens)(user)
     payload = await sync_to_async(_user_payload)(user)
-    return {"access": token, "refresh": token, "user": payload}
+    return {**tokens, "user": payload}
 
 
 @api.post(
     "/auth/refresh/",
+    guards=[AllowAny()],
+    summary="Rotate refresh token",
+    tags=["accounts", "auth"],
+)
+async def refresh(body: RefreshRequest):
+    """Exchange a refresh token for a new access/refresh pair; the old one stops working."""
+    try:
+        claims = decode_refresh(body.refresh)
+        user = await user_cache.aget(int(claims["sub"]))
+    except (InvalidToken, ValueError, User.DoesNotExist):
+        raise Unauthorized(detail="Invalid or expired refresh token.")
+    if not user.is_active:
+        raise Unauthorized(detail="Invalid or expired refresh token.")
+    if not await sync_to_async(revoke)(claims["jti"], user.pk, claims["exp"]):
+        raise Unauthorized(detail="Refresh token has already been used.")
+    return await sync_to_async(issue_tokens)(user)
+
+
+@api.post(
+    "/auth/logout/",
     auth=[JWTAuthentication()],
     guards=[IsAuthenticated()],
-    summary="Refresh access token",
+    summary="Revoke tokens",
     tags=["accounts", "auth"],
 )
-async def refresh(request: Request, user=Depends(get_current_user_async)):
-    """Re-issue a new access token from current valid token."""
-    token = await sync_to_async(create_jwt_for_user)(user, expires_in=JWT_EXPIRY)
-    return {"access": token, "refresh": token}
+async def logout(body: LogoutRequest, claims: AuthClaims = Depends(get_current_claims)):
+    """Revoke the access token and, if given, the caller's refresh token."""
+    if claims.jti and claims.exp:
+        await sync_to_async(revoke)(claims.jti, claims.user_id, claims.exp)
+    if body.refresh:
+        try:
+            refresh_claims = decode_refresh(body.refresh)
+        except InvalidToken:
+            refresh_claims = None
+        if refresh_claims and refresh_claims["sub"] == str(claims.user_id):
+            await sync_to_async(revoke)(refresh_claims["jti"], claims.user_id, refresh_claims["exp"])
+    return {"detail": "Logged out."}
 
 
 @api.post(
@@ -123,7 +181,7 @@ async def refresh(request: Request, user=Depends(get_current_user_async)):
     summary="Verify token",
     tags=["accounts", "auth"],
 )
-async def verify(request: Request):
+async def verify(request: Request, claims: AuthClaims = Depends(get_current_claims)):
     return {"detail": "Token is valid."}
 
 
@@ -174,6 +232,37 @@ async def update_profile(
     return await sync_to_async(_user_payload)(user, get_bolt_base_url(request))
 
 
+@api.put(
+    "/users/profile/picture/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Upload profile picture",
+    tags=["accounts", "users"],
+)
+async def upload_profile_picture(
+    request: Request,
+    profile_picture: Annotated[UploadFile, File(max_size=max_image_size())],
+    user=Depends(get_current_user_async),
+):
+    try:
+        await sync_to_async(store_image)(user, "profile_picture", profile_picture.raw_file)
+    except UploadRejected as exc:
+        raise upload_error(exc)
+    return await sync_to_async(_user_payload)(user, get_bolt_base_url(request))
+
+
+@api.delete(
+    "/users/profile/picture/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Remove profile picture",
+    tags=["accounts", "users"],
+)
+async def delete_profile_picture(request: Request, user=Depends(get_current_user_async)):
+    await sync_to_async(clear_image)(user, "profile_picture")
+    return await sync_to_async(_user_payload)(user, get_bolt_base_url(request))
+
+
 @api.post(
     "/users/change-password/",
     auth=[JWTAuthentication()],
@@ -186,10 +275,9 @@ async def change_password(
     body: PasswordChangeRequest,
     user=Depends(get_current_user_async),
 ):
-    ok = await sync_to_async(user.check_password)(body.old_password)
-    if not ok:
+    if not await _check_password(user, body.old_password):
         raise BadRequest(detail="Old password is incorrect.")
-    await sync_to_async(user.set_password)(body.new_password)
+    user.password = await _make_password(body.new_password)
     await sync_to_async(user.save)()
     return {"message": "Password changed successfully."}
 
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 09:10
+
+import common.blobs
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_profile_picture_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=common.blobs.media_storage, upload_to='profile_pictures/'),
+        ),
+    ]
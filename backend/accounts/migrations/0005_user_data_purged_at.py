@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_media_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='data_purged_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
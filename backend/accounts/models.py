@@ -1,8 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 
+from common.blobs import media_storage
+from common.thumbnails import ImageVariantsMixin
+
 
 class TimestampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -13,7 +16,7 @@ class TimestampedModel(models.Model):
         abstract = True
 
 
-class User(AbstractUser, TimestampedModel):
+class User(ImageVariantsMixin, AbstractUser, TimestampedModel):
     """
     Custom user model:
     - Superuser: global admin who can create companies and company admin users.
@@ -23,11 +26,15 @@ class User(AbstractUser, TimestampedModel):
 
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
-    profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='profile_pictures/', storage=media_storage, blank=True, null=True)
+    # Resized copies of `profile_picture` (common.thumbnails)
+    profile_picture_variants = models.JSONField(blank=True, null=True, editable=False)
 
     # Flags / status
     is_active = models.BooleanField(default=True)
     is_deleted = models.BooleanField(default=False)
+    # Set once a deleted user's tasks and categories are purged (todos.user_purge).
+    data_purged_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     # Role flags inside a company
     # is_company_admin = models.BooleanField(default=False)  # Company admin (created by superuser)
@@ -45,6 +52,24 @@ class User(AbstractUser, TimestampedModel):
     #     blank=True,
     # )
 
+    IMAGE_VARIANT_FIELDS = {'profile_picture': 'profile_picture_variants'}
+
+    def save(self, *args, **kwargs):
+        self.images_saving(kwargs)
+        super().save(*args, **kwargs)
+        from common.user_cache import user_cache
+
+        # Drop now so this request sees the write, and again on commit so a
+        # concurrent reader cannot re-cache the pre-commit row.
+        user_cache.invalidate(self.pk)
+        transaction.on_commit(lambda: user_cache.invalidate(self.pk), using=self._state.db)
+        self.images_saved(kwargs.get('update_fields'))
+
+    def thumbnails_built(self):
+        from common.user_cache import user_cache
+
+        user_cache.invalidate(self.pk)
+
     def delete(self, using=None, keep_parents=False):
         """
         Soft delete the user: mark as deleted and inactive, but keep the row.
@@ -58,6 +83,26 @@ class User(AbstractUser, TimestampedModel):
     def __str__(self):
         return self.email
 
+
+class RevokedToken(models.Model):
+    """
+    A token id (jti) that must no longer be accepted: rotated refresh tokens
+    and tokens ended by logout. Rows past expires_at are pruned (accounts.tokens).
+    """
+
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='revoked_tokens')
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='revoked_token_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return self.jti
+
 '''
 Company will be used a Center
 '''
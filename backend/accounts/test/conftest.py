@@ -0,0 +1,14 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        name='Test User',
+        password='testpass123',
+    )
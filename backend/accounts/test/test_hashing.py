@@ -0,0 +1,66 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from accounts.api.v2.schemas import LoginRequest
+from accounts.api.v2.views import login
+from common.hashing import HashingPool, Overloaded
+from django_bolt.exceptions import TooManyRequests, Unauthorized
+
+User = get_user_model()
+
+
+@pytest.fixture
+def pool(settings, monkeypatch):
+    settings.PASSWORD_HASHING = {'EXECUTOR': 'thread', 'WORKERS': 1, 'MAX_PENDING': 4}
+    pool = HashingPool()
+    monkeypatch.setattr('common.hashing.hashing_pool', pool)
+    monkeypatch.setattr('accounts.api.v2.views.hashing_pool', pool)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.django_db
+class TestHashingPool:
+    """Test v2 auth hashes on the bounded hashing pool."""
+
+    def test_login(self, user, pool):
+        """Test login verifies on the pool and records latency."""
+        payload = async_to_sync(login)(LoginRequest(username='testuser', password='testpass123'))
+
+        assert payload['user']['username'] == 'testuser'
+        assert pool.stats()['completed'] == 1
+        assert pool.stats()['latency_ms']['p50'] is not None
+
+    def test_wrong_password(self, user, pool):
+        """Test a wrong password or unknown user is rejected."""
+        for username, password in (('testuser', 'wrong'), ('nobody', 'testpass123')):
+            with pytest.raises(Unauthorized):
+                async_to_sync(login)(LoginRequest(username=username, password=password))
+
+    def test_sheds_when_full(self, user, pool, settings):
+        """Test logins beyond MAX_PENDING get 429 instead of queueing."""
+        settings.PASSWORD_HASHING = {**settings.PASSWORD_HASHING, 'MAX_PENDING': 0}
+
+        with pytest.raises(TooManyRequests) as exc:
+            async_to_sync(login)(LoginRequest(username='testuser', password='testpass123'))
+
+        assert exc.value.headers['Retry-After'] == '1'
+        assert pool.stats()['shed'] == 1
+
+    def test_process_pool(self, settings):
+        """Test hashes made in worker processes verify in this one."""
+        settings.PASSWORD_HASHING = {'EXECUTOR': 'process', 'WORKERS': 1}
+        pool = HashingPool()
+        try:
+            encoded = async_to_sync(pool.make)('testpass123')
+            assert User(password=encoded).check_password('testpass123')
+            assert async_to_sync(pool.verify)('testpass123', encoded) == (True, None)
+        finally:
+            pool.shutdown()
+
+    def test_overloaded_raises(self, settings):
+        """Test the pool itself refuses work past MAX_PENDING."""
+        settings.PASSWORD_HASHING = {'EXECUTOR': 'thread', 'MAX_PENDING': 0}
+
+        with pytest.raises(Overloaded):
+            async_to_sync(HashingPool().make)('testpass123')
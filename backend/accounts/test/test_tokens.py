@@ -0,0 +1,133 @@
+import asyncio
+
+import jwt
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings as django_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from accounts.api.v2.schemas import LogoutRequest, RefreshRequest
+from accounts.api.v2.views import logout, refresh
+from accounts.models import RevokedToken
+from accounts.tokens import InvalidToken, decode_refresh, issue_tokens, revocations
+from common.bloom import BloomFilter
+from common.deps import get_current_claims, get_current_user_id
+from django_bolt.exceptions import Unauthorized
+
+
+@pytest.fixture
+def fresh_revocations():
+    revocations.reset()
+    yield
+    revocations.reset()
+
+
+class FakeRequest:
+    """Request context as Bolt fills it from a validated access token."""
+
+    def __init__(self, access):
+        claims = jwt.decode(access, django_settings.SECRET_KEY, algorithms=['HS256'])
+        self.context = {'user_id': claims['sub'], 'auth_claims': claims}
+
+
+def authenticate(access):
+    return async_to_sync(get_current_user_id)(FakeRequest(access))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('fresh_revocations')
+class TestTokens:
+    """Test rotating refresh tokens and in-memory revocation."""
+
+    def test_pair(self, user):
+        """Test access and refresh tokens differ and only the refresh token decodes as one."""
+        tokens = issue_tokens(user)
+
+        assert tokens['access'] != tokens['refresh']
+        assert decode_refresh(tokens['refresh'])['sub'] == str(user.pk)
+        with pytest.raises(InvalidToken):
+            decode_refresh(tokens['access'])
+
+    def test_refresh_rotates(self, user):
+        """Test a refresh token works once and yields a new pair."""
+        tokens = issue_tokens(user)
+
+        rotated = async_to_sync(refresh)(RefreshRequest(refresh=tokens['refresh']))
+
+        assert rotated['refresh'] != tokens['refresh']
+        assert authenticate(rotated['access']) == user.pk
+        with pytest.raises(Unauthorized):
+            async_to_sync(refresh)(RefreshRequest(refresh=tokens['refresh']))
+
+    def test_logout_revokes(self, user):
+        """Test logout ends both the access and the refresh token."""
+        tokens = issue_tokens(user)
+        claims = async_to_sync(get_current_claims)(FakeRequest(tokens['access']))
+
+        async_to_sync(logout)(LogoutRequest(refresh=tokens['refresh']), claims=claims)
+
+        with pytest.raises(Unauthorized):
+            authenticate(tokens['access'])
+        with pytest.raises(Unauthorized):
+            async_to_sync(refresh)(RefreshRequest(refresh=tokens['refresh']))
+
+    def test_check_is_in_memory(self, user):
+        """Test a live access token is checked without a query once the filter is loaded."""
+        access = issue_tokens(user)['access']
+        authenticate(access)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert authenticate(access) == user.pk
+
+        assert len(ctx.captured_queries) == 0
+
+    def test_other_process_revocation(self, user):
+        """Test revocations written elsewhere are picked up by the next refresh."""
+        access = issue_tokens(user)['access']
+        authenticate(access)
+        claims = jwt.decode(access, django_settings.SECRET_KEY, algorithms=['HS256'])
+
+        RevokedToken.objects.create(jti=claims['jti'], user=user, expires_at='2099-01-01T00:00Z')
+        revocations.load()
+
+        with pytest.raises(Unauthorized):
+            authenticate(access)
+
+    def test_refresh_is_off_the_request(self, user, settings):
+        """Test checks never query the table for a refresh or rebuild, however overdue."""
+        settings.AUTH_TOKENS = {'POLL_INTERVAL': 0, 'REBUILD_INTERVAL': 0}
+        access = issue_tokens(user)['access']
+        authenticate(access)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert authenticate(access) == user.pk
+
+        assert len(ctx.captured_queries) == 0
+
+    def test_background_refresh(self, user, settings):
+        """Test the refresher task picks up a revocation without a check asking for it."""
+        settings.AUTH_TOKENS = {'POLL_INTERVAL': 0.01}
+        claims = jwt.decode(issue_tokens(user)['access'], django_settings.SECRET_KEY, algorithms=['HS256'])
+
+        async def scenario():
+            await revocations.ais_revoked('other')
+            await RevokedToken.objects.acreate(jti=claims['jti'], user=user, expires_at='2099-01-01T00:00Z')
+            refreshes = revocations.refreshes
+            while revocations.refreshes < refreshes + 2:
+                await asyncio.sleep(0.01)
+            return claims['jti'] in revocations._filter
+
+        assert async_to_sync(scenario)()
+
+
+class TestBloomFilter:
+    """Test the Bloom filter backing the revocation check."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported present and few others are."""
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'in-{i}')
+
+        assert all(f'in-{i}' in bloom for i in range(1000))
+        assert sum(f'out-{i}' in bloom for i in range(10000)) < 300
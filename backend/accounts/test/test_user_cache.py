@@ -0,0 +1,76 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from accounts.tokens import revocations
+from common.deps import get_current_claims, get_current_user_async
+from common.user_cache import user_cache
+
+User = get_user_model()
+
+
+class FakeRequest:
+    def __init__(self, user_id, **claims):
+        self.context = {'user_id': str(user_id), 'auth_claims': {'sub': str(user_id), **claims}}
+
+
+@pytest.fixture
+def fresh_cache():
+    user_cache.reset()
+    yield
+    user_cache.reset()
+
+
+def load(user):
+    return async_to_sync(get_current_user_async)(FakeRequest(user.pk))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('fresh_cache')
+class TestUserCache:
+    """Test the cached current-user dependency and its invalidation."""
+
+    def test_second_load_skips_query(self, user):
+        """Test a repeated lookup is served without a query."""
+        load(user)
+        with CaptureQueriesContext(connection) as ctx:
+            cached = load(user)
+
+        assert len(ctx.captured_queries) == 0
+        assert cached.pk == user.pk
+
+    def test_copies_are_private(self, user):
+        """Test changes to a returned user do not leak into the cache."""
+        load(user).name = 'Changed but not saved'
+
+        assert load(user).name == 'Test User'
+
+    def test_save_invalidates(self, user):
+        """Test profile and password changes are visible on the next load."""
+        load(user)
+        fresh = User.objects.get(pk=user.pk)
+        fresh.name = 'Renamed'
+        fresh.set_password('newpass12345')
+        fresh.save()
+
+        loaded = load(user)
+        assert loaded.name == 'Renamed'
+        assert loaded.check_password('newpass12345')
+
+    def test_delete_invalidates(self, user):
+        """Test soft delete is visible on the next load."""
+        load(user)
+        User.objects.get(pk=user.pk).delete()
+
+        assert load(user).is_deleted is True
+
+    def test_claims_need_no_query(self, user):
+        """Test the claims dependency reads only the token."""
+        request = FakeRequest(user.pk, username='testuser', email='test@example.com', jti='abc')
+        revocations.load()  # the revocation filter is built by the process's first check
+        with CaptureQueriesContext(connection) as ctx:
+            claims = async_to_sync(get_current_claims)(request)
+
+        assert len(ctx.captured_queries) == 0
+        assert (claims.user_id, claims.username, claims.jti) == (user.pk, 'testuser', 'abc')
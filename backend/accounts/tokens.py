@@ -0,0 +1,198 @@
+"""
+Access and refresh tokens for the v2 API, and their revocation.
+
+Access tokens are short-lived (ACCESS_TTL) JWTs that Bolt validates. Refresh
+tokens live for REFRESH_TTL, are signed with a key derived from SECRET_KEY
+(so Bolt never takes one as an access token), and are single use:
+/auth/refresh/ revokes the presented token and returns a new pair. Both carry
+a jti.
+
+Revoked jtis are rows of RevokedToken. Each process keeps them in a Bloom
+filter (`revocations`). The first check builds it; from then on a refresher
+task on the serving event loop tops it up with newly revoked rows every
+POLL_INTERVAL seconds and rebuilds it from unexpired rows (pruning the rest)
+every REBUILD_INTERVAL, off the request path. Checking an access token is
+therefore an in-memory lookup; only a filter hit, i.e. a revoked token or a
+rare false positive, is confirmed against the table. A logout handled by
+another worker takes effect here within POLL_INTERVAL.
+
+Settings: AUTH_TOKENS.
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import jwt
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django_bolt.auth import create_jwt_for_user
+
+from accounts.models import RevokedToken
+from common import metrics
+from common.bloom import BloomFilter
+
+DEFAULTS = {
+    "ACCESS_TTL": 300,  # seconds
+    "REFRESH_TTL": 14 * 24 * 3600,
+    "POLL_INTERVAL": 5,
+    "REBUILD_INTERVAL": 3600,
+    "CAPACITY": 100_000,  # revoked, unexpired jtis the filter is sized for
+    "ERROR_RATE": 0.001,
+}
+
+logger = logging.getLogger(__name__)
+
+# Revocations committed this long after their revoked_at are still picked up
+POLL_OVERLAP = timedelta(seconds=60)
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "AUTH_TOKENS", {})}
+
+
+class InvalidToken(Exception):
+    """Bad signature, expired, or not a refresh token."""
+
+
+def _refresh_key() -> str:
+    return salted_hmac("accounts.tokens.refresh", "signing-key").hexdigest()
+
+
+def issue_tokens(user) -> dict:
+    """A new access/refresh pair for the user."""
+    conf = config()
+    now = int(time.time())
+    access = create_jwt_for_user(user, expires_in=conf["ACCESS_TTL"], extra_claims={"jti": uuid.uuid4().hex})
+    refresh = jwt.encode(
+        {
+            "sub": str(user.pk),
+            "jti": uuid.uuid4().hex,
+            "type": "refresh",
+            "iat": now,
+            "exp": now + conf["REFRESH_TTL"],
+        },
+        _refresh_key(),
+        algorithm="HS256",
+    )
+    return {"access": access, "refresh": refresh}
+
+
+def decode_refresh(token: str) -> dict:
+    """Claims of a valid refresh token; raises InvalidToken. Revocation is not checked."""
+    try:
+        claims = jwt.decode(token, _refresh_key(), algorithms=["HS256"], options={"require": ["exp", "jti", "sub"]})
+    except jwt.InvalidTokenError:
+        raise InvalidToken
+    if claims.get("type") != "refresh":
+        raise InvalidToken
+    return claims
+
+
+def revoke(jti: str, user_id: int, exp: int, using=None) -> bool:
+    """Record the jti as revoked until `exp`; False if it already was."""
+    try:
+        with transaction.atomic(using=using):
+            RevokedToken.objects.using(using).create(
+                jti=jti, user_id=user_id, expires_at=datetime.fromtimestamp(exp, tz=dt_timezone.utc)
+            )
+    except IntegrityError:
+        return False
+    transaction.on_commit(lambda: revocations.add(jti), using=using)
+    return True
+
+
+class RevocationList:
+    """Per-process Bloom filter over RevokedToken, refreshed in the background."""
+
+    def __init__(self):
+        self._filter = None
+        self._lock = threading.Lock()
+        self._since = None
+        self._built = 0.0
+        self._task = None
+        self.checks = 0
+        self.filter_hits = 0
+        self.confirmed = 0
+        self.refreshes = 0
+
+    def load(self, initial=False, using=None):
+        """
+        Build the filter, or top it up from the table and rebuild it once
+        REBUILD_INTERVAL is due. With initial=True, only build a missing one.
+        Checks keep using the current filter while this runs.
+        """
+        with self._lock:
+            if initial and self._filter is not None:
+                return
+            conf = config()
+            started, now = time.monotonic(), timezone.now()
+            rows = RevokedToken.objects.using(using)
+            if self._filter is None or started - self._built >= conf["REBUILD_INTERVAL"]:
+                rows.filter(expires_at__lt=now).delete()
+                bloom = BloomFilter(conf["CAPACITY"], conf["ERROR_RATE"])
+                for jti in rows.values_list("jti", flat=True).iterator():
+                    bloom.add(jti)
+                self._filter, self._built = bloom, started
+            else:
+                for jti in rows.filter(revoked_at__gte=self._since - POLL_OVERLAP).values_list("jti", flat=True):
+                    self._filter.add(jti)
+            self._since = now
+
+    def _start_refresher(self):
+        task = self._task
+        if task is None or task.done() or task.get_loop().is_closed():
+            self._task = asyncio.get_running_loop().create_task(self._refresh())
+
+    async def _refresh(self):
+        while self._filter is not None:
+            await asyncio.sleep(config()["POLL_INTERVAL"])
+            try:
+                await sync_to_async(self.load, thread_sensitive=False)()
+            except Exception:
+                logger.exception("Refreshing the token revocation list failed")
+            self.refreshes += 1
+
+    def add(self, jti: str):
+        if self._filter is not None:
+            self._filter.add(jti)
+
+    async def ais_revoked(self, jti: str) -> bool:
+        bloom = self._filter
+        if bloom is None:
+            # Only the process's first checks wait for the table.
+            await sync_to_async(self.load)(initial=True)
+            bloom = self._filter
+        self._start_refresher()
+        self.checks += 1
+        if jti not in bloom:
+            return False
+        self.filter_hits += 1
+        revoked = await RevokedToken.objects.filter(jti=jti).aexists()
+        self.confirmed += revoked
+        return revoked
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+        if self._task is not None and not self._task.get_loop().is_closed():
+            self._task.get_loop().call_soon_threadsafe(self._task.cancel)
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "confirmed": self.confirmed,
+            "refreshes": self.refreshes,
+            "entries": self._filter.count if self._filter is not None else 0,
+        }
+
+
+revocations = RevocationList()
+metrics.register("token_revocations", revocations.stats)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+from .models import MediaBlob
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(ModelAdmin):
+    list_display = ['name', 'size', 'refs', 'referenced_at']
+    search_fields = ['digest', 'name']
+    readonly_fields = ['digest', 'name', 'size', 'refs', 'referenced_at']
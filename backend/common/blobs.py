@@ -0,0 +1,258 @@
+"""
+Content-addressed media storage: settings.STORAGES["media"], used by
+Task.image and User.profile_picture.
+
+Each distinct content is stored once, at
+
+    blobs/<h[:2]>/<h><ext>       h = sha256 of the bytes
+
+and image fields hold that name. A MediaBlob row tracks each blob with a
+reference count; a duplicate upload's bytes are never written. Storing the
+file only registers the blob. The model save that names it adds the
+reference once it commits (ImageVariantsMixin.images_saved), in the same
+callback that releases the name it replaced: re-saving identical content
+changes nothing, and a save that fails adds nothing. Clearing an image, or
+purging a task, releases one. The count is a hint: writes that bypass the
+models can leave it off.
+
+`manage.py sweep_media` collects blobs left at zero references that have not
+been referenced for GRACE seconds. Before deleting anything it recounts the
+image columns that use this storage, and keeps any blob still named there.
+--reconcile recounts every idle blob, which also repairs counts left too
+high. Thumbnails of a collected blob are deleted with it.
+
+Names outside blobs/ (files stored before this backend, thumbnails) are
+plain files.
+"""
+import hashlib
+import os
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from common import metrics
+
+DEFAULTS = {
+    "GRACE": 3600,  # seconds
+    "BATCH_SIZE": 500,
+}
+ALIAS = "media"
+PREFIX = "blobs"
+
+_counters = {"stored": 0, "deduplicated": 0, "released": 0, "collected": 0}
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "MEDIA_BLOBS", {})}
+
+
+def media_storage():
+    """Storage of the image fields (a callable, so migrations name the alias, not a class)."""
+    return storages[ALIAS]
+
+
+def blob_name(digest: str, extension: str) -> str:
+    return f"{PREFIX}/{digest[:2]}/{digest}{extension}"
+
+
+def is_blob(name: str | None) -> bool:
+    return bool(name) and name.startswith(PREFIX + "/")
+
+
+def content_digest(content) -> str:
+    digest = getattr(content, "sha256", None)  # already hashed by common.uploads
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def register(digest: str, name: str, size: int, using=None):
+    """
+    The blob row for `digest`, created if needed. Renews referenced_at, so the
+    sweep leaves the blob alone for GRACE while the save naming it commits.
+    """
+    from common.models import MediaBlob
+
+    blobs = MediaBlob.objects.using(using)
+    while True:
+        blob, created = blobs.get_or_create(
+            digest=digest, defaults={"name": name, "size": size, "referenced_at": timezone.now()}
+        )
+        # 0 rows: the sweep deleted it since the read; create it again.
+        if created or blobs.filter(pk=blob.pk).update(referenced_at=timezone.now()):
+            return blob
+
+
+def _by_count(names) -> dict:
+    by_count = defaultdict(list)
+    for name, n in Counter(name for name in names if is_blob(name)).items():
+        by_count[n].append(name)
+    return by_count
+
+
+def retain(names, using=None):
+    """Add one reference per occurrence of each blob name in `names`."""
+    from common.models import MediaBlob
+
+    for n, group in _by_count(names).items():
+        MediaBlob.objects.using(using).filter(name__in=group).update(
+            refs=F("refs") + n, referenced_at=timezone.now()
+        )
+
+
+def release(names, using=None):
+    """Drop one reference per occurrence of each blob name in `names`."""
+    from common.models import MediaBlob
+
+    for n, group in _by_count(names).items():
+        MediaBlob.objects.using(using).filter(name__in=group).update(refs=Greatest(F("refs") - n, 0))
+        _counters["released"] += n * len(group)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores uploads under their content hash, once."""
+
+    def _save(self, name, content):
+        digest = content_digest(content)
+        blob = register(digest, blob_name(digest, os.path.splitext(name)[1].lower()), content.size)
+        if self.exists(blob.name):
+            _counters["deduplicated"] += 1
+            return blob.name
+        stored = super()._save(blob.name, content)
+        if stored != blob.name:
+            # An identical upload wrote the blob first; drop the renamed copy.
+            super().delete(stored)
+        _counters["stored"] += 1
+        return blob.name
+
+    def retain(self, names, using=None):
+        retain(names, using)
+
+    def release(self, names, using=None):
+        release(names, using)
+
+    def delete(self, name):
+        """Blobs are released here and deleted by the sweep; other files are deleted."""
+        if is_blob(name):
+            release([name])
+        else:
+            super().delete(name)
+
+    def plain(self) -> FileSystemStorage:
+        """The same location without content addressing, for derived files such as thumbnails."""
+        return FileSystemStorage(
+            location=self.location,
+            base_url=self.base_url,
+            file_permissions_mode=self.file_permissions_mode,
+            directory_permissions_mode=self.directory_permissions_mode,
+        )
+
+
+# ---- Sweep ----
+
+
+def image_fields():
+    """(model, column) of every file field stored in a ContentAddressedStorage."""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                yield model, field.attname
+
+
+def reference_counts(names, using=None) -> Counter:
+    counts = Counter()
+    for model, column in image_fields():
+        rows = (
+            model._base_manager.using(using)
+            .filter(**{f"{column}__in": names})
+            .values_list(column)
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        counts.update(dict(rows))
+    return counts
+
+
+def _variants_in_use(digests, using) -> set:
+    """Digests whose thumbnails a row still names (files stored before this backend)."""
+    used = set()
+    for model in apps.get_models():
+        for variants_field in getattr(model, "IMAGE_VARIANT_FIELDS", {}).values():
+            used.update(
+                model._base_manager.using(using)
+                .filter(**{f"{variants_field}__digest__in": digests})
+                .values_list(f"{variants_field}__digest", flat=True)
+            )
+    return used
+
+
+def _collect(storage, rows, using):
+    from common.thumbnails import delete_variants
+
+    plain = storage.plain()
+    for _, name, _, _ in rows:
+        plain.delete(name)
+    in_use = _variants_in_use([digest for _, _, digest, _ in rows], using)
+    for _, _, digest, _ in rows:
+        if digest not in in_use:
+            delete_variants(plain, digest)
+
+
+def sweep(reconcile: bool = False, batch_size: int | None = None, grace: int | None = None, using=None) -> dict:
+    """
+    Delete idle blobs nothing names, one small transaction per batch.
+    Without `reconcile` only blobs whose count reached zero are looked at.
+    """
+    from common.models import MediaBlob
+
+    conf = config()
+    batch_size = batch_size or conf["BATCH_SIZE"]
+    cutoff = timezone.now() - timedelta(seconds=conf["GRACE"] if grace is None else grace)
+    storage = media_storage()
+    idle = MediaBlob.objects.using(using).filter(referenced_at__lt=cutoff)
+    if not reconcile:
+        idle = idle.filter(refs=0)
+    counts = {"scanned": 0, "collected": 0, "bytes": 0, "recounted": 0}
+    last = 0
+    while batch := list(idle.filter(pk__gt=last).order_by("pk").values_list("pk", "name")[:batch_size]):
+        last = batch[-1][0]
+        counts["scanned"] += len(batch)
+        refs = reference_counts([name for _, name in batch], using)
+        with transaction.atomic(using=using):
+            # Locked and re-checked: an upload since the scan bumped referenced_at.
+            locked = MediaBlob.objects.using(using).select_for_update().filter(
+                pk__in=[pk for pk, _ in batch], referenced_at__lt=cutoff
+            )
+            rows = []
+            for pk, name, digest, size, current in locked.values_list("pk", "name", "digest", "size", "refs"):
+                if refs[name]:
+                    if current != refs[name]:
+                        MediaBlob.objects.using(using).filter(pk=pk).update(refs=refs[name])
+                        counts["recounted"] += 1
+                else:
+                    rows.append((pk, name, digest, size))
+            if rows:
+                MediaBlob.objects.using(using).filter(pk__in=[row[0] for row in rows]).delete()
+                # Before commit: an upload of the same bytes waits on the rows, then rewrites the file.
+                _collect(storage, rows, using)
+        counts["collected"] += len(rows)
+        counts["bytes"] += sum(row[3] for row in rows)
+    _counters["collected"] += counts["collected"]
+    return counts
+
+
+def stats() -> dict:
+    return dict(_counters)
+
+
+metrics.register("media_blobs", stats)
@@ -0,0 +1,33 @@
+"""
+Fixed-size Bloom filter for in-process membership checks.
+No false negatives; false positives at roughly `error_rate` once `capacity`
+items are in. Callers confirm a positive against the source of truth.
+"""
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str):
+        # Double hashing (Kirsch–Mitzenmacher) over one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        a, b = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(a + i * b) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        positions = self._positions(item)
+        with self._lock:
+            for p in positions:
+                self._bits[p >> 3] |= 1 << (p & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
@@ -2,28 +2,106 @@
 Async dependencies for Django Bolt handlers.
 Use these instead of django_bolt.auth.get_current_user to avoid SynchronousOnlyOperation
 (Bolt's get_current_user uses sync ORM; our async version uses User.objects.aget).
+
+Prefer get_current_user_id / get_current_claims: they read the token Bolt
+already validated and never touch the database. get_current_user_async is
+for handlers that need the full row and is served from common.user_cache.
+All three reject revoked tokens (accounts.tokens, an in-memory check).
 """
+from dataclasses import dataclass
 
 from django.contrib.auth import get_user_model
 
 from django_bolt.exceptions import Unauthorized
 
+from common.user_cache import user_cache
 
-async def get_current_user_async(request):
-    """
-    Async dependency: load current user from JWT context using async ORM.
-    Use with Depends(get_current_user_async) in Bolt handlers.
-    """
+
+@dataclass(frozen=True, slots=True)
+class AuthClaims:
+    """Identity from a validated JWT; values are as of token issue."""
+
+    user_id: int
+    username: str | None = None
+    email: str | None = None
+    is_staff: bool = False
+    is_superuser: bool = False
+    jti: str | None = None
+    exp: int | None = None
+
+
+def _context(request) -> dict:
     context = getattr(request, "context", None)
     if context is None and callable(getattr(request, "get", None)):
         context = request.get("context", {})
+    return context or {}
+
+
+def _context_user_id(request) -> int:
+    """User id from the JWT context Bolt validated in Rust; raises Unauthorized."""
+    context = _context(request)
     if not context:
         raise Unauthorized(detail="Authentication required.")
     user_id = context.get("user_id") or context.get("sub")
     if user_id is None:
         raise Unauthorized(detail="Authentication required.")
-    User = get_user_model()
     try:
-        return await User.objects.aget(pk=user_id)
-    except User.DoesNotExist:
+        return int(user_id)
+    except (TypeError, ValueError):
+        raise Unauthorized(detail="Authentication required.")
+
+
+def _claims(request) -> dict:
+    context = _context(request)
+    return context.get("auth_claims") or context.get("claims") or {}
+
+
+async def _authenticated_user_id(request) -> int:
+    """_context_user_id, also rejecting tokens revoked by logout."""
+    from accounts.tokens import revocations
+
+    user_id = _context_user_id(request)
+    jti = _claims(request).get("jti")
+    if jti and await revocations.ais_revoked(jti):
+        raise Unauthorized(detail="Token has been revoked.")
+    return user_id
+
+
+async def get_current_user_id(request) -> int:
+    """
+    Async dependency: authenticated user id from the token, without a DB query.
+    Use with Depends(get_current_user_id) when a handler only scopes queries by user.
+    """
+    return await _authenticated_user_id(request)
+
+
+async def get_current_claims(request) -> AuthClaims:
+    """
+    Async dependency: user id plus selected JWT claims, without a DB query.
+    Claims are as fresh as the token; load the user when that is not enough.
+    """
+    user_id = await _authenticated_user_id(request)
+    context = _context(request)
+    claims = _claims(request)
+    return AuthClaims(
+        user_id=user_id,
+        username=claims.get("username"),
+        email=claims.get("email"),
+        is_staff=bool(context.get("is_staff", claims.get("is_staff", False))),
+        is_superuser=bool(context.get("is_superuser", claims.get("is_superuser", False))),
+        jti=claims.get("jti"),
+        exp=claims.get("exp"),
+    )
+
+
+async def get_current_user_async(request):
+    """
+    Async dependency: current user from JWT context, via the TTL user cache.
+    Use with Depends(get_current_user_async) in Bolt handlers that need the row;
+    each call gets its own copy, safe to modify and save.
+    """
+    user_id = await _authenticated_user_id(request)
+    try:
+        return await user_cache.aget(user_id)
+    except get_user_model().DoesNotExist:
         raise Unauthorized(detail="User not found.")
@@ -0,0 +1,137 @@
+"""
+Password hashing off the event loop, on a dedicated bounded pool.
+
+PBKDF2 is deliberately slow. Run through sync_to_async it would occupy the
+thread-sensitive executor that every ORM call shares, so a burst of logins
+would stall unrelated endpoints. The v2 auth handlers hash and verify here
+instead: on a process pool by default (hashing holds the GIL), WORKERS wide.
+
+At most MAX_PENDING hashes may be queued or running; beyond that `make` and
+`verify` raise Overloaded, which the handlers turn into 429 so a login storm
+is shed instead of queued. Latency (queue wait included) is in common.metrics
+under "password_hashing".
+
+Settings: PASSWORD_HASHING. EXECUTOR is "process" or "thread".
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django_bolt.exceptions import TooManyRequests
+
+from common import metrics
+
+DEFAULTS = {
+    "EXECUTOR": "process",
+    "WORKERS": min(4, os.cpu_count() or 1),
+    "MAX_PENDING": 64,
+    "RETRY_AFTER": 1,  # seconds, sent with the 429
+}
+
+LATENCY_WINDOW = 1024
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "PASSWORD_HASHING", {})}
+
+
+class Overloaded(Exception):
+    """Too many hashes already queued."""
+
+
+def _init_worker(password_hashers):
+    # Spawned workers have no Django settings; hashing only needs the hashers.
+    if not settings.configured:
+        settings.configure(PASSWORD_HASHERS=password_hashers)
+
+
+def _make(raw_password):
+    return hashers.make_password(raw_password)
+
+
+def _verify(raw_password, encoded):
+    """Return (matches, re-hashed password if the stored hash is outdated)."""
+    upgraded = []
+    ok = hashers.check_password(raw_password, encoded, setter=lambda raw: upgraded.append(hashers.make_password(raw)))
+    return ok, (upgraded[0] if upgraded else None)
+
+
+class HashingPool:
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.shed = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                conf = config()
+                if conf["EXECUTOR"] == "thread":
+                    self._executor = ThreadPoolExecutor(conf["WORKERS"], thread_name_prefix="hashing")
+                else:
+                    self._executor = ProcessPoolExecutor(
+                        conf["WORKERS"], initializer=_init_worker, initargs=(settings.PASSWORD_HASHERS,)
+                    )
+            return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.pending >= config()["MAX_PENDING"]:
+                self.shed += 1
+                raise Overloaded
+            self.pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self._latencies.append(time.perf_counter() - started)
+
+    async def make(self, raw_password: str) -> str:
+        """Hash a new password; raises Overloaded."""
+        return await self._run(_make, raw_password)
+
+    async def verify(self, raw_password: str, encoded: str) -> tuple[bool, str | None]:
+        """Check a password against its hash; raises Overloaded."""
+        return await self._run(_verify, raw_password, encoded)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        def ms(q):
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else None
+
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "shed": self.shed,
+            "latency_ms": {"p50": ms(0.5), "p95": ms(0.95), "max": ms(1)},
+        }
+
+
+def overloaded() -> TooManyRequests:
+    return TooManyRequests(
+        detail="Too many sign-in attempts in progress; retry shortly.",
+        headers={"Retry-After": str(config()["RETRY_AFTER"])},
+    )
+
+
+hashing_pool = HashingPool()
+metrics.register("password_hashing", hashing_pool.stats)
@@ -0,0 +1,28 @@
+"""
+Delete content-addressed media blobs that no row names any more.
+
+    python manage.py sweep_media                   # blobs released to zero references
+    python manage.py sweep_media --reconcile       # recount every idle blob
+    python manage.py sweep_media --grace 0 --batch-size 200
+"""
+from django.core.management.base import BaseCommand
+
+from common.blobs import sweep
+
+
+class Command(BaseCommand):
+    help = "Garbage-collect unreferenced media blobs in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reconcile", action="store_true",
+                            help="Recount references of all idle blobs, not only those at zero.")
+        parser.add_argument("--grace", type=int, default=None,
+                            help="Seconds a blob must be unreferenced (default: MEDIA_BLOBS['GRACE']).")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        counts = sweep(options["reconcile"], options["batch_size"], options["grace"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Collected {counts['collected']} of {counts['scanned']} blob(s), "
+            f"freeing {counts['bytes']} byte(s); recounted {counts['recounted']}."
+        ))
@@ -0,0 +1,16 @@
+"""
+In-process metrics registry.
+Components register a zero-argument callable returning a dict; the admin-only
+GET /api/v2/metrics/ endpoint returns a snapshot of all of them.
+"""
+from collections.abc import Callable
+
+_sources: dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, source: Callable[[], dict]):
+    _sources[name] = source
+
+
+def snapshot() -> dict:
+    return {name: source() for name, source in sorted(_sources.items())}
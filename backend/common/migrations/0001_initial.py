@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.BigIntegerField()),
+                ('refs', models.PositiveIntegerField(default=0)),
+                ('referenced_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['refs', 'referenced_at'], name='media_blob_sweep_idx')],
+            },
+        ),
+    ]
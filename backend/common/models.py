@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file of the content-addressed media storage (common.blobs),
+    shared by every image field row naming it.
+    """
+
+    digest = models.CharField(max_length=64, unique=True)  # sha256 of the content
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    # References added by uploads minus those released; the sweep recounts before deleting.
+    refs = models.PositiveIntegerField(default=0)
+    referenced_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['refs', 'referenced_at'], name='media_blob_sweep_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
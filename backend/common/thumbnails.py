@@ -0,0 +1,335 @@
+"""
+Resized WebP/JPEG variants of uploaded images (Task.image, User.profile_picture).
+
+When a write that changed an image commits, the stored file is queued here.
+A coordinator thread reads and hashes it and hands decoding and encoding
+to a bounded process pool (Pillow work is CPU-bound). Variants land in the
+field's storage under content-hash names:
+
+    thumbs/<h[:2]>/<h>-<width>.<webp|jpg>    one per width and format
+    thumbs/<h[:2]>/<h>.json                  manifest, written last
+
+An upload whose manifest already exists is only hashed, so identical
+images share one set of files. Variants are written verbatim even when the
+original's storage is content-addressed (common.blobs), which hands out a
+plain() storage for them. Once the variants exist, the row's variants
+column is set to {"digest", "widths", "formats"} and payloads expose them as
+srcset strings; until then, and for files Pillow cannot read, there are no
+thumbnails and clients use the original.
+
+Settings: IMAGE_VARIANTS. Jobs beyond MAX_PENDING are dropped;
+`manage.py build_thumbnails` catches up on anything without variants.
+"""
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from common import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "WIDTHS": [160, 480, 960],
+    "FORMATS": ["webp", "jpeg"],
+    "QUALITY": 80,
+    "WORKERS": 2,
+    "MAX_PENDING": 100,
+}
+PREFIX = "thumbs"
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "IMAGE_VARIANTS", {})}
+
+
+def _stem(digest: str) -> str:
+    return f"{PREFIX}/{digest[:2]}/{digest}"
+
+
+def variant_name(digest: str, width: int, fmt: str) -> str:
+    return f"{_stem(digest)}-{width}.{EXTENSIONS[fmt]}"
+
+
+def srcsets(storage, variants: dict | None, absolute=None) -> dict | None:
+    """{"webp": "<url> 160w, <url> 480w", "jpeg": ...} for a variants record, or None."""
+    if not variants:
+        return None
+    absolute = absolute or (lambda url: url)
+    return {
+        fmt: ", ".join(
+            f"{absolute(storage.url(variant_name(variants['digest'], width, fmt)))} {width}w"
+            for width in variants["widths"]
+        )
+        for fmt in variants["formats"]
+    }
+
+
+def _variants_storage(storage):
+    plain = getattr(storage, "plain", None)
+    return plain() if plain else storage
+
+
+def delete_variants(storage, digest: str):
+    """Delete the variants of `digest`, manifest first so nothing trusts a partial set."""
+    manifest = f"{_stem(digest)}.json"
+    if not storage.exists(manifest):
+        return
+    with storage.open(manifest, "rb") as f:
+        record = json.loads(f.read())
+    storage.delete(manifest)
+    for width in record["widths"]:
+        for fmt in record["formats"]:
+            storage.delete(variant_name(digest, width, fmt))
+
+
+# ---- Rendering (pool processes) ----
+
+
+def _normalize(image):
+    """RGB, or RGBA when the image has transparency."""
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    mode = "RGBA" if has_alpha else "RGB"
+    return image if image.mode == mode else image.convert(mode)
+
+
+def _encode(image, fmt: str, quality: int) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        if image.mode == "RGBA":
+            flat = Image.new("RGB", image.size, "white")
+            flat.paste(image, mask=image.getchannel("A"))
+            image = flat
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, "WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def render(data: bytes, widths, formats, quality: int) -> dict:
+    """
+    Encoded variants of image `data`, {(width, format): bytes}. Never
+    upscales: widths above the image's own collapse to its width.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG only: decode at the smallest scale still >= the largest width.
+        image.draft("RGB", (max(widths), max(widths)))
+        image = _normalize(ImageOps.exif_transpose(image))
+        variants = {}
+        for width in sorted({min(width, image.width) for width in widths}):
+            if width < image.width:
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            else:
+                resized = image
+            for fmt in formats:
+                variants[(width, fmt)] = _encode(resized, fmt, quality)
+        return variants
+
+
+# ---- Building (coordinator thread) ----
+
+
+def build(storage, name: str, render_fn=render) -> dict:
+    """Variants record for stored file `name`, rendering only what is not stored yet."""
+    conf = config()
+    with storage.open(name, "rb") as f:
+        data = f.read()
+    storage = _variants_storage(storage)
+    digest = hashlib.sha256(data).hexdigest()
+    manifest = f"{_stem(digest)}.json"
+    if storage.exists(manifest):
+        with storage.open(manifest, "rb") as f:
+            return json.loads(f.read())
+    variants = render_fn(data, conf["WIDTHS"], conf["FORMATS"], conf["QUALITY"])
+    for (width, fmt), content in variants.items():
+        target = variant_name(digest, width, fmt)
+        if not storage.exists(target):
+            storage.save(target, ContentFile(content))
+    record = {
+        "digest": digest,
+        "widths": sorted({width for width, _ in variants}),
+        "formats": list(conf["FORMATS"]),
+    }
+    storage.save(manifest, ContentFile(json.dumps(record).encode()))
+    return record
+
+
+def build_for(instance, field: str, variants_field: str, render_fn=render, name: str | None = None) -> dict | None:
+    """
+    Build variants for the image `name` (default: the instance's current
+    one) and store the record on the row, unless its image changed
+    meanwhile. Returns the record if it was stored.
+    """
+    file = getattr(instance, field)
+    name = name or file.name
+    if not name:
+        return None
+    record = build(file.storage, name, render_fn)
+    stored = type(instance)._base_manager.filter(
+        pk=instance.pk, **{field: name}
+    ).update(**{variants_field: record})
+    if not stored:
+        return None
+    after = getattr(instance, "thumbnails_built", None)
+    if after:
+        after()
+    return record
+
+
+def _move_reference(storage, name: str, previous: str, using):
+    if name:
+        storage.retain([name], using=using)
+    if previous:
+        storage.release([previous], using=using)
+
+
+class ImageVariantsMixin:
+    """
+    Model mixin: IMAGE_VARIANT_FIELDS maps image fields to JSON variants
+    fields. Call images_saving(kwargs) before super().save() and
+    images_saved(update_fields) at the end of save(); the latter also
+    releases replaced files in storages that count references (common.blobs).
+    """
+
+    IMAGE_VARIANT_FIELDS = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_images = {field: instance.__dict__.get(field) for field in cls.IMAGE_VARIANT_FIELDS}
+        return instance
+
+    def _changed_images(self, update_fields=None):
+        loaded = self.__dict__.setdefault("_loaded_images", {})
+        for field, variants_field in self.IMAGE_VARIANT_FIELDS.items():
+            if update_fields is not None and field not in update_fields:
+                continue
+            name = getattr(self, field).name or ""
+            previous = loaded.get(field) or ""
+            if name != previous:
+                yield field, variants_field, name, previous
+
+    def images_saving(self, save_kwargs: dict):
+        """Clear stale variants of each image this save replaces, in the save's own UPDATE."""
+        update_fields = save_kwargs.get("update_fields")
+        cleared = [
+            variants_field
+            for _, variants_field, _, _ in self._changed_images(update_fields)
+            if getattr(self, variants_field) is not None
+        ]
+        for variants_field in cleared:
+            setattr(self, variants_field, None)
+        if cleared and update_fields:
+            save_kwargs["update_fields"] = [*update_fields, *cleared]
+        self._cleared_variants = cleared
+
+    def images_saved(self, update_fields=None):
+        """Queue new variants for each image this save changed."""
+        loaded = self.__dict__.setdefault("_loaded_images", {})
+        cleared = self.__dict__.pop("_cleared_variants", ())
+        changed = list(self._changed_images(update_fields))
+        for field, variants_field, name, previous in changed:
+            loaded[field] = name
+            storage = getattr(self, field).storage
+            if hasattr(storage, "retain"):
+                # Counted once the row naming the new blob (and not the old one) commits
+                transaction.on_commit(
+                    lambda storage=storage, name=name, previous=previous: _move_reference(
+                        storage, name, previous, self._state.db
+                    ),
+                    using=self._state.db,
+                )
+            if name:
+                thumbnail_pipeline.schedule(self, field, variants_field, using=self._state.db)
+        kept = set(cleared).difference(variants_field for _, variants_field, _, _ in changed)
+        for field, variants_field in self.IMAGE_VARIANT_FIELDS.items():
+            if variants_field in kept and getattr(self, field).name:
+                # Stored under its old name after all (same content): rebuild what images_saving cleared.
+                thumbnail_pipeline.schedule(self, field, variants_field, using=self._state.db)
+
+
+class ThumbnailPipeline:
+    """Coordinator threads feeding a spawn-based process pool, both WORKERS wide."""
+
+    def __init__(self):
+        self._processes = None
+        self._threads = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.built = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _executors(self):
+        with self._lock:
+            if self._threads is None:
+                workers = config()["WORKERS"]
+                # spawn: forking a threaded server process is unsafe.
+                self._processes = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+                self._threads = ThreadPoolExecutor(workers, thread_name_prefix="thumbnails")
+            return self._threads, self._processes
+
+    def _render(self, data, widths, formats, quality):
+        _, processes = self._executors()
+        return processes.submit(render, data, widths, formats, quality).result()
+
+    def submit(self, instance, field: str, variants_field: str):
+        """Queue variants for the instance's current image; returns a Future, or None if dropped."""
+        with self._lock:
+            if self.pending >= config()["MAX_PENDING"]:
+                self.dropped += 1
+                return None
+            self.pending += 1
+        threads, _ = self._executors()
+        return threads.submit(self._run, instance, field, variants_field, getattr(instance, field).name)
+
+    def _run(self, instance, field, variants_field, name):
+        try:
+            if build_for(instance, field, variants_field, self._render, name) is not None:
+                with self._lock:
+                    self.built += 1
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            logger.exception("Building variants of %s failed", name)
+        finally:
+            with self._lock:
+                self.pending -= 1
+            close_old_connections()
+
+    def schedule(self, instance, field: str, variants_field: str, using=None):
+        """Queue once the current transaction commits."""
+        transaction.on_commit(lambda: self.submit(instance, field, variants_field), using=using)
+
+    def shutdown(self):
+        with self._lock:
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+        if threads is not None:
+            threads.shutdown(wait=True)
+            processes.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "built": self.built,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+thumbnail_pipeline = ThumbnailPipeline()
+metrics.register("thumbnails", thumbnail_pipeline.stats)
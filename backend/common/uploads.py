@@ -0,0 +1,108 @@
+"""
+Image uploads for the v2 API.
+
+Bolt's File(max_size=...) receives the whole body before the handler runs:
+it spools it (to a temporary file past its in-memory threshold) and answers
+413 to an oversized body itself. inspect_image() works on that spooled file
+in place, without copying it: it checks the size, matches the leading bytes
+against known image signatures and hashes the content (sha256). The
+client's filename and content type are ignored: the result is named after
+its content hash and typed by its signature.
+
+store_image() does the whole upload: inspect, attach to the model's image
+field and save, which queues the thumbnails (common.thumbnails). The bytes
+are written once, by the media storage to their blob location
+(common.blobs), and not at all when that content is already stored.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+
+from django_bolt.exceptions import BadRequest, HTTPException
+
+CHUNK_SIZE = 64 * 1024
+# Enough leading bytes for every signature below.
+SNIFF_BYTES = 12
+DEFAULT_ALLOWED_TYPES = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+
+
+class UploadRejected(ValueError):
+    """The upload is not an allowed image."""
+
+
+class UploadTooLarge(UploadRejected):
+    """The upload exceeds the size limit."""
+
+
+def sniff(head: bytes) -> tuple[str, str] | None:
+    """(content type, extension) from an image's leading bytes, or None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg", ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png", ".png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif", ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", ".webp"
+    return None
+
+
+def max_image_size() -> int:
+    # Same limit v1 applies in common.utils.validate_image_file.
+    return getattr(settings, "FILE_UPLOAD_MAX_MEMORY_SIZE", 5242880)
+
+
+def inspect_image(source, max_size: int | None = None, chunk_size: int = CHUNK_SIZE) -> File:
+    """
+    Check and hash `source`, a seekable binary file, in place. Raises
+    UploadTooLarge or UploadRejected. Returns a File over `source`, rewound,
+    named after its hash and with `sha256` and `content_type` set; the
+    caller still owns (and closes) `source`.
+    """
+    max_size = max_image_size() if max_size is None else max_size
+    allowed = getattr(settings, "ALLOWED_IMAGE_TYPES", DEFAULT_ALLOWED_TYPES)
+    size = source.seek(0, os.SEEK_END)
+    if size > max_size:
+        raise UploadTooLarge(f"File size exceeds maximum allowed size of {max_size / 1024 / 1024}MB")
+    source.seek(0)
+    content_type, extension = _check(source.read(SNIFF_BYTES), allowed)
+    source.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        digest.update(chunk)
+    source.seek(0)
+    image = File(source, name=digest.hexdigest()[:32] + extension)
+    image.size = size
+    image.sha256 = digest.hexdigest()
+    image.content_type = content_type
+    return image
+
+
+def _check(head: bytes, allowed) -> tuple[str, str]:
+    kind = sniff(head)
+    if kind is None or kind[0] not in allowed:
+        raise UploadRejected(f"File type not allowed. Allowed types: {', '.join(allowed)}")
+    return kind
+
+
+def store_image(instance, field: str, source, max_size: int | None = None):
+    """Store `source` (see inspect_image) in image `field` of `instance` and save the row."""
+    image = inspect_image(source, max_size)
+    getattr(instance, field).save(image.name, image, save=False)
+    instance.save(update_fields=[field, "updated_at"])
+
+
+def clear_image(instance, field: str):
+    """Unset image `field`; the stored file is left in place."""
+    if not getattr(instance, field):
+        return
+    setattr(instance, field, None)
+    instance.save(update_fields=[field, "updated_at"])
+
+
+def upload_error(exc: UploadRejected) -> HTTPException:
+    if isinstance(exc, UploadTooLarge):
+        return HTTPException(status_code=413, detail=str(exc))
+    return BadRequest(detail=str(exc))
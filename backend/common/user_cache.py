@@ -0,0 +1,68 @@
+"""
+Bounded TTL cache of User rows for Bolt dependencies that need the full user.
+
+User.save (which User.delete, update_profile and change_password all go
+through) invalidates the entry immediately and again on commit. The cache is
+per process, so other workers may serve a changed user for up to TIMEOUT
+seconds (settings.USER_CACHE).
+"""
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from common import metrics
+from common.lru import LocalLRUCache
+
+DEFAULTS = {
+    "MAX_ENTRIES": 1024,
+    "TIMEOUT": 30,
+}
+
+
+class UserCache:
+    def __init__(self):
+        self._cache = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self) -> LocalLRUCache:
+        if self._cache is None:
+            config = {**DEFAULTS, **getattr(settings, "USER_CACHE", {})}
+            self._cache = LocalLRUCache(config["MAX_ENTRIES"], config["TIMEOUT"])
+        return self._cache
+
+    async def aget(self, user_id: int):
+        """
+        Return a private copy of the user, loading it on a miss; raises
+        User.DoesNotExist. Handlers may modify and save the copy freely.
+        """
+        user = self.cache.get(user_id)
+        if user is None:
+            self.misses += 1
+            user = await get_user_model().objects.aget(pk=user_id)
+            self.cache.set(user_id, user)
+        else:
+            self.hits += 1
+        return copy.copy(user)
+
+    def invalidate(self, user_id: int):
+        self.cache.delete(user_id)
+
+    def reset(self):
+        self._cache = None
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+
+user_cache = UserCache()
+metrics.register("user_cache", user_cache.stats)
@@ -54,6 +54,25 @@ def get_image_url(request, image_field):
     return None
 
 
+def get_thumbnails(request, image_field, variants):
+    """
+    Get srcset strings of an image's resized variants (common.thumbnails).
+
+    Args:
+        request: HTTP request object
+        image_field: ImageField instance
+        variants: the model's variants record
+
+    Returns:
+        dict: {"webp": srcset, "jpeg": srcset}, or None until variants exist
+    """
+    from common.thumbnails import srcsets
+
+    if not (image_field and variants and request):
+        return None
+    return srcsets(image_field.storage, variants, request.build_absolute_uri)
+
+
 def get_bolt_base_url(request) -> str | None:
     """
     Build base URL (scheme + host + port) from a Django-Bolt Request scope.
@@ -74,3 +93,13 @@ def get_bolt_base_url(request) -> str | None:
     except Exception:
         return None
 
+
+
+def absolute_url_builder(base_url: str | None):
+    """
+    Return a function joining a storage URL onto base_url (from
+    get_bolt_base_url), or None when there is no base URL to join.
+    """
+    if not base_url:
+        return None
+    return lambda url: base_url + "/" + url.lstrip("/")
@@ -1,5 +1,5 @@
 from django_bolt import BoltAPI
-from django_bolt.auth import AllowAny
+from django_bolt.auth import AllowAny, IsAdminUser, JWTAuthentication
 from django_bolt.openapi import OpenAPIConfig
 
 api = BoltAPI(
@@ -24,5 +24,19 @@ async def health():
     return {"status": "ok"}
 
 
+@api.get(
+    "/metrics/",
+    auth=[JWTAuthentication()],
+    guards=[IsAdminUser()],
+    summary="In-process metrics",
+    tags=["system"],
+)
+async def metrics():
+    """Counters registered through common.metrics (caches, executors, jobs)."""
+    from common.metrics import snapshot
+
+    return snapshot()
+
+
 from accounts.api.v2 import views as accounts_views
 from todos.api.v2 import views as todos_views
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django_bolt",
     
     # Local apps
+    "common",
     "accounts",
     "todos",
 ]
@@ -154,6 +155,83 @@ WHITENOISE_AUTOREFRESH = DEBUG  # Auto-refresh in development mode
 WHITENOISE_MANIFEST_STRICT = False  # Don't raise errors if manifest file is missing
 WHITENOISE_MAX_AGE = 31536000  # Cache static files for 1 year (in seconds)
 
+# ============================================================================
+# Cache Configuration
+# ============================================================================
+
+CACHES = config.get('CACHES', {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+})
+
+# v2 task list result cache: 'local' (per-process LRU) or 'django' (CACHE_ALIAS)
+TODOS_LIST_CACHE = {
+    'BACKEND': 'local',
+    'MAX_ENTRIES': 2048,
+    'TIMEOUT': 60,  # seconds
+    'CACHE_ALIAS': 'default',
+}
+
+# Soft-deleted tasks and categories are hard-deleted by `manage.py purge_deleted`
+# once older than this; sync clients offline for longer must reload.
+TODOS_SOFT_DELETE_RETENTION_DAYS = 30
+
+# Tasks and categories of users deleted longer ago than RETENTION_DAYS are
+# hard-deleted by `manage.py purge_deleted_users` (todos.user_purge), paced
+# to MAX_ROWS_PER_SECOND (0: unpaced).
+TODOS_DELETED_USER_PURGE = {
+    'RETENTION_DAYS': 30,
+    'BATCH_SIZE': 500,
+    'MAX_ROWS_PER_SECOND': 2000,
+}
+
+# Deleting a category returns at once; a worker thread then clears the
+# category on its tasks in batches (todos.detach). `manage.py
+# detach_categories` finishes anything a restart interrupted.
+TODOS_CATEGORY_DETACH = {
+    'BATCH_SIZE': 500,
+    'WORKERS': 1,
+    'MAX_PENDING': 1000,
+}
+
+# v2 event stream (/api/v2/events/): 'local' fans out within one process; with
+# several worker processes use 'poll' (each worker polls ChangeSequence for its
+# subscribed users every POLL_INTERVAL seconds) or a dotted path to a backend.
+TODOS_EVENTS = {
+    'BACKEND': 'local',
+    'POLL_INTERVAL': 2,  # seconds
+    'HEARTBEAT': 15,  # seconds between keep-alive comments on an idle stream
+}
+
+# v2 login, register and change-password hash on a dedicated pool
+# (common.hashing) instead of the executor ORM calls share. Past MAX_PENDING
+# queued or running hashes, requests get 429 with Retry-After.
+PASSWORD_HASHING = {
+    'EXECUTOR': 'process',  # or 'thread'
+    'WORKERS': 4,
+    'MAX_PENDING': 64,
+    'RETRY_AFTER': 1,  # seconds
+}
+
+# v2 tokens (accounts.tokens): short-lived access JWTs plus single-use
+# refresh tokens that rotate on /auth/refresh/. Revoked jtis are checked in an
+# in-memory Bloom filter that each worker tops up every POLL_INTERVAL seconds.
+AUTH_TOKENS = {
+    'ACCESS_TTL': 300,  # seconds
+    'REFRESH_TTL': 14 * 24 * 3600,
+    'POLL_INTERVAL': 5,
+    'REBUILD_INTERVAL': 3600,
+    'CAPACITY': 100_000,
+    'ERROR_RATE': 0.001,
+}
+
+# Per-process cache of User rows for v2 handlers that need the full user
+USER_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': 30,  # seconds; bounds staleness across worker processes
+}
+
 # ============================================================================
 # Django Unfold Configuration
 # ============================================================================
@@ -252,9 +330,34 @@ SIMPLE_JWT = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Task images and profile pictures use 'media': content-addressed, so each
+# distinct file is stored once (common.blobs).
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'media': {'BACKEND': 'common.blobs.ContentAddressedStorage'},
+}
+
+# `manage.py sweep_media` deletes blobs no row names once they have been
+# unreferenced for GRACE seconds (uploads not yet saved to a row are younger).
+MEDIA_BLOBS = {
+    'GRACE': 3600,
+    'BATCH_SIZE': 500,
+}
+
 # Maximum upload size (5MB)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880
 
 # Allowed image types
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+
+# Resized variants of task images and profile pictures (common.thumbnails),
+# built in a process pool after upload. `manage.py build_thumbnails` backfills.
+IMAGE_VARIANTS = {
+    'WIDTHS': [160, 480, 960],
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': 80,
+    'WORKERS': 2,  # Pillow processes (and coordinator threads) per server process
+    'MAX_PENDING': 100,  # uploads queued beyond this are left to build_thumbnails
+}
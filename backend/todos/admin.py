@@ -1,6 +1,6 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
-from .models import Task, Category
+from .models import Task, Category, TaskDailyStats, TaskStats
 
 
 @admin.register(Category)
@@ -8,7 +8,7 @@ class CategoryAdmin(ModelAdmin):
     list_display = ['name', 'color', 'user', 'created_at']
     list_filter = ['created_at', 'user']
     search_fields = ['name', 'user__username', 'user__email']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'tasks_to_detach', 'tasks_detached', 'detached_at']
 
 
 @admin.register(Task)
@@ -19,3 +19,19 @@ class TaskAdmin(ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'created_at'
 
+
+
+@admin.register(TaskStats)
+class TaskStatsAdmin(ModelAdmin):
+    list_display = ['user', 'total', 'not_started', 'in_progress', 'completed']
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = ['total', 'not_started', 'in_progress', 'completed', 'extreme', 'moderate', 'low']
+
+
+@admin.register(TaskDailyStats)
+class TaskDailyStatsAdmin(ModelAdmin):
+    list_display = ['user', 'day', 'created', 'completed', 'overdue']
+    list_filter = ['day']
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = ['created', 'completed', 'overdue']
+    date_hierarchy = 'day'
@@ -0,0 +1,32 @@
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from todos.search import search_tasks
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """Full-text search over title/description, annotated with relevance."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_tasks(queryset, ' '.join(terms), rank=True)
+
+
+class TaskOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter aware of the search `relevance` annotation.
+    `relevance` always means best match first and is dropped without a search.
+    """
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        searching = bool(request.query_params.get(api_settings.SEARCH_PARAM))
+        ordering = []
+        for field in valid:
+            if field.lstrip('-') != 'relevance':
+                ordering.append(field)
+            elif searching:
+                ordering.append('-relevance')
+        return ordering
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from todos.models import Task, Category
-from common.utils import get_image_url
+from common.utils import get_image_url, get_thumbnails
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -25,11 +25,22 @@ class CategorySerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class LiveCategoryMixin:
+    """Tasks of a soft-deleted category read as uncategorized."""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.category_id and instance.live_category is None:
+            data['category'] = None
+        return data
+
+
+class TaskSerializer(LiveCategoryMixin, serializers.ModelSerializer):
     """Serializer for Task model."""
     
     image_url = serializers.SerializerMethodField()
-    category_name = serializers.CharField(source='category.name', read_only=True)
+    thumbnails = serializers.SerializerMethodField()
+    category_name = serializers.CharField(source='live_category.name', read_only=True)
     
     class Meta:
         model = Task
@@ -41,6 +52,7 @@ class TaskSerializer(serializers.ModelSerializer):
             'status',
             'image',
             'image_url',
+            'thumbnails',
             'due_date',
             'created_at',
             'updated_at',
@@ -48,7 +60,7 @@ class TaskSerializer(serializers.ModelSerializer):
             'category',
             'category_name',
         ]
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'image_url', 'category_name']
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'image_url', 'thumbnails', 'category_name']
     
     def get_image_url(self, obj):
         """Get full URL for task image."""
@@ -56,6 +68,10 @@ class TaskSerializer(serializers.ModelSerializer):
         if obj.image and request:
             return get_image_url(request, obj.image)
         return None
+
+    def get_thumbnails(self, obj):
+        """Get srcsets of the task image's resized variants."""
+        return get_thumbnails(self.context.get('request'), obj.image, obj.image_variants)
     
     def create(self, validated_data):
         """Create a new task, automatically assigning the current user."""
@@ -71,11 +87,12 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskListSerializer(serializers.ModelSerializer):
+class TaskListSerializer(LiveCategoryMixin, serializers.ModelSerializer):
     """Optimized serializer for task list views."""
     
     image_url = serializers.SerializerMethodField()
-    category_name = serializers.CharField(source='category.name', read_only=True)
+    thumbnails = serializers.SerializerMethodField()
+    category_name = serializers.CharField(source='live_category.name', read_only=True)
     
     class Meta:
         model = Task
@@ -86,6 +103,7 @@ class TaskListSerializer(serializers.ModelSerializer):
             'priority',
             'status',
             'image_url',
+            'thumbnails',
             'due_date',
             'created_at',
             'updated_at',
@@ -100,6 +118,10 @@ class TaskListSerializer(serializers.ModelSerializer):
             return get_image_url(request, obj.image)
         return None
 
+    def get_thumbnails(self, obj):
+        """Get srcsets of the task image's resized variants."""
+        return get_thumbnails(self.context.get('request'), obj.image, obj.image_variants)
+
 
 class TaskStatisticsSerializer(serializers.Serializer):
     """Serializer for task statistics."""
@@ -1,11 +1,11 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Count
-from django.utils import timezone
 
-from todos.models import Task, Category
+from todos.models import Task, Category, TaskStats
+from todos.stats import count_tasks, get_user_stats, stats_payload
+from .filters import TaskOrderingFilter, TaskSearchFilter
 from .serializers import (
     TaskSerializer,
     TaskListSerializer,
@@ -21,9 +21,9 @@ class TaskViewSet(viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [TaskSearchFilter, TaskOrderingFilter]
     search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'updated_at', 'due_date', 'priority', 'status']
+    ordering_fields = ['created_at', 'updated_at', 'due_date', 'priority', 'status', 'relevance']
     ordering = ['-created_at']
     
     def get_queryset(self):
@@ -43,7 +43,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Filter by category
         category_param = self.request.query_params.get('category', None)
         if category_param:
-            queryset = queryset.filter(category_id=category_param)
+            queryset = queryset.filter(category_id=category_param, category__deleted_at__isnull=True)
         
         return queryset.select_related('category', 'user')
     
@@ -60,28 +60,12 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get task statistics for the current user."""
-        queryset = self.get_queryset()
-        
-        total = queryset.count()
-        completed = queryset.filter(status='Completed').count()
-        in_progress = queryset.filter(status='In Progress').count()
-        not_started = queryset.filter(status='Not Started').count()
-        
-        completed_percentage = (completed / total * 100) if total > 0 else 0
-        in_progress_percentage = (in_progress / total * 100) if total > 0 else 0
-        not_started_percentage = (not_started / total * 100) if total > 0 else 0
-        
-        data = {
-            'total': total,
-            'completed': completed,
-            'in_progress': in_progress,
-            'not_started': not_started,
-            'completed_percentage': round(completed_percentage, 2),
-            'in_progress_percentage': round(in_progress_percentage, 2),
-            'not_started_percentage': round(not_started_percentage, 2),
-        }
-        
-        serializer = TaskStatisticsSerializer(data)
+        if any(request.query_params.get(p) for p in ('status', 'priority', 'category')):
+            # Filtered views are not covered by the counters: one grouped aggregate.
+            stats = TaskStats(**count_tasks(self.get_queryset()))
+        else:
+            stats = get_user_stats(request.user.pk)
+        serializer = TaskStatisticsSerializer(stats_payload(stats))
         return Response(serializer.data)
 
 
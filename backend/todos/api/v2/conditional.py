@@ -0,0 +1,74 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) for v2 task and category reads.
+
+Validators come from the per-user data version (todos.versioning, one
+primary-key read of the committed change sequence), so a revalidation that
+matches is answered before the list query or serialization runs.
+"""
+import hashlib
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from django_bolt.responses import Response
+
+from common.utils import get_bolt_base_url
+from todos.versioning import get_data_version
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [c.strip() for c in header.split(",")]
+    if "*" in candidates:
+        return True
+    # Weak comparison, as required for If-None-Match.
+    return etag.removeprefix("W/") in {c.removeprefix("W/") for c in candidates}
+
+
+def _last_modified(modified: float) -> int | None:
+    """
+    HTTP dates have whole seconds, so Last-Modified is the first second after
+    the change, and only once that second has passed: a second write within
+    it would otherwise carry the same date.
+    """
+    second = int(modified) + 1
+    return second if second <= time.time() else None
+
+
+def _not_modified_since(header: str, modified: float) -> bool:
+    # Strictly older only: a change during the header's second may postdate it.
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return modified < since.timestamp()
+
+
+async def validators(request, user_id: int, version=None) -> tuple[dict, bool]:
+    """
+    Response headers for the caller's current data version, and whether the
+    request's If-None-Match / If-Modified-Since already has that version.
+    Pass `version` when the caller already looked it up.
+    """
+    token, modified = version or await get_data_version(user_id)
+    query = sorted((getattr(request, "query", None) or {}).items())
+    key = f"{user_id}|{token}|{get_bolt_base_url(request)}|{request.path}|{query}"
+    etag = '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    last_modified = _last_modified(modified)
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    request_headers = getattr(request, "headers", None) or {}
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return headers, _etag_matches(if_none_match, etag)
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return headers, _not_modified_since(if_modified_since, modified)
+    return headers, False
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(b"", status_code=304, headers=headers, media_type="text/plain")
@@ -0,0 +1,67 @@
+"""
+Incremental NDJSON / CSV encoding for the v2 task export.
+
+Rows arrive from an async iterator and leave as byte chunks of roughly
+FLUSH_BYTES, so memory is bounded by one fetch chunk plus one output buffer
+whatever the export size.
+"""
+import csv
+import io
+import json
+
+FLUSH_BYTES = 64 * 1024
+
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "priority",
+    "status",
+    "due_date",
+    "category",
+    "category_name",
+    "image",
+    "image_url",
+    "created_at",
+    "updated_at",
+)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def encode_ndjson(payloads):
+    buffer = []
+    size = 0
+    async for payload in payloads:
+        line = json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer).encode()
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+async def encode_csv(payloads):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    async for payload in payloads:
+        writer.writerow(["" if payload[c] is None else payload[c] for c in CSV_COLUMNS])
+        if out.tell() >= FLUSH_BYTES:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue().encode()
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
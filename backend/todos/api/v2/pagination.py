@@ -0,0 +1,132 @@
+"""
+Keyset (cursor) pagination for the v2 task list.
+
+A cursor is an opaque urlsafe-base64 JSON blob holding the ordering, the
+paging direction and the sort key of the boundary row (ending with its id).
+Pages resume with a seek predicate on that key instead of OFFSET, so the
+database walks the (user, <sort column>) index straight to the next row.
+NULL due dates sort lowest, matching MySQL and SQLite.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+# Sort key per ordering field; always ends with a unique column.
+SORT_KEYS = {
+    "created_at": ("created_at", "id"),
+    "updated_at": ("updated_at", "id"),
+    "due_date": ("due_date", "id"),
+    "title": ("title", "id"),
+    "priority": ("priority", "created_at", "id"),
+    "status": ("status", "created_at", "id"),
+}
+
+DATETIME_FIELDS = {"created_at", "updated_at", "due_date"}
+STRING_FIELDS = {"title", "priority", "status"}
+NULLABLE_FIELDS = {"due_date"}
+
+NEXT = "next"
+PREV = "prev"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not fit the request."""
+
+
+def order_fields(ordering: str) -> list[str]:
+    """ORDER BY columns for an ordering, including the tiebreakers."""
+    prefix = "-" if ordering.startswith("-") else ""
+    return [prefix + field for field in SORT_KEYS[ordering.lstrip("-")]]
+
+
+def reverse_fields(fields: list[str]) -> list[str]:
+    return [f[1:] if f.startswith("-") else "-" + f for f in fields]
+
+
+def row_key(ordering: str, row) -> list:
+    """Sort key of a row (model instance or values() dict)."""
+    fields = SORT_KEYS[ordering.lstrip("-")]
+    if isinstance(row, dict):
+        return [row[f] for f in fields]
+    return [getattr(row, f) for f in fields]
+
+
+def encode_cursor(ordering: str, direction: str, key: list) -> str:
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    raw = json.dumps({"o": ordering, "d": direction, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, ordering: str) -> tuple[str, list]:
+    """Return (direction, key) for a cursor issued for the given ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        direction, values = data["d"], data["k"]
+        cursor_ordering = data["o"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor.")
+    if cursor_ordering != ordering:
+        raise InvalidCursor("Cursor does not match ordering.")
+    fields = SORT_KEYS[ordering.lstrip("-")]
+    if direction not in (NEXT, PREV) or not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor("Invalid cursor.")
+    return direction, [_key_value(field, value) for field, value in zip(fields, values)]
+
+
+def _key_value(field: str, value):
+    """A cursor key value checked against its column's type; raises InvalidCursor."""
+    if value is None and field in NULLABLE_FIELDS:
+        return None
+    if field in DATETIME_FIELDS and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    elif field in STRING_FIELDS and isinstance(value, str):
+        return value
+    elif field == "id" and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise InvalidCursor("Invalid cursor.")
+
+
+def _after(field: str, value) -> Q:
+    if value is None:
+        return Q(**{f"{field}__isnull": False})
+    return Q(**{f"{field}__gt": value})
+
+
+def _before(field: str, value) -> Q | None:
+    if value is None:
+        return None
+    q = Q(**{f"{field}__lt": value})
+    if field in NULLABLE_FIELDS:
+        q |= Q(**{f"{field}__isnull": True})
+    return q
+
+
+def _equal(field: str, value) -> Q:
+    if value is None:
+        return Q(**{f"{field}__isnull": True})
+    return Q(**{field: value})
+
+
+def seek_filter(ordering: str, key: list, backwards: bool = False) -> Q:
+    """
+    Rows strictly after `key` in `ordering` (or before it when backwards):
+    (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... with > flipped for descending.
+    """
+    fields = SORT_KEYS[ordering.lstrip("-")]
+    descending = ordering.startswith("-") != backwards
+    step = _before if descending else _after
+    predicate = Q(pk__in=[])
+    prefix = Q()
+    for field, value in zip(fields, key):
+        branch = step(field, value)
+        if branch is not None:
+            predicate |= prefix & branch
+        prefix &= _equal(field, value)
+    return predicate
@@ -1,7 +1,7 @@
 """
 Bolt request/response schemas for todos API v2.
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Annotated, Literal
 
 from msgspec import Meta
@@ -26,6 +26,14 @@ class CategoryUpdate(Serializer):
     color: Annotated[str, Meta(max_length=7)] | None = None
 
 
+class CategoryListParams(Serializer):
+    """Query params for category list: a page by name, optionally with task counts."""
+
+    with_counts: bool = False
+    limit: Annotated[int, Meta(ge=1, le=200)] = 100
+    offset: Annotated[int, Meta(ge=0)] = 0
+
+
 class TaskCreate(Serializer):
     """Create task."""
 
@@ -48,6 +56,23 @@ class TaskUpdate(Serializer):
     category_id: int | None = None
 
 
+BULK_MAX_ITEMS = 500
+
+
+class TaskBulkUpdate(TaskUpdate):
+    """Partial update of one task inside a bulk request."""
+
+    id: int
+
+
+class TaskBulkRequest(Serializer):
+    """Create, update and delete operations applied in one transaction."""
+
+    create: Annotated[list[TaskCreate], Meta(max_length=BULK_MAX_ITEMS)] = []
+    update: Annotated[list[TaskBulkUpdate], Meta(max_length=BULK_MAX_ITEMS)] = []
+    delete: Annotated[list[int], Meta(max_length=BULK_MAX_ITEMS)] = []
+
+
 ALLOWED_ORDERING = (
     "created_at",
     "-created_at",
@@ -63,6 +88,9 @@ ALLOWED_ORDERING = (
     "-title",
 )
 
+# Best match first; only meaningful together with `search`.
+RELEVANCE_ORDERING = "relevance"
+
 
 class TaskFilters(Serializer):
     """Query params for task list. Ordering whitelisted for reliability."""
@@ -74,3 +102,47 @@ class TaskFilters(Serializer):
     ordering: str | None = "-created_at"
     limit: Annotated[int, Meta(ge=1, le=100)] = 20
     offset: Annotated[int, Meta(ge=0)] = 0
+    pagination: Literal["offset", "cursor"] = "offset"
+    cursor: str | None = None
+
+
+class TaskExportFilters(TaskFilters):
+    """Query params for task export: the list filters plus output format; paging is ignored."""
+
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+
+class CalendarParams(Serializer):
+    """Query params for the calendar: days start..end inclusive, in IANA time zone `tz`."""
+
+    start: date
+    end: date
+    tz: str = "UTC"
+
+
+class TrendParams(Serializer):
+    """Query params for trends; the window defaults to the last 365 days."""
+
+    bucket: Literal["day", "week", "month"] = "day"
+    start: date | None = None
+    end: date | None = None
+
+
+class TaskImportParams(Serializer):
+    """Query params for task import; format defaults to the upload's extension / content type."""
+
+    format: Literal["csv", "ndjson"] | None = None
+    create_categories: bool = False
+
+
+class SyncParams(Serializer):
+    """Query params for delta sync. Without `since`, only the current token is returned."""
+
+    since: str | None = None
+    limit: Annotated[int, Meta(ge=1, le=1000)] = 500
+
+
+class EventParams(Serializer):
+    """Query params for the event stream; `since` (or Last-Event-ID) resumes from a sync token."""
+
+    since: str | None = None
@@ -1,42 +1,113 @@
 """
 Todos API v2 – Django Bolt endpoints.
 Replica of v1 Task and Category CRUD + statistics using Bolt.
-Uses Depends(get_current_user_async), common.get_bolt_base_url, Conflict for duplicates.
+Uses Depends(get_current_user_id) (token claims only, no user query),
+common.get_bolt_base_url, Conflict for duplicates.
+Reads answer conditional requests (ETag / 304) before touching the database.
 """
+import asyncio
+import json
 from typing import Annotated
 
 from asgiref.sync import sync_to_async
-from django.db.models import Q
+from django.contrib.auth import get_user_model
 
-from django_bolt import Depends, Request
+from django_bolt import Depends, Request, UploadFile
 from django_bolt.auth import IsAuthenticated, JWTAuthentication
-from django_bolt.exceptions import BadRequest, Conflict, NotFound
-from django_bolt.param_functions import Query
-
-from common.deps import get_current_user_async
-from common.utils import get_bolt_base_url
+from django_bolt.exceptions import BadRequest, Conflict, NotFound, Unauthorized
+from django_bolt.param_functions import File, Query
+from django_bolt.responses import Response, StreamingResponse
+
+from accounts.api.v2 import views as accounts_views
+from common.deps import get_current_user_id
+from common.thumbnails import srcsets
+from common.uploads import UploadRejected, clear_image, max_image_size, store_image, upload_error
+from common.user_cache import user_cache
+from common.utils import absolute_url_builder, get_bolt_base_url
 from core.api import api
-from todos.models import Category, Task
-
+from todos.bulk import apply_bulk
+from todos.events import config as events_config, event_bus
+from todos.importer import TaskImporter, detect_format, iter_records
+from todos.models import Category, Task, TaskStats
+from todos.list_cache import task_list_cache
+from todos.rollups import resample, trend_rows, trend_window
+from todos.schedule import MAX_TASKS as CALENDAR_MAX_TASKS, InvalidWindow, day_counts, window, window_tasks
+from todos.search import search_terms, search_tasks
+from todos.stats import category_task_counts, get_user_stats, last_overdue_at, rebuild_user_stats, stats_payload
+from todos.sync import InvalidToken, changes_since, current_seq, decode_token, encode_token
+from todos.versioning import get_data_version
+
+from .conditional import not_modified, validators
+from .export import ENCODERS, MEDIA_TYPES
+from .pagination import (
+    NEXT,
+    PREV,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    order_fields,
+    reverse_fields,
+    row_key,
+    seek_filter,
+)
 from .schemas import (
     ALLOWED_ORDERING,
+    RELEVANCE_ORDERING,
+    CalendarParams,
     CategoryCreate,
+    CategoryListParams,
     CategoryUpdate,
+    EventParams,
+    SyncParams,
+    TaskBulkRequest,
     TaskCreate,
+    TaskExportFilters,
     TaskFilters,
+    TaskImportParams,
     TaskUpdate,
+    TrendParams,
 )
 
 # ---- Payload helpers ----
 
-
-def _category_payload(cat: Category) -> dict:
+# Columns for the batched list path: one values() fetch, category name joined in.
+CATEGORY_ROW_FIELDS = ("id", "name", "color", "created_at", "updated_at")
+TASK_ROW_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "priority",
+    "status",
+    "image",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "user_id",
+    "category_id",
+    "category__name",
+    "category__deleted_at",
+    "image_variants",
+)
+# Largest category page; the dashboard shows the first one.
+CATEGORY_PAGE_MAX = 200
+# Rows per keyset query when streaming an export.
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_MAX_BYTES = 256 * 1024 * 1024
+# Rows per delta read when an event stream catches up.
+EVENT_BATCH = 500
+
+
+def _category_payload(cat: Category | dict) -> dict:
+    if isinstance(cat, dict):
+        id_, name, color, created_at, updated_at = (cat[f] for f in CATEGORY_ROW_FIELDS)
+    else:
+        id_, name, color, created_at, updated_at = cat.id, cat.name, cat.color, cat.created_at, cat.updated_at
     return {
-        "id": cat.id,
-        "name": cat.name,
-        "color": cat.color,
-        "created_at": cat.created_at.isoformat() if cat.created_at else None,
-        "updated_at": cat.updated_at.isoformat() if cat.updated_at else None,
+        "id": id_,
+        "name": name,
+        "color": color,
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None,
     }
 
 
@@ -53,14 +124,55 @@ def _task_payload(task: Task, base_url: str | None = None) -> dict:
         "created_at": task.created_at.isoformat() if task.created_at else None,
         "updated_at": task.updated_at.isoformat() if task.updated_at else None,
         "user": task.user_id,
-        "category": task.category_id,
-        "category_name": task.category.name if task.category_id else None,
+        "category": None,
+        "category_name": None,
+        "thumbnails": srcsets(task.image.storage, task.image_variants, absolute_url_builder(base_url)),
     }
+    category = task.live_category
+    if category is not None:
+        data["category"] = category.id
+        data["category_name"] = category.name
     if base_url and task.image:
         data["image_url"] = base_url + ("/" + task.image.url.lstrip("/") if task.image.url else "")
     return data
 
 
+def _task_payload_from_row(row: dict, base_url: str | None = None, image_storage=None) -> dict:
+    """Same output as _task_payload, built from a TASK_ROW_FIELDS values() row."""
+    image = row["image"]
+    storage = image_storage or Task._meta.get_field("image").storage
+    data = {
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["description"] or "",
+        "priority": row["priority"],
+        "status": row["status"],
+        "image": image or None,
+        "image_url": None,
+        "due_date": row["due_date"].isoformat() if row["due_date"] else None,
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+        "user": row["user_id"],
+        "category": None,
+        "category_name": None,
+        "thumbnails": srcsets(storage, row["image_variants"], absolute_url_builder(base_url)),
+    }
+    if row["category_id"] and row["category__deleted_at"] is None:
+        # Tasks of a soft-deleted category read as uncategorized.
+        data["category"] = row["category_id"]
+        data["category_name"] = row["category__name"]
+    if base_url and image:
+        url = storage.url(image)
+        data["image_url"] = base_url + ("/" + url.lstrip("/") if url else "")
+    return data
+
+
+def _task_payloads(rows: list[dict], base_url: str | None = None) -> list[dict]:
+    """Serialize a page of rows in one pass; no ORM access, safe on the event loop."""
+    storage = Task._meta.get_field("image").storage
+    return [_task_payload_from_row(row, base_url, storage) for row in rows]
+
+
 # ---- Categories ----
 
 
@@ -71,12 +183,60 @@ def _task_payload(task: Task, base_url: str | None = None) -> dict:
     summary="List categories",
     tags=["todos", "categories"],
 )
-async def category_list(user=Depends(get_current_user_async)):
-    qs = Category.objects.filter(user=user).order_by("name")[:200]
-    out = []
-    async for cat in qs:
-        out.append(await sync_to_async(_category_payload)(cat))
-    return out
+async def category_list(
+    request: Request,
+    params: Annotated[CategoryListParams, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    version = await get_data_version(user_id)
+    overdue_at = 0.0
+    validator_version = version
+    if params.with_counts:
+        # Overdue counts also change, with no write, when a due date passes.
+        overdue_at = await last_overdue_at(user_id)
+        seq, modified = version
+        validator_version = (f"{seq}:{overdue_at}", max(modified, overdue_at))
+    headers, fresh = await validators(request, user_id, validator_version)
+    if fresh:
+        return not_modified(headers)
+    page = await _cached_category_page(
+        user_id, params.limit, params.offset, params.with_counts, version, overdue_at
+    )
+    return Response(page, headers=headers)
+
+
+async def _cached_category_page(
+    user_id: int, limit: int, offset: int, with_counts: bool, version, overdue_at: float = 0.0
+) -> dict:
+    seq, _ = version
+    key = ("categories", with_counts, limit, offset, overdue_at)
+    page = await task_list_cache.get(user_id, seq, key)
+    if page is None:
+        page = await sync_to_async(_category_page)(user_id, limit, offset, with_counts)
+        await task_list_cache.set(user_id, seq, key, page)
+    return page
+
+
+def _category_page(user_id: int, limit: int, offset: int, with_counts: bool = False) -> dict:
+    categories = Category.objects.filter(user_id=user_id)
+    count = categories.count()
+    rows = list(categories.order_by("name", "id").values(*CATEGORY_ROW_FIELDS)[offset : offset + limit])
+    results = [_category_payload(row) for row in rows]
+    if with_counts:
+        counts = category_task_counts(user_id, [row["id"] for row in rows])
+        empty = {"total": 0, "completed": 0, "overdue": 0}
+        for payload in results:
+            payload["task_counts"] = counts.get(payload["id"], empty)
+    return {
+        "count": count,
+        "next_offset": offset + limit if offset + limit < count else None,
+        "results": results,
+    }
+
+
+async def _category_payloads(user_id: int, version) -> list[dict]:
+    page = await _cached_category_page(user_id, CATEGORY_PAGE_MAX, 0, False, version)
+    return page["results"]
 
 
 @api.post(
@@ -87,11 +247,11 @@ async def category_list(user=Depends(get_current_user_async)):
     tags=["todos", "categories"],
     status_code=201,
 )
-async def category_create(body: CategoryCreate, user=Depends(get_current_user_async)):
-    if await Category.objects.filter(user=user, name=body.name).aexists():
+async def category_create(body: CategoryCreate, user_id=Depends(get_current_user_id)):
+    if await Category.objects.filter(user_id=user_id, name=body.name).aexists():
         raise Conflict(detail="You already have a category with this name.")
     cat = await Category.objects.acreate(
-        user=user,
+        user_id=user_id,
         name=body.name,
         color=body.color,
     )
@@ -105,21 +265,21 @@ async def category_create(body: CategoryCreate, user=Depends(get_current_user_as
     summary="Get category",
     tags=["todos", "categories"],
 )
-async def category_detail(category_id: int, user=Depends(get_current_user_async)):
+async def category_detail(category_id: int, user_id=Depends(get_current_user_id)):
     try:
-        cat = await Category.objects.aget(id=category_id, user=user)
+        cat = await Category.objects.aget(id=category_id, user_id=user_id)
     except Category.DoesNotExist:
         raise NotFound(detail="Category not found.")
     return await sync_to_async(_category_payload)(cat)
 
 
-async def _category_update_impl(category_id: int, body: CategoryUpdate, user):
+async def _category_update_impl(category_id: int, body: CategoryUpdate, user_id: int):
     try:
-        cat = await Category.objects.aget(id=category_id, user=user)
+        cat = await Category.objects.aget(id=category_id, user_id=user_id)
     except Category.DoesNotExist:
         raise NotFound(detail="Category not found.")
     if body.name is not None:
-        if await Category.objects.filter(user=user, name=body.name).exclude(pk=cat.pk).aexists():
+        if await Category.objects.filter(user_id=user_id, name=body.name).exclude(pk=cat.pk).aexists():
             raise Conflict(detail="You already have a category with this name.")
         cat.name = body.name
     if body.color is not None:
@@ -135,8 +295,8 @@ async def _category_update_impl(category_id: int, body: CategoryUpdate, user):
     summary="Update category",
     tags=["todos", "categories"],
 )
-async def category_update(category_id: int, body: CategoryUpdate, user=Depends(get_current_user_async)):
-    return await _category_update_impl(category_id, body, user)
+async def category_update(category_id: int, body: CategoryUpdate, user_id=Depends(get_current_user_id)):
+    return await _category_update_impl(category_id, body, user_id)
 
 
 @api.patch(
@@ -146,8 +306,8 @@ async def category_update(category_id: int, body: CategoryUpdate, user=Depends(g
     summary="Partial update category",
     tags=["todos", "categories"],
 )
-async def category_partial_update(category_id: int, body: CategoryUpdate, user=Depends(get_current_user_async)):
-    return await _category_update_impl(category_id, body, user)
+async def category_partial_update(category_id: int, body: CategoryUpdate, user_id=Depends(get_current_user_id)):
+    return await _category_update_impl(category_id, body, user_id)
 
 
 @api.delete(
@@ -158,14 +318,36 @@ async def category_partial_update(category_id: int, body: CategoryUpdate, user=D
     tags=["todos", "categories"],
     status_code=204,
 )
-async def category_delete(category_id: int, user=Depends(get_current_user_async)):
+async def category_delete(category_id: int, user_id=Depends(get_current_user_id)):
     try:
-        cat = await Category.objects.aget(id=category_id, user=user)
+        cat = await Category.objects.aget(id=category_id, user_id=user_id)
     except Category.DoesNotExist:
         raise NotFound(detail="Category not found.")
     await cat.adelete()
 
 
+@api.get(
+    "/categories/{category_id}/detach/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Progress of detaching a deleted category's tasks",
+    tags=["todos", "categories"],
+)
+async def category_detach_progress(category_id: int, user_id=Depends(get_current_user_id)):
+    try:
+        cat = await Category.all_objects.aget(id=category_id, user_id=user_id, deleted_at__isnull=False)
+    except Category.DoesNotExist:
+        raise NotFound(detail="Deleted category not found.")
+    return {
+        "id": cat.id,
+        "deleted_at": cat.deleted_at.isoformat(),
+        "tasks_to_detach": cat.tasks_to_detach,
+        "tasks_detached": cat.tasks_detached,
+        "done": cat.detached_at is not None,
+        "detached_at": cat.detached_at.isoformat() if cat.detached_at else None,
+    }
+
+
 # ---- Tasks ----
 
 
@@ -179,31 +361,113 @@ async def category_delete(category_id: int, user=Depends(get_current_user_async)
 async def task_list(
     request: Request,
     filters: Annotated[TaskFilters, Query()],
-    user=Depends(get_current_user_async),
+    user_id=Depends(get_current_user_id),
 ):
-    qs = Task.objects.filter(user=user).select_related("category")
+    version = await get_data_version(user_id)
+    headers, fresh = await validators(request, user_id, version)
+    if fresh:
+        return not_modified(headers)
+    page = await _cached_task_list_page(filters, user_id, get_bolt_base_url(request), version)
+    return Response(page, headers=headers)
+
+
+async def _cached_task_list_page(filters: TaskFilters, user_id: int, base_url: str | None, version) -> list | dict:
+    seq, _ = version
+    key = _task_list_key(filters, base_url)
+    page = await task_list_cache.get(user_id, seq, key)
+    if page is None:
+        page = await _task_list_page(filters, user_id, base_url)
+        await task_list_cache.set(user_id, seq, key, page)
+    return page
+
+
+def _task_list_ordering(filters: TaskFilters) -> str:
+    ordering = (filters.ordering or "-created_at").strip()
+    if ordering == RELEVANCE_ORDERING and filters.search:
+        return ordering
+    return ordering if ordering in ALLOWED_ORDERING else "-created_at"
+
+
+def _task_list_key(filters: TaskFilters, base_url: str | None) -> tuple:
+    """Normalized filters, so equivalent requests share a cache entry."""
+    search = " ".join(search_terms(filters.search)).lower() if filters.search else None
+    return (
+        filters.status,
+        filters.priority,
+        filters.category,
+        search,
+        _task_list_ordering(filters),
+        min(filters.limit, 100),
+        max(0, filters.offset),
+        filters.pagination,
+        filters.cursor,
+        base_url,
+    )
+
+
+def _task_queryset(filters: TaskFilters, user_id: int):
+    """The user's tasks narrowed by `filters`, unordered, and the ordering to apply."""
+    qs = Task.objects.filter(user_id=user_id)
     if filters.status:
         qs = qs.filter(status=filters.status)
     if filters.priority:
         qs = qs.filter(priority=filters.priority)
     if filters.category is not None:
-        qs = qs.filter(category_id=filters.category)
+        qs = qs.filter(category_id=filters.category, category__deleted_at__isnull=True)
+    ordering = _task_list_ordering(filters)
     if filters.search:
-        qs = qs.filter(
-            Q(title__icontains=filters.search) | Q(description__icontains=filters.search)
-        )
-    ordering = (filters.ordering or "-created_at").strip()
-    if ordering and ordering in ALLOWED_ORDERING:
-        qs = qs.order_by(ordering)
-    else:
-        qs = qs.order_by("-created_at")
-    base_url = get_bolt_base_url(request)
+        qs = search_tasks(qs, filters.search, rank=ordering == RELEVANCE_ORDERING)
+    return qs, ordering
+
+
+async def _task_list_page(filters: TaskFilters, user_id: int, base_url: str | None):
+    qs, ordering = _task_queryset(filters, user_id)
     limit = min(filters.limit, 100)
+    if filters.pagination == "cursor" or filters.cursor:
+        if ordering == RELEVANCE_ORDERING:
+            raise BadRequest(detail="Cursor pagination is not available for relevance ordering.")
+        return await _task_list_cursor(qs, ordering, filters.cursor, limit, base_url)
+    if ordering == RELEVANCE_ORDERING:
+        qs = qs.order_by("-relevance", "-id")
+    else:
+        qs = qs.order_by(*order_fields(ordering))
+    qs = qs.values(*TASK_ROW_FIELDS)
     offset = max(0, filters.offset)
-    out = []
-    async for task in qs[offset : offset + limit]:
-        out.append(await sync_to_async(_task_payload)(task, base_url))
-    return out
+    rows = await sync_to_async(list)(qs[offset : offset + limit])
+    return _task_payloads(rows, base_url)
+
+
+async def _task_list_cursor(qs, ordering: str, cursor: str | None, limit: int, base_url: str | None):
+    """Keyset page: seek past the cursor row instead of skipping OFFSET rows."""
+    fields = order_fields(ordering)
+    backwards = False
+    if cursor:
+        try:
+            direction, key = decode_cursor(cursor, ordering)
+        except InvalidCursor as exc:
+            raise BadRequest(detail=str(exc))
+        backwards = direction == PREV
+        qs = qs.filter(seek_filter(ordering, key, backwards=backwards))
+    qs = qs.order_by(*(reverse_fields(fields) if backwards else fields)).values(*TASK_ROW_FIELDS)
+    rows = await sync_to_async(list)(qs[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+    # The extra row tells us about the side we walked towards; the side we
+    # came from has rows whenever a cursor brought us here.
+    more_after = has_more if not backwards else True
+    more_before = has_more if backwards else bool(cursor)
+    next_cursor = prev_cursor = None
+    if rows and more_after:
+        next_cursor = encode_cursor(ordering, NEXT, row_key(ordering, rows[-1]))
+    if rows and more_before:
+        prev_cursor = encode_cursor(ordering, PREV, row_key(ordering, rows[0]))
+    return {
+        "results": _task_payloads(rows, base_url),
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
 
 
 @api.post(
@@ -214,15 +478,15 @@ async def task_list(
     tags=["todos", "tasks"],
     status_code=201,
 )
-async def task_create(request: Request, body: TaskCreate, user=Depends(get_current_user_async)):
+async def task_create(request: Request, body: TaskCreate, user_id=Depends(get_current_user_id)):
     category = None
     if body.category_id is not None:
         try:
-            category = await Category.objects.aget(id=body.category_id, user=user)
+            category = await Category.objects.aget(id=body.category_id, user_id=user_id)
         except Category.DoesNotExist:
             raise BadRequest(detail="Category not found or not yours.")
     task = await Task.objects.acreate(
-        user=user,
+        user_id=user_id,
         title=body.title,
         description=body.description,
         priority=body.priority,
@@ -234,6 +498,104 @@ async def task_create(request: Request, body: TaskCreate, user=Depends(get_curre
     return await sync_to_async(_task_payload)(task, base_url)
 
 
+@api.post(
+    "/todos/bulk/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Bulk create, update and delete tasks",
+    tags=["todos", "tasks"],
+)
+async def task_bulk(request: Request, body: TaskBulkRequest, user_id=Depends(get_current_user_id)):
+    if not (body.create or body.update or body.delete):
+        raise BadRequest(detail="No operations given.")
+    results = await sync_to_async(apply_bulk)(
+        user_id, create=body.create, update=body.update, delete=body.delete
+    )
+    written = [
+        item
+        for item in (*results["create"], *results["update"])
+        if item["status"] != "error"
+    ]
+    if written:
+        qs = Task.objects.filter(id__in={item["id"] for item in written}).values(*TASK_ROW_FIELDS)
+        rows = await sync_to_async(list)(qs)
+        payloads = dict(zip(
+            (row["id"] for row in rows),
+            _task_payloads(rows, get_bolt_base_url(request)),
+        ))
+        for item in written:
+            if item["id"] in payloads:  # absent if deleted later in the same request
+                item["task"] = payloads[item["id"]]
+    return results
+
+
+@api.get(
+    "/todos/export/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Export tasks as NDJSON or CSV",
+    tags=["todos", "tasks"],
+)
+async def task_export(
+    request: Request,
+    filters: Annotated[TaskExportFilters, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    qs, ordering = _task_queryset(filters, user_id)
+    if ordering == RELEVANCE_ORDERING:
+        raise BadRequest(detail="Export is not available for relevance ordering.")
+    payloads = _task_payload_stream(qs, ordering, get_bolt_base_url(request))
+    return StreamingResponse(
+        ENCODERS[filters.format](payloads),
+        media_type=MEDIA_TYPES[filters.format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{filters.format}"'},
+    )
+
+
+async def _task_payload_stream(qs, ordering: str, base_url: str | None, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Yield payloads for every row of `qs` in `ordering`, one keyset chunk at a time.
+    Seeking instead of .aiterator(): MySQLdb buffers a whole result set
+    client-side, so only bounded queries keep worker memory flat.
+    """
+    qs = qs.order_by(*order_fields(ordering)).values(*TASK_ROW_FIELDS)
+    storage = Task._meta.get_field("image").storage
+    key = None
+    while True:
+        chunk = qs if key is None else qs.filter(seek_filter(ordering, key))
+        rows = await sync_to_async(list)(chunk[:chunk_size])
+        for row in rows:
+            yield _task_payload_from_row(row, base_url, storage)
+        if len(rows) < chunk_size:
+            return
+        key = row_key(ordering, rows[-1])
+
+
+@api.post(
+    "/todos/import/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Import tasks from CSV or NDJSON",
+    tags=["todos", "tasks"],
+)
+async def task_import(
+    file: Annotated[UploadFile, File(max_size=IMPORT_MAX_BYTES)],
+    params: Annotated[TaskImportParams, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    fmt = params.format or detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise BadRequest(detail="Unknown file format; pass ?format=csv or ?format=ndjson.")
+    # Large uploads are spooled to disk; raw_file is read line by line. One
+    # executor call per chunk, so other requests' ORM calls interleave with a
+    # long import instead of queueing behind all of it.
+    importer = await sync_to_async(TaskImporter)(user_id, create_categories=params.create_categories)
+    records = iter_records(file.raw_file, fmt)
+    while await sync_to_async(importer.step)(records):
+        pass
+    return importer.report
+
+
 @api.get(
     "/todos/statistics/",
     auth=[JWTAuthentication()],
@@ -241,30 +603,86 @@ async def task_create(request: Request, body: TaskCreate, user=Depends(get_curre
     summary="Task statistics",
     tags=["todos", "tasks"],
 )
-async def task_statistics(user=Depends(get_current_user_async)):
-    from django.db.models import Count, Q
-
-    def _aggregate():
-        return Task.objects.filter(user=user).aggregate(
-            total=Count("id"),
-            completed=Count("id", filter=Q(status="Completed")),
-            in_progress=Count("id", filter=Q(status="In Progress")),
-            not_started=Count("id", filter=Q(status="Not Started")),
-        )
+async def task_statistics(request: Request, user_id=Depends(get_current_user_id)):
+    headers, fresh = await validators(request, user_id)
+    if fresh:
+        return not_modified(headers)
+    return Response(await _statistics_payload(user_id), headers=headers)
 
-    stats = await sync_to_async(_aggregate)()
-    total = stats["total"] or 0
-    completed = stats["completed"] or 0
-    in_progress = stats["in_progress"] or 0
-    not_started = stats["not_started"] or 0
+
+async def _statistics_payload(user_id: int) -> dict:
+    try:
+        stats = await TaskStats.objects.aget(pk=user_id)
+    except TaskStats.DoesNotExist:
+        stats = await sync_to_async(rebuild_user_stats)(user_id)
+    return stats_payload(stats)
+
+
+@api.get(
+    "/todos/calendar/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Tasks due in a date range, with per-day counts",
+    tags=["todos", "tasks"],
+)
+async def task_calendar(
+    request: Request,
+    params: Annotated[CalendarParams, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    """
+    Tasks with due_date on days start..end (inclusive, in `tz`), by due date,
+    and per-day status/priority counts. Counts cover every task in the
+    window; `truncated` means the task list stopped at its cap.
+    """
+    try:
+        lower, upper, zone = window(params.start, params.end, params.tz)
+    except InvalidWindow as exc:
+        raise BadRequest(detail=str(exc))
+    headers, fresh = await validators(request, user_id)
+    if fresh:
+        return not_modified(headers)
+    rows = await sync_to_async(window_tasks)(user_id, lower, upper, TASK_ROW_FIELDS)
+    days = await sync_to_async(day_counts)(user_id, lower, upper, zone)
+    return Response(
+        {
+            "start": params.start.isoformat(),
+            "end": params.end.isoformat(),
+            "tz": params.tz,
+            "days": days,
+            "tasks": _task_payloads(rows[:CALENDAR_MAX_TASKS], get_bolt_base_url(request)),
+            "truncated": len(rows) > CALENDAR_MAX_TASKS,
+        },
+        headers=headers,
+    )
+
+
+@api.get(
+    "/todos/trends/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Created, completed and overdue tasks over time",
+    tags=["todos", "tasks"],
+)
+async def task_trends(
+    request: Request,
+    params: Annotated[TrendParams, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    """
+    Daily rollups resampled to `bucket`, as parallel arrays: created and
+    completed summed per period, overdue as the period's last nightly snapshot.
+    """
+    try:
+        start, end = trend_window(params.start, params.end)
+    except InvalidWindow as exc:
+        raise BadRequest(detail=str(exc))
+    rows = await sync_to_async(trend_rows)(user_id, start, end)
     return {
-        "total": total,
-        "completed": completed,
-        "in_progress": in_progress,
-        "not_started": not_started,
-        "completed_percentage": round((completed / total * 100), 2) if total else 0,
-        "in_progress_percentage": round((in_progress / total * 100), 2) if total else 0,
-        "not_started_percentage": round((not_started / total * 100), 2) if total else 0,
+        "bucket": params.bucket,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        **resample(rows, start, end, params.bucket),
     }
 
 
@@ -275,12 +693,16 @@ async def task_statistics(user=Depends(get_current_user_async)):
     summary="Get task",
     tags=["todos", "tasks"],
 )
-async def task_detail(request: Request, task_id: int, user=Depends(get_current_user_async)):
+async def task_detail(request: Request, task_id: int, user_id=Depends(get_current_user_id)):
+    headers, fresh = await validators(request, user_id)
+    if fresh:
+        return not_modified(headers)
     try:
-        task = await Task.objects.select_related("category").aget(id=task_id, user=user)
+        task = await Task.objects.select_related("category").aget(id=task_id, user_id=user_id)
     except Task.DoesNotExist:
         raise NotFound(detail="Task not found.")
-    return await sync_to_async(_task_payload)(task, get_bolt_base_url(request))
+    payload = await sync_to_async(_task_payload)(task, get_bolt_base_url(request))
+    return Response(payload, headers=headers)
 
 
 @api.put(
@@ -294,9 +716,9 @@ async def task_update(
     request: Request,
     task_id: int,
     body: TaskUpdate,
-    user=Depends(get_current_user_async),
+    user_id=Depends(get_current_user_id),
 ):
-    return await _task_update_impl(request, task_id, body, user)
+    return await _task_update_impl(request, task_id, body, user_id)
 
 
 @api.patch(
@@ -310,16 +732,16 @@ async def task_partial_update(
     request: Request,
     task_id: int,
     body: TaskUpdate,
-    user=Depends(get_current_user_async),
+    user_id=Depends(get_current_user_id),
 ):
-    return await _task_update_impl(request, task_id, body, user)
+    return await _task_update_impl(request, task_id, body, user_id)
 
 
 async def _task_update_impl(
-    request: Request, task_id: int, body: TaskUpdate, user
+    request: Request, task_id: int, body: TaskUpdate, user_id: int
 ):
     try:
-        task = await Task.objects.select_related("category").aget(id=task_id, user=user)
+        task = await Task.objects.select_related("category").aget(id=task_id, user_id=user_id)
     except Task.DoesNotExist:
         raise NotFound(detail="Task not found.")
     update_fields = []
@@ -343,7 +765,7 @@ async def _task_update_impl(
             task.category_id = None
         else:
             try:
-                cat = await Category.objects.aget(id=body.category_id, user=user)
+                cat = await Category.objects.aget(id=body.category_id, user_id=user_id)
                 task.category = cat
             except Category.DoesNotExist:
                 raise BadRequest(detail="Category not found or not yours.")
@@ -361,9 +783,229 @@ async def _task_update_impl(
     tags=["todos", "tasks"],
     status_code=204,
 )
-async def task_delete(task_id: int, user=Depends(get_current_user_async)):
+async def task_delete(task_id: int, user_id=Depends(get_current_user_id)):
     try:
-        task = await Task.objects.aget(id=task_id, user=user)
+        task = await Task.objects.aget(id=task_id, user_id=user_id)
     except Task.DoesNotExist:
         raise NotFound(detail="Task not found.")
     await task.adelete()
+
+
+@api.put(
+    "/todos/{task_id}/image/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Upload task image",
+    tags=["todos", "tasks"],
+)
+async def task_image_upload(
+    request: Request,
+    task_id: int,
+    image: Annotated[UploadFile, File(max_size=max_image_size())],
+    user_id=Depends(get_current_user_id),
+):
+    try:
+        task = await Task.objects.select_related("category").aget(id=task_id, user_id=user_id)
+    except Task.DoesNotExist:
+        raise NotFound(detail="Task not found.")
+    try:
+        await sync_to_async(store_image)(task, "image", image.raw_file)
+    except UploadRejected as exc:
+        raise upload_error(exc)
+    return await sync_to_async(_task_payload)(task, get_bolt_base_url(request))
+
+
+@api.delete(
+    "/todos/{task_id}/image/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Remove task image",
+    tags=["todos", "tasks"],
+)
+async def task_image_delete(request: Request, task_id: int, user_id=Depends(get_current_user_id)):
+    try:
+        task = await Task.objects.select_related("category").aget(id=task_id, user_id=user_id)
+    except Task.DoesNotExist:
+        raise NotFound(detail="Task not found.")
+    await sync_to_async(clear_image)(task, "image")
+    return await sync_to_async(_task_payload)(task, get_bolt_base_url(request))
+
+
+# ---- Dashboard ----
+
+
+@api.get(
+    "/dashboard/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Profile, categories, statistics and tasks in one response",
+    tags=["todos"],
+)
+async def dashboard(
+    request: Request,
+    filters: Annotated[TaskFilters, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    # One authentication for the four sections, fetched concurrently;
+    # categories and `tasks` (which takes the list's params) share the list
+    # caches. No ETag: the data version
+    # does not cover the profile.
+    base_url = get_bolt_base_url(request)
+    version = await get_data_version(user_id)
+    try:
+        user, categories, statistics, tasks = await asyncio.gather(
+            user_cache.aget(user_id),
+            _category_payloads(user_id, version),
+            _statistics_payload(user_id),
+            _cached_task_list_page(filters, user_id, base_url, version),
+        )
+    except get_user_model().DoesNotExist:
+        raise Unauthorized(detail="User not found.")
+    return {
+        "user": await sync_to_async(accounts_views._user_payload)(user, base_url),
+        "categories": categories,
+        "statistics": statistics,
+        "tasks": tasks,
+    }
+
+
+# ---- Sync ----
+
+
+def _empty_sync(seq: int, reset: bool = False) -> dict:
+    return {
+        "token": encode_token(seq),
+        "reset": reset,
+        "has_more": False,
+        "tasks": [],
+        "categories": [],
+        "deleted": {"tasks": [], "categories": []},
+    }
+
+
+@api.get(
+    "/sync/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Changes since a sync token",
+    tags=["todos", "sync"],
+)
+async def sync_changes(
+    request: Request,
+    params: Annotated[SyncParams, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    """
+    Without `since`: the current token only; take it before loading lists.
+    With `since`: tasks and categories written after it, deleted ids, and
+    the next token. `reset` means the token is unknown and lists must be reloaded.
+    """
+    if params.since is None:
+        return _empty_sync(await sync_to_async(current_seq)(user_id))
+    try:
+        since = decode_token(params.since)
+    except InvalidToken as exc:
+        raise BadRequest(detail=str(exc))
+    delta = await sync_to_async(changes_since)(
+        user_id, since, params.limit, TASK_ROW_FIELDS, CATEGORY_ROW_FIELDS
+    )
+    if delta["reset"]:
+        return _empty_sync(delta["seq"], reset=True)
+    return _sync_payload(delta, get_bolt_base_url(request))
+
+
+def _sync_payload(delta: dict, base_url: str | None) -> dict:
+    return {
+        "token": encode_token(delta["seq"]),
+        "reset": False,
+        "has_more": delta["has_more"],
+        "tasks": _task_payloads(delta["tasks"], base_url),
+        "categories": [_category_payload(row) for row in delta["categories"]],
+        "deleted": {
+            "tasks": delta["deleted_tasks"],
+            "categories": delta["deleted_categories"],
+        },
+    }
+
+
+# ---- Events ----
+
+
+def _sse(event: str, data: dict, event_id: str | None = None) -> bytes:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+@api.get(
+    "/events/",
+    auth=[JWTAuthentication()],
+    guards=[IsAuthenticated()],
+    summary="Stream task and category changes (server-sent events)",
+    tags=["todos", "sync"],
+)
+async def events_stream(
+    request: Request,
+    params: Annotated[EventParams, Query()],
+    user_id=Depends(get_current_user_id),
+):
+    """
+    `changes` events carry the same body as GET /sync/ and use its token as
+    the event id, so a reconnect (Last-Event-ID) or `since` resumes without
+    gaps; `stats` follows any task change; `reset` means reload lists.
+    Comment lines are sent as a heartbeat while idle.
+    """
+    token = params.since or (getattr(request, "headers", None) or {}).get("last-event-id")
+    since = None
+    if token:
+        try:
+            since = decode_token(token)
+        except InvalidToken as exc:
+            raise BadRequest(detail=str(exc))
+    # Subscribe before reading the sequence, so no commit falls in between.
+    subscription = event_bus.subscribe(user_id)
+    try:
+        latest = await sync_to_async(current_seq)(user_id)
+    except BaseException:
+        subscription.close()
+        raise
+    subscription.notify(latest)
+    return StreamingResponse(
+        _event_stream(subscription, latest if since is None else since, get_bolt_base_url(request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(subscription, since: int, base_url: str | None, heartbeat: float | None = None):
+    """
+    Only the newest sequence number is kept per subscription, so however
+    slowly the client reads, it catches up with EVENT_BATCH-row deltas
+    instead of a backlog of queued events.
+    """
+    user_id = subscription.user_id
+    heartbeat = heartbeat or events_config()["HEARTBEAT"]
+    try:
+        yield _sse("ready", {"token": encode_token(since)})
+        while True:
+            if subscription.seq != since:  # newer writes, or a token ahead of the sequence
+                delta = await sync_to_async(changes_since)(
+                    user_id, since, EVENT_BATCH, TASK_ROW_FIELDS, CATEGORY_ROW_FIELDS
+                )
+                if delta["reset"]:
+                    since = delta["seq"]
+                    yield _sse("reset", {"token": encode_token(since)}, encode_token(since))
+                elif delta["seq"] > since:
+                    since = delta["seq"]
+                    yield _sse("changes", _sync_payload(delta, base_url), encode_token(since))
+                    if delta["tasks"] or delta["deleted_tasks"]:
+                        stats = await sync_to_async(get_user_stats)(user_id)
+                        yield _sse("stats", stats_payload(stats))
+                    if delta["has_more"]:
+                        continue
+            if not await subscription.wait(heartbeat):
+                yield b": heartbeat\n\n"
+    finally:
+        subscription.close()
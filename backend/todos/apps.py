@@ -1,7 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TodosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todos'
 
+    def ready(self):
+        from .search import ensure_sqlite_fts
+
+        post_migrate.connect(ensure_sqlite_fts, sender=self)
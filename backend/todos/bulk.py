@@ -0,0 +1,194 @@
+"""
+Set-wise task writes for the v2 bulk endpoint.
+
+Creates go through bulk_create, updates are grouped by identical change
+sets into one queryset update() each, deletes are a single soft-delete
+update(). Ownership of tasks and categories is checked with one query per
+kind instead of one per item. None of these paths call Task.save/delete,
+so the combined effect is reported once through todos.changes.
+
+Item-level problems (unknown task, foreign category, duplicate id) are
+reported per item and do not abort the rest of the request; database
+errors roll the whole request back.
+"""
+from collections import defaultdict, deque
+
+from django.db import transaction
+from django.utils import timezone
+
+from todos import changes
+from todos.models import Category, Task
+
+BATCH_SIZE = 500
+
+UPDATABLE_FIELDS = ("title", "description", "priority", "status", "due_date")
+
+CATEGORY_ERROR = "Category not found or not yours."
+TASK_ERROR = "Task not found."
+DUPLICATE_ERROR = "Task appears more than once in update."
+
+
+def _error(index: int, detail: str, task_id: int | None = None) -> dict:
+    result = {"index": index, "status": "error", "detail": detail}
+    if task_id is not None:
+        result["id"] = task_id
+    return result
+
+
+def _owned_categories(user_id: int, items, using) -> set[int]:
+    wanted = {item.category_id for item in items if item.category_id}
+    if not wanted:
+        return set()
+    return set(
+        Category.objects.using(using)
+        .filter(user_id=user_id, id__in=wanted)
+        .values_list("id", flat=True)
+    )
+
+
+def _fill_ids(tasks: list[Task], user_id: int, using) -> None:
+    """
+    Backends that cannot return ids from bulk INSERT (MySQL) leave pk unset.
+    Each object got its own created_at from auto_now_add, and rows sharing a
+    timestamp were inserted in list order, so (created_at, id) maps them back.
+    """
+    stamps = {task.created_at for task in tasks}
+    pending = defaultdict(deque)
+    rows = (
+        Task.objects.using(using)
+        .filter(user_id=user_id, created_at__in=stamps)
+        .order_by("created_at", "id")
+        .values_list("created_at", "id")
+    )
+    for stamp, pk in rows:
+        pending[stamp].append(pk)
+    for task in tasks:
+        task.pk = pending[task.created_at].popleft()
+
+
+def _create(user_id: int, items, owned: set[int], seq: int, using, transitions: list) -> list[dict]:
+    results = [None] * len(items)
+    tasks, indexes = [], []
+    for index, item in enumerate(items):
+        if item.category_id is not None and item.category_id not in owned:
+            results[index] = _error(index, CATEGORY_ERROR)
+            continue
+        tasks.append(Task(
+            user_id=user_id,
+            title=item.title,
+            description=item.description,
+            priority=item.priority,
+            status=item.status,
+            due_date=item.due_date,
+            category_id=item.category_id,
+            change_seq=seq,
+        ))
+        indexes.append(index)
+    if tasks:
+        Task.objects.using(using).bulk_create(tasks, batch_size=BATCH_SIZE)
+        if tasks[0].pk is None:
+            _fill_ids(tasks, user_id, using)
+    for index, task in zip(indexes, tasks):
+        results[index] = {"index": index, "status": "created", "id": task.pk}
+        transitions.append((None, (task.status, task.priority)))
+    return results
+
+
+def _changes(item, owned: set[int]) -> dict | None:
+    """Field changes for one update item, or None if its category is not owned."""
+    values = {
+        field: getattr(item, field)
+        for field in UPDATABLE_FIELDS
+        if getattr(item, field) is not None
+    }
+    if item.category_id is not None:
+        if item.category_id == 0:
+            values["category_id"] = None
+        elif item.category_id in owned:
+            values["category_id"] = item.category_id
+        else:
+            return None
+    return values
+
+
+def _update(user_id: int, items, owned: set[int], seq: int, using, transitions: list) -> list[dict]:
+    ids = {item.id for item in items}
+    states = {
+        pk: (status, priority)
+        for pk, status, priority in Task.objects.using(using)
+        .select_for_update()
+        .filter(user_id=user_id, id__in=ids)
+        .values_list("id", "status", "priority")
+    }
+    results = [None] * len(items)
+    groups = defaultdict(list)
+    seen = set()
+    for index, item in enumerate(items):
+        if item.id not in states:
+            results[index] = _error(index, TASK_ERROR, item.id)
+            continue
+        if item.id in seen:
+            results[index] = _error(index, DUPLICATE_ERROR, item.id)
+            continue
+        seen.add(item.id)
+        values = _changes(item, owned)
+        if values is None:
+            results[index] = _error(index, CATEGORY_ERROR, item.id)
+            continue
+        groups[tuple(sorted(values.items()))].append(item.id)
+        results[index] = {"index": index, "status": "updated", "id": item.id}
+
+    now = timezone.now()
+    for key, pks in groups.items():
+        values = dict(key)
+        if values:
+            Task.objects.using(using).filter(id__in=pks).update(updated_at=now, change_seq=seq, **values)
+        for pk in pks:
+            old = states[pk]
+            new = (values.get("status", old[0]), values.get("priority", old[1]))
+            transitions.append((old, new))
+    return results
+
+
+def _delete(user_id: int, ids: list[int], seq: int, using, transitions: list) -> list[dict]:
+    states = {
+        pk: (status, priority)
+        for pk, status, priority in Task.objects.using(using)
+        .select_for_update()
+        .filter(user_id=user_id, id__in=set(ids))
+        .values_list("id", "status", "priority")
+    }
+    if states:
+        Task.objects.using(using).filter(id__in=states).update(
+            deleted_at=timezone.now(), change_seq=seq
+        )
+    results = []
+    deleted = set()
+    for index, pk in enumerate(ids):
+        if pk in states and pk not in deleted:
+            deleted.add(pk)
+            results.append({"index": index, "status": "deleted", "id": pk})
+            transitions.append((states[pk], None))
+        else:
+            results.append(_error(index, TASK_ERROR, pk))
+    return results
+
+
+def apply_bulk(user_id: int, create=(), update=(), delete=(), using=None) -> dict:
+    """
+    Apply create, update and delete operations for one user in a single
+    transaction. Returns per-item results keyed by operation, in request order.
+    """
+    transitions = []
+    with transaction.atomic(using=using):
+        # First, so the sequence lock is always taken before any task row lock.
+        seq = changes.next_change_seq(user_id, using=using)
+        owned = _owned_categories(user_id, [*create, *update], using)
+        results = {
+            "create": _create(user_id, create, owned, seq, using, transitions),
+            "update": _update(user_id, update, owned, seq, using, transitions),
+            "delete": _delete(user_id, delete, seq, using, transitions),
+        }
+        if transitions:
+            changes.tasks_changed(user_id, transitions, using=using)
+    return results
@@ -0,0 +1,109 @@
+"""
+Write hooks for Task and Category.
+
+Task and Category save/delete call into this module inside their
+transaction; every piece of state derived from those tables (counters,
+change sequence and with it the data version, daily rollups, event
+notifications) is maintained from here.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from todos import rollups, stats
+from todos.events import event_bus
+from todos.models import ChangeSequence
+
+
+def next_change_seq(user_id: int, using=None) -> int:
+    """
+    Allocate the user's next change sequence number. The counter row stays
+    locked until the surrounding transaction ends, so a later number can
+    never commit before an earlier one. Event streams hear of it on commit.
+    """
+    counter = ChangeSequence.objects.using(using).filter(user_id=user_id)
+    now = timezone.now()
+    if not counter.update(value=F("value") + 1, changed_at=now):
+        ChangeSequence.objects.using(using).get_or_create(user_id=user_id)
+        counter.update(value=F("value") + 1, changed_at=now)
+    seq = counter.values_list("value", flat=True).get()
+    transaction.on_commit(lambda: event_bus.publish(user_id, seq), using=using)
+    return seq
+
+
+def stamp_change(instance, save_kwargs: dict):
+    """Give a Task/Category about to be saved the next change_seq; adjusts update_fields."""
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is not None and not update_fields:
+        return  # Django skips the save entirely
+    instance.change_seq = next_change_seq(instance.user_id, using=save_kwargs.get("using"))
+    if update_fields is not None:
+        save_kwargs["update_fields"] = [*update_fields, "change_seq"]
+
+
+def soft_delete(instance, using=None) -> bool:
+    """
+    Flag a Task/Category deleted and stamp the next change_seq in one
+    UPDATE ... WHERE deleted_at IS NULL. The sequence number is taken first,
+    so its lock precedes the row's as in every writer; when the row was
+    already deleted (e.g. by a concurrent request) the number goes unused
+    and False is returned.
+    """
+    seq = next_change_seq(instance.user_id, using=using)
+    deleted_at = timezone.now()
+    rows = type(instance)._base_manager.using(using or instance._state.db).filter(
+        pk=instance.pk, deleted_at__isnull=True
+    )
+    if rows.update(deleted_at=deleted_at, change_seq=seq) != 1:
+        return False
+    instance.deleted_at, instance.change_seq = deleted_at, seq
+    return True
+
+
+def _state(task):
+    return (task.status, task.priority)
+
+
+def task_saved(task, created: bool, previous, update_fields=None):
+    """
+    Apply a saved task's effects. `previous` is the (status, priority) stored
+    before the write, read under lock by Task.save.
+    """
+    using = task._state.db
+    current = _state(task)
+    if not created and previous is None:
+        # No stored row to compare with: recount; the daily rollup cannot
+        # tell what changed and is left as is.
+        stats.rebuild_user_stats(task.user_id, using=using)
+        return
+    if previous is not None and update_fields is not None:
+        fields = set(update_fields)
+        current = (
+            task.status if "status" in fields else previous[0],
+            task.priority if "priority" in fields else previous[1],
+        )
+    stats.apply_delta(task.user_id, stats.state_delta(previous, current), using=using)
+    rollups.record(task.user_id, [(previous, current)], using=using)
+
+
+def task_deleted(task, previous):
+    """Called after the soft delete; the row keeps its pk and change_seq."""
+    using = task._state.db
+    stats.apply_delta(task.user_id, stats.state_delta(previous, None), using=using)
+
+
+def tasks_changed(user_id: int, transitions, using=None):
+    """
+    Effects of set-wise writes (bulk_create, queryset update()/delete()),
+    which bypass Task.save/delete. `transitions` are (old, new) state pairs,
+    None meaning the task did not exist before / no longer exists. The
+    caller stamps change_seq on written (and soft-deleted) rows.
+    """
+    delta = Counter()
+    for old, new in transitions:
+        delta.update(stats.state_delta(old, new))
+    stats.apply_delta(user_id, {field: n for field, n in delta.items() if n}, using=using)
+    rollups.record(user_id, transitions, using=using)
+
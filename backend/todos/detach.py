@@ -0,0 +1,122 @@
+"""
+Detach a deleted category's tasks in the background.
+
+Deleting a category is one flag update (Category.delete); reads already
+treat its tasks as uncategorized. Once that commits, the category is queued
+here. A worker thread clears category_id on its tasks, BATCH_SIZE rows per
+transaction, and records progress on the category itself:
+
+    tasks_to_detach   tasks found when the worker started (None until then)
+    tasks_detached    tasks cleared so far
+    detached_at       set once none are left
+
+Settings: TODOS_CATEGORY_DETACH. Jobs beyond MAX_PENDING, or lost to a
+restart, are left to `manage.py detach_categories`, and the purge detaches
+whatever is still attached before removing a category.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common import metrics
+from todos.models import Category, Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "BATCH_SIZE": 500,
+    "WORKERS": 1,
+    "MAX_PENDING": 1000,
+}
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "TODOS_CATEGORY_DETACH", {})}
+
+
+def detach_category(category_id: int, batch_size: int | None = None, using=None) -> int:
+    """Clear category_id on the category's tasks, one small transaction per batch."""
+    batch_size = batch_size or config()["BATCH_SIZE"]
+    tasks = Task.all_objects.using(using)
+    categories = Category.all_objects.using(using).filter(pk=category_id)
+    categories.update(tasks_to_detach=tasks.filter(category_id=category_id).count(), tasks_detached=0)
+    detached = 0
+    while True:
+        ids = list(tasks.filter(category_id=category_id).values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic(using=using):
+            n = tasks.filter(id__in=ids, category_id=category_id).update(category_id=None)
+            categories.update(tasks_detached=F("tasks_detached") + n)
+        detached += n
+    categories.update(detached_at=timezone.now())
+    return detached
+
+
+def pending_categories(using=None):
+    return Category.all_objects.using(using).filter(deleted_at__isnull=False, detached_at__isnull=True)
+
+
+class CategoryDetacher:
+    """Worker threads detaching deleted categories' tasks, WORKERS wide."""
+
+    def __init__(self):
+        self._threads = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.detached = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _executor(self):
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(config()["WORKERS"], thread_name_prefix="detach")
+            return self._threads
+
+    def submit(self, category_id: int, using=None):
+        """Queue the category; returns a Future, or None if dropped."""
+        with self._lock:
+            if self.pending >= config()["MAX_PENDING"]:
+                self.dropped += 1
+                return None
+            self.pending += 1
+        return self._executor().submit(self._run, category_id, using)
+
+    def _run(self, category_id, using):
+        try:
+            self.detached += detach_category(category_id, using=using)
+        except Exception:
+            self.failed += 1
+            logger.exception("Detaching tasks of category %s failed", category_id)
+        finally:
+            with self._lock:
+                self.pending -= 1
+            close_old_connections()
+
+    def schedule(self, category_id: int, using=None):
+        """Queue once the current transaction commits."""
+        transaction.on_commit(lambda: self.submit(category_id, using), using=using)
+
+    def shutdown(self):
+        with self._lock:
+            threads, self._threads = self._threads, None
+        if threads is not None:
+            threads.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "detached": self.detached,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+category_detacher = CategoryDetacher()
+metrics.register("category_detach", category_detacher.stats)
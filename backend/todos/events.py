@@ -0,0 +1,193 @@
+"""
+Per-user change notifications for the v2 event stream (/api/v2/events/).
+
+Every Task/Category write allocates a change sequence number
+(changes.next_change_seq); once the write commits, that number is published
+here. A subscription keeps only the highest number seen, never a queue of
+events: the stream reads everything after its last token through
+todos.sync, so a slow consumer catches up with one coalesced delta and
+holds constant memory however far behind it falls.
+
+Backends (settings.TODOS_EVENTS["BACKEND"]):
+- "local": fan-out within this process only; one worker, and tests.
+- "poll":  also polls ChangeSequence for the users subscribed in this
+           process every POLL_INTERVAL seconds, so writes made by other
+           worker processes reach their subscribers.
+- a dotted path to a class with the same interface (e.g. a Redis pub/sub
+  fan-out).
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from common import metrics
+from todos.models import ChangeSequence
+
+DEFAULTS = {
+    "BACKEND": "local",
+    "POLL_INTERVAL": 2,
+    "HEARTBEAT": 15,
+}
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "TODOS_EVENTS", {})}
+
+
+class Subscription:
+    """One stream's view of a user's sequence; lives on the loop that created it."""
+
+    def __init__(self, bus, user_id: int):
+        self.bus = bus
+        self.user_id = user_id
+        self.seq = 0
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+
+    def _advance(self, seq: int):
+        if seq > self.seq:
+            self.seq = seq
+            self._changed.set()
+
+    def notify(self, seq: int):
+        """Thread-safe: wake the stream if `seq` is newer than what it has seen."""
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                self._advance(seq)
+                return
+        except RuntimeError:  # no loop in this thread
+            pass
+        try:
+            self._loop.call_soon_threadsafe(self._advance, seq)
+        except RuntimeError:  # loop closed; the stream is gone
+            self.close()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a newer sequence number; False on timeout (time for a heartbeat)."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class LocalBackend:
+    """Deliver to this process's subscribers only."""
+
+    def publish(self, bus, user_id: int, seq: int):
+        bus.deliver(user_id, seq)
+
+    def subscribed(self, bus):
+        pass
+
+
+def _sequences(user_ids) -> list[tuple[int, int]]:
+    return list(
+        ChangeSequence.objects.filter(user_id__in=user_ids).values_list("user_id", "value")
+    )
+
+
+class PollingBackend(LocalBackend):
+    """
+    Local delivery, plus one poller task per process reading the sequence
+    rows of subscribed users, to pick up writes committed by other workers.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+        self.polls = 0
+
+    def subscribed(self, bus):
+        task = self._task
+        if task is None or task.done() or task.get_loop().is_closed():
+            self._task = asyncio.get_running_loop().create_task(self._poll(bus))
+
+    async def _poll(self, bus):
+        while user_ids := bus.user_ids():
+            for user_id, seq in await sync_to_async(_sequences)(user_ids):
+                bus.deliver(user_id, seq)
+            self.polls += 1
+            await asyncio.sleep(self.interval)
+
+
+class EventBus:
+    def __init__(self):
+        self._backend = None
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+        self.published = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            conf = config()
+            name = conf["BACKEND"]
+            if name == "poll":
+                self._backend = PollingBackend(conf["POLL_INTERVAL"])
+            elif name == "local":
+                self._backend = LocalBackend()
+            else:
+                self._backend = import_string(name)(conf)
+        return self._backend
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Call from the stream's event loop."""
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        self.backend.subscribed(self)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def user_ids(self) -> list[int]:
+        with self._lock:
+            return list(self._subscriptions)
+
+    def deliver(self, user_id: int, seq: int):
+        """Wake this process's subscriptions for `user_id`."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.notify(seq)
+
+    def publish(self, user_id: int, seq: int):
+        """A write for `user_id` committed with sequence number `seq`; any thread."""
+        self.published += 1
+        self.backend.publish(self, user_id, seq)
+
+    def reset(self):
+        with self._lock:
+            self._subscriptions.clear()
+        self._backend = None
+        self.published = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            users = len(self._subscriptions)
+            streams = sum(len(s) for s in self._subscriptions.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "users": users,
+            "streams": streams,
+            "published": self.published,
+        }
+
+
+event_bus = EventBus()
+metrics.register("events", event_bus.stats)
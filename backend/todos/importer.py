@@ -0,0 +1,174 @@
+"""
+Streaming task import from CSV or NDJSON.
+
+Records are parsed one line at a time, validated against the v2 TaskCreate
+schema and inserted in fixed-size bulk_create chunks, each in its own
+transaction. Category names resolve through one name -> id map per import.
+Memory is bounded by one chunk plus the first MAX_REPORTED_ERRORS errors,
+whatever the file size.
+
+Columns / keys: title (required), description, priority, status, due_date,
+category_name. Others are ignored, so v2 exports import as-is.
+"""
+import csv
+import itertools
+import json
+
+import msgspec
+from django.db import transaction
+
+from todos import changes
+from todos.api.v2.schemas import TaskCreate
+from todos.models import Category, Task
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+FORMATS = ("csv", "ndjson")
+
+FIELDS = ("title", "description", "priority", "status", "due_date")
+CATEGORY_NAME_MAX = Category._meta.get_field("name").max_length
+
+
+def detect_format(filename: str | None, content_type: str | None = None) -> str | None:
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in ctype or "jsonl" in ctype:
+        return "ndjson"
+    return None
+
+
+def _decode(raw: bytes, number: int) -> str:
+    return raw.decode("utf-8-sig" if number == 1 else "utf-8")
+
+
+def iter_records(stream, fmt: str):
+    """
+    Yield (row_number, record, error) from a binary stream, one row at a time.
+    Exactly one of record / error is set. Lines are decoded one by one, so
+    invalid UTF-8 is an error on its row rather than a failed request.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(_decode(raw, number) for number, raw in enumerate(stream, start=1))
+        number = 0
+        try:
+            for number, row in enumerate(reader, start=1):
+                yield number, row, None
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # A CSV reader cannot resume mid-record: report where it stopped.
+            yield number + 1, None, f"Unreadable CSV, import stopped here: {exc}"
+        return
+    for number, raw in enumerate(stream, start=1):
+        try:
+            line = _decode(raw, number)
+        except UnicodeDecodeError as exc:
+            yield number, None, f"Invalid UTF-8: {exc}"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object."
+            continue
+        yield number, record, None
+
+
+class TaskImporter:
+    """
+    Import records for one user. Call step() until it returns False, or run().
+    `report` is kept current after every chunk.
+    """
+
+    def __init__(self, user_id: int, chunk_size: int = CHUNK_SIZE, create_categories: bool = False, using=None):
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.create_categories = create_categories
+        self.using = using
+        self.categories = dict(
+            Category.objects.using(using).filter(user_id=user_id).values_list("name", "id")
+        )
+        self.report = {"processed": 0, "created": 0, "failed": 0, "errors": []}
+
+    def _error(self, row: int, detail: str):
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"row": row, "detail": detail})
+
+    def _category_id(self, name: str) -> int | None:
+        category_id = self.categories.get(name)
+        if category_id is None and self.create_categories:
+            category = Category.objects.using(self.using).create(user_id=self.user_id, name=name)
+            category_id = self.categories[name] = category.id
+        return category_id
+
+    def _build(self, row: int, record: dict) -> Task | None:
+        data = {
+            field: record[field]
+            for field in FIELDS
+            if record.get(field) not in (None, "")
+        }
+        try:
+            item = msgspec.convert(data, TaskCreate, strict=False)
+        except msgspec.ValidationError as exc:
+            self._error(row, str(exc))
+            return None
+        category_id = None
+        name = record.get("category_name")
+        if name:
+            name = str(name)
+            if len(name) > CATEGORY_NAME_MAX:
+                self._error(row, f"Category name longer than {CATEGORY_NAME_MAX} characters.")
+                return None
+            category_id = self._category_id(name)
+            if category_id is None:
+                self._error(row, f"Unknown category '{name}'.")
+                return None
+        return Task(
+            user_id=self.user_id,
+            title=item.title,
+            description=item.description,
+            priority=item.priority,
+            status=item.status,
+            due_date=item.due_date,
+            category_id=category_id,
+        )
+
+    def step(self, records) -> bool:
+        """Import the next chunk from `records`; False once it is exhausted."""
+        batch = list(itertools.islice(records, self.chunk_size))
+        tasks = []
+        for row, record, error in batch:
+            self.report["processed"] += 1
+            if error:
+                self._error(row, error)
+                continue
+            task = self._build(row, record)
+            if task is not None:
+                tasks.append(task)
+        if tasks:
+            with transaction.atomic(using=self.using):
+                seq = changes.next_change_seq(self.user_id, using=self.using)
+                for task in tasks:
+                    task.change_seq = seq
+                Task.objects.using(self.using).bulk_create(tasks)
+                changes.tasks_changed(
+                    self.user_id,
+                    [(None, (task.status, task.priority)) for task in tasks],
+                    using=self.using,
+                )
+            self.report["created"] += len(tasks)
+        return len(batch) == self.chunk_size
+
+    def run(self, records, progress=None) -> dict:
+        records = iter(records)
+        while self.step(records):
+            if progress:
+                progress(self.report)
+        if progress:
+            progress(self.report)
+        return self.report
@@ -0,0 +1,96 @@
+"""
+Result cache for the v2 task and category lists.
+
+Entries are keyed by user, the user's committed change sequence (the data
+version from todos.versioning, which every Task/Category write in v1 and v2
+advances) and the normalized filters. Writes never need to find and delete
+entries: pages under older sequence values just stop being asked for and age
+out, and every worker agrees on the current value. Category pages use keys starting with
+"categories", which no task list key does.
+
+Backends (settings.TODOS_LIST_CACHE["BACKEND"]):
+- "local":  per-process LRU with TTL and an entry bound.
+- "django": shared, through Django's cache framework (CACHE_ALIAS).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from common import metrics
+from common.lru import LocalLRUCache
+
+DEFAULTS = {
+    "BACKEND": "local",
+    "MAX_ENTRIES": 2048,
+    "TIMEOUT": 60,
+    "CACHE_ALIAS": "default",
+}
+
+
+class DjangoCacheBackend:
+    """Shared cache through Django's cache framework."""
+
+    def __init__(self, alias: str, timeout: float):
+        self.alias = alias
+        self.timeout = timeout
+
+    @staticmethod
+    def _key(key) -> str:
+        user_id, seq, filters = key
+        digest = hashlib.blake2b(repr(filters).encode(), digest_size=16).hexdigest()
+        return f"todos:list:{user_id}:{seq}:{digest}"
+
+    async def aget(self, key):
+        return await caches[self.alias].aget(self._key(key))
+
+    async def aset(self, key, value):
+        await caches[self.alias].aset(self._key(key), value, self.timeout)
+
+
+class TaskListCache:
+    def __init__(self):
+        self._backend = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            config = {**DEFAULTS, **getattr(settings, "TODOS_LIST_CACHE", {})}
+            if config["BACKEND"] == "django":
+                self._backend = DjangoCacheBackend(config["CACHE_ALIAS"], config["TIMEOUT"])
+            else:
+                self._backend = LocalLRUCache(config["MAX_ENTRIES"], config["TIMEOUT"])
+        return self._backend
+
+    async def get(self, user_id: int, seq: int, filters: tuple):
+        value = await self.backend.aget((user_id, seq, filters))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, user_id: int, seq: int, filters: tuple, value):
+        await self.backend.aset((user_id, seq, filters), value)
+
+    def reset(self):
+        self._backend = None
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        data = {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+        }
+        if isinstance(self.backend, LocalLRUCache):
+            data["entries"] = len(self.backend)
+        return data
+
+
+task_list_cache = TaskListCache()
+metrics.register("task_list_cache", task_list_cache.stats)
@@ -0,0 +1,82 @@
+"""
+Benchmark per-page serialization cost of the v2 task list.
+
+Compares the old path (model instances + one sync_to_async(_task_payload)
+hop per row) with the batched values() path, on throwaway data that is
+rolled back afterwards.
+
+    python manage.py benchmark_task_list --tasks 2000 --page-size 100 --repeat 20
+"""
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from todos.api.v2.views import TASK_ROW_FIELDS, _task_payload, _task_payloads
+from todos.models import Category, Task
+
+User = get_user_model()
+BASE_URL = "http://testserver"
+
+
+async def _per_row_page(limit: int):
+    qs = Task.objects.filter(user__username="__benchmark__").select_related("category")
+    out = []
+    async for task in qs.order_by("-created_at", "-id")[:limit]:
+        out.append(await sync_to_async(_task_payload)(task, BASE_URL))
+    return out
+
+
+async def _batched_page(limit: int):
+    qs = Task.objects.filter(user__username="__benchmark__")
+    qs = qs.order_by("-created_at", "-id").values(*TASK_ROW_FIELDS)
+    rows = await sync_to_async(list)(qs[:limit])
+    return _task_payloads(rows, BASE_URL)
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-row vs batched serialization of a v2 task list page."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=2000)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options["tasks"])
+            limit = options["page_size"]
+            if async_to_sync(_per_row_page)(limit) != async_to_sync(_batched_page)(limit):
+                raise CommandError("Batched payloads differ from _task_payload output.")
+            for label, page in (("per-row", _per_row_page), ("batched", _batched_page)):
+                elapsed = self._time(page, limit, options["repeat"])
+                self.stdout.write(f"{label:>8}: {elapsed * 1000:.2f} ms/page ({limit} rows)")
+            transaction.set_rollback(True)
+
+    def _seed(self, count: int):
+        user = User.objects.create_user(
+            username="__benchmark__",
+            email="benchmark@example.invalid",
+            password=None,
+        )
+        category = Category.objects.create(name="Benchmark", user=user)
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="Benchmark task " * 8,
+                status=Task.STATUS_CHOICES[i % 3][0],
+                user=user,
+                category=category if i % 2 else None,
+            )
+            for i in range(count)
+        )
+
+    def _time(self, page, limit: int, repeat: int) -> float:
+        run = async_to_sync(page)
+        run(limit)  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            run(limit)
+        return (time.perf_counter() - start) / repeat
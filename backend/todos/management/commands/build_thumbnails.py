@@ -0,0 +1,41 @@
+"""
+Build resized image variants that are missing, e.g. for images uploaded
+before variants existed or dropped from a full queue.
+
+    python manage.py build_thumbnails
+    python manage.py build_thumbnails --limit 500
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from common.thumbnails import build_for
+from todos.models import Task
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Build missing resized variants of task images and profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None,
+                            help="At most this many images per model.")
+
+    def handle(self, *args, **options):
+        for model in (Task, User):
+            built = failed = 0
+            for field, variants_field in model.IMAGE_VARIANT_FIELDS.items():
+                pending = (
+                    model._base_manager.exclude(**{field: ""})
+                    .filter(**{f"{field}__isnull": False, f"{variants_field}__isnull": True})
+                    .order_by("pk")
+                )
+                for instance in pending[:options["limit"]].iterator():
+                    try:
+                        built += build_for(instance, field, variants_field) is not None
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"{model.__name__} {instance.pk}: {exc}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{model.__name__}: built variants for {built} image(s), {failed} failed."
+            ))
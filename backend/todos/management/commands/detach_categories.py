@@ -0,0 +1,27 @@
+"""
+Detach the tasks of deleted categories the background worker has not finished.
+
+    python manage.py detach_categories
+    python manage.py detach_categories --batch-size 200
+"""
+from django.core.management.base import BaseCommand
+
+from todos.detach import config, detach_category, pending_categories
+
+
+class Command(BaseCommand):
+    help = "Detach tasks from deleted categories in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Tasks per transaction (default: TODOS_CATEGORY_DETACH['BATCH_SIZE']).")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or config()["BATCH_SIZE"]
+        categories = detached = 0
+        for category_id in pending_categories().order_by("deleted_at").values_list("id", flat=True).iterator():
+            detached += detach_category(category_id, batch_size)
+            categories += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Detached {detached} task(s) from {categories} deleted category(ies)."
+        ))
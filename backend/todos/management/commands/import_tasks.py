@@ -0,0 +1,63 @@
+"""
+Import tasks for one user from a CSV or NDJSON file.
+
+    python manage.py import_tasks tasks.csv --user 42
+    python manage.py import_tasks export.ndjson --user alice --create-categories
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from todos.importer import CHUNK_SIZE, FORMATS, TaskImporter, detect_format, iter_records
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream tasks from a CSV or NDJSON file into one user's account."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file.")
+        parser.add_argument("--user", required=True, help="User id or username.")
+        parser.add_argument("--format", choices=FORMATS,
+                            help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--create-categories", action="store_true",
+                            help="Create categories missing from the user's account.")
+
+    def handle(self, *args, **options):
+        user = self._user(options["user"])
+        fmt = options["format"] or detect_format(options["path"])
+        if fmt is None:
+            raise CommandError("Cannot tell the file format; pass --format.")
+        importer = TaskImporter(
+            user.pk,
+            chunk_size=options["chunk_size"],
+            create_categories=options["create_categories"],
+        )
+        try:
+            stream = open(options["path"], "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
+        with stream:
+            report = importer.run(iter_records(stream, fmt), progress=self._progress)
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {error['detail']}")
+        if report["failed"] > len(report["errors"]):
+            self.stderr.write(f"... {report['failed'] - len(report['errors'])} more errors not shown.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} of {report['processed']} rows for {user} "
+            f"({report['failed']} failed)."
+        ))
+
+    def _user(self, value: str):
+        lookup = {"pk": int(value)} if value.isdigit() else {"username": value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{value}' not found.")
+
+    def _progress(self, report: dict):
+        self.stdout.write(
+            f"{report['processed']} rows processed, {report['created']} created, "
+            f"{report['failed']} failed"
+        )
@@ -0,0 +1,25 @@
+"""
+Hard-delete soft-deleted tasks and categories past the retention period.
+
+    python manage.py purge_deleted                 # TODOS_SOFT_DELETE_RETENTION_DAYS
+    python manage.py purge_deleted --days 7 --batch-size 200
+"""
+from django.core.management.base import BaseCommand
+
+from todos.purge import BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = "Purge soft-deleted tasks and categories in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Retention in days (default: TODOS_SOFT_DELETE_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        counts = purge_deleted(options["days"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {counts['tasks']} task(s) and {counts['categories']} category(ies); "
+            f"detached {counts['tasks_detached']} task(s) from purged categories."
+        ))
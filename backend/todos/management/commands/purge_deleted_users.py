@@ -0,0 +1,28 @@
+"""
+Hard-delete the tasks and categories of users deleted past the retention period.
+
+    python manage.py purge_deleted_users                    # TODOS_DELETED_USER_PURGE
+    python manage.py purge_deleted_users --days 7 --max-rows-per-second 500
+"""
+from django.core.management.base import BaseCommand
+
+from todos.user_purge import purge_deleted_users
+
+
+class Command(BaseCommand):
+    help = "Purge deleted users' tasks and categories in small, paced batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Retention in days (default: TODOS_DELETED_USER_PURGE['RETENTION_DAYS']).")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--max-rows-per-second", type=float, default=None,
+                            help="Pace limit; 0 for none.")
+
+    def handle(self, *args, **options):
+        counts = purge_deleted_users(options["days"], options["batch_size"], options["max_rows_per_second"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {counts['tasks']} task(s) and {counts['categories']} category(ies) "
+            f"of {counts['users']} deleted user(s) in {counts['seconds']}s "
+            f"({counts['rows_per_second']} rows/s)."
+        ))
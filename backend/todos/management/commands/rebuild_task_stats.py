@@ -0,0 +1,33 @@
+"""
+Recompute TaskStats counters from the Task table.
+
+    python manage.py rebuild_task_stats            # every user with tasks or stats
+    python manage.py rebuild_task_stats --user 42  # one user
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from todos.models import Task, TaskStats
+from todos.stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute per-user task counters from source."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="users",
+                            help="Only rebuild these user ids (repeatable).")
+
+    def handle(self, *args, **options):
+        user_ids = options["users"]
+        if not user_ids:
+            user_ids = sorted(
+                set(Task.objects.values_list("user_id", flat=True).distinct())
+                | set(TaskStats.objects.values_list("user_id", flat=True))
+            )
+        for user_id in user_ids:
+            # Lock the counter row so concurrent deltas queue behind the recount.
+            with transaction.atomic():
+                TaskStats.objects.select_for_update().filter(user_id=user_id).first()
+                rebuild_user_stats(user_id)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task stats for {len(user_ids)} user(s)."))
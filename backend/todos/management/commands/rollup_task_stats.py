@@ -0,0 +1,43 @@
+"""
+Nightly catch-up for the daily task rollups (TaskDailyStats).
+
+    python manage.py rollup_task_stats                    # yesterday
+    python manage.py rollup_task_stats --date 2026-10-01 --days 7
+
+Records every user's overdue count for --date and recounts `created` for
+the --days days ending on it. Run it shortly after midnight: overdue is
+counted from the current task state.
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from todos.rollups import recount_created, snapshot_overdue
+
+
+class Command(BaseCommand):
+    help = "Snapshot overdue counts and recount created tasks in the daily rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Day to roll up, YYYY-MM-DD (default: yesterday).")
+        parser.add_argument("--days", type=int, default=1,
+                            help="Recount created for this many days ending on --date.")
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                day = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError(f"Invalid date '{options['date']}'.")
+        else:
+            day = timezone.localdate() - timedelta(days=1)
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+        first = day - timedelta(days=options["days"] - 1)
+        recounted = recount_created(first, day)
+        users = snapshot_overdue(day)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {day}: overdue for {users} user(s); "
+            f"created recounted for {recounted} user-day(s) since {first}."
+        ))
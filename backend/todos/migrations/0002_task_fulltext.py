@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+class VendorRunSQL(migrations.RunSQL):
+    """RunSQL applied only on one database backend."""
+
+    def __init__(self, vendor, *args, **kwargs):
+        self.vendor = vendor
+        super().__init__(*args, **kwargs)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0001_initial'),
+    ]
+
+    operations = [
+        VendorRunSQL(
+            'mysql',
+            'ALTER TABLE todos_task ADD FULLTEXT INDEX todos_task_title_description_ft (title, description)',
+            'ALTER TABLE todos_task DROP INDEX todos_task_title_description_ft',
+        ),
+        VendorRunSQL(
+            'sqlite',
+            [
+                "CREATE VIRTUAL TABLE IF NOT EXISTS todos_task_fts USING fts5("
+                "title, description, content='todos_task', content_rowid='id')",
+                "CREATE TRIGGER IF NOT EXISTS todos_task_fts_ai AFTER INSERT ON todos_task BEGIN "
+                "INSERT INTO todos_task_fts(rowid, title, description) "
+                "VALUES (new.id, new.title, new.description); END",
+                "CREATE TRIGGER IF NOT EXISTS todos_task_fts_ad AFTER DELETE ON todos_task BEGIN "
+                "INSERT INTO todos_task_fts(todos_task_fts, rowid, title, description) "
+                "VALUES ('delete', old.id, old.title, old.description); END",
+                "CREATE TRIGGER IF NOT EXISTS todos_task_fts_au AFTER UPDATE OF title, description ON todos_task BEGIN "
+                "INSERT INTO todos_task_fts(todos_task_fts, rowid, title, description) "
+                "VALUES ('delete', old.id, old.title, old.description); "
+                "INSERT INTO todos_task_fts(rowid, title, description) "
+                "VALUES (new.id, new.title, new.description); END",
+                "INSERT INTO todos_task_fts(todos_task_fts) VALUES ('rebuild')",
+            ],
+            [
+                'DROP TRIGGER IF EXISTS todos_task_fts_ai',
+                'DROP TRIGGER IF EXISTS todos_task_fts_ad',
+                'DROP TRIGGER IF EXISTS todos_task_fts_au',
+                'DROP TABLE IF EXISTS todos_task_fts',
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 06:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_profile_picture'),
+        ('todos', '0003_task_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('not_started', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('extreme', models.IntegerField(default=0)),
+                ('moderate', models.IntegerField(default=0)),
+                ('low', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Task stats',
+            },
+        ),
+    ]
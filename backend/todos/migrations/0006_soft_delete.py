@@ -0,0 +1,99 @@
+# Generated by Django 6.0 on 2026-10-18 07:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0005_sync_change_sequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='tombstone',
+            name='user',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_due_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_title_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_priority_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_category_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='category',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='changesequence',
+            name='purged_through',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', 'deleted_at', 'name'], name='category_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'created_at'], name='task_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'updated_at'], name='task_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'due_date'], name='task_user_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'title'], name='task_user_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'status', 'created_at'], name='task_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'priority', 'created_at'], name='task_user_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'category', 'created_at'], name='task_user_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['deleted_at'], name='task_deleted_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(models.F('user'), models.F('name'), models.Case(models.When(deleted_at__isnull=True, then=models.Value(1))), name='category_user_name_live_uniq'),
+        ),
+        migrations.DeleteModel(
+            name='Tombstone',
+        ),
+    ]
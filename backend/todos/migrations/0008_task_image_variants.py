@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0007_task_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='image_variants',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 09:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0009_media_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'deleted_at', 'category', 'status', 'due_date'], name='task_user_cat_status_idx'),
+        ),
+    ]
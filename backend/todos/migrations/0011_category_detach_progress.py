@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0010_task_category_counts_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='detached_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='tasks_detached',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='tasks_to_detach',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
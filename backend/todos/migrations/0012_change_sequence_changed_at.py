@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0011_category_detach_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changesequence',
+            name='changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,10 +1,31 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Value, When
 from django.contrib.auth import get_user_model
 from accounts.models import TimestampedModel
+from common.blobs import media_storage
+from common.thumbnails import ImageVariantsMixin
 
 User = get_user_model()
 
 
+class SoftDeleteQuerySet(models.QuerySet):
+    def live(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class LiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Default manager: hides soft-deleted rows. Use `all_objects` to include them."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+AllObjectsManager = models.Manager.from_queryset(SoftDeleteQuerySet)
+
+
 class Category(TimestampedModel):
     """Category model for organizing tasks."""
     
@@ -15,17 +36,65 @@ class Category(TimestampedModel):
         on_delete=models.CASCADE,
         related_name='categories'
     )
+    # Position in the user's change sequence (see ChangeSequence); 0 = before sync existed.
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    # Progress of detaching a deleted category's tasks (todos.detach).
+    tasks_to_detach = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    tasks_detached = models.PositiveIntegerField(default=0, editable=False)
+    detached_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager()
+    all_objects = AllObjectsManager()
     
     class Meta:
         verbose_name_plural = 'Categories'
         ordering = ['name']
-        unique_together = ['name', 'user']  # Each user can have unique category names
+        constraints = [
+            # Each user can have unique category names among live categories:
+            # the third key part is 1 for live rows and NULL (never equal) once deleted.
+            models.UniqueConstraint(
+                'user',
+                'name',
+                Case(When(deleted_at__isnull=True, then=Value(1))),
+                name='category_user_name_live_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'deleted_at', 'name'], name='category_user_name_idx'),
+            models.Index(fields=['user', 'change_seq'], name='category_user_seq_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.user.username})"
 
+    def save(self, *args, **kwargs):
+        from .changes import stamp_change
+
+        with transaction.atomic(using=kwargs.get('using')):
+            stamp_change(self, kwargs)
+            super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        Soft delete: one flag update. Tasks keep their category_id and read as
+        uncategorized; once this commits, todos.detach clears it in batches.
+        """
+        from .changes import soft_delete
+        from .detach import category_detacher
+
+        if self.deleted_at is not None:
+            return 0, {}
+        with transaction.atomic(using=using):
+            if not soft_delete(self, using):
+                return 0, {}
+            category_detacher.schedule(self.pk, using=self._state.db)
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None):
+        return super().delete(using=using)
+
 
-class Task(TimestampedModel):
+class Task(ImageVariantsMixin, TimestampedModel):
     """Task/Todo model."""
     
     PRIORITY_CHOICES = [
@@ -44,7 +113,9 @@ class Task(TimestampedModel):
     description = models.TextField()
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='Moderate')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Not Started')
-    image = models.ImageField(upload_to='tasks/', blank=True, null=True)
+    image = models.ImageField(upload_to='tasks/', storage=media_storage, blank=True, null=True)
+    # Resized copies of `image` (common.thumbnails); set once they are built.
+    image_variants = models.JSONField(blank=True, null=True, editable=False)
     due_date = models.DateTimeField(blank=True, null=True)
     user = models.ForeignKey(
         User,
@@ -58,10 +129,167 @@ class Task(TimestampedModel):
         blank=True,
         related_name='tasks'
     )
+    # Position in the user's change sequence (see ChangeSequence); 0 = before sync existed.
+    change_seq = models.BigIntegerField(default=0, editable=False)
+
+    objects = LiveManager()
+    all_objects = AllObjectsManager()
     
     class Meta:
         ordering = ['-created_at']
+        # One per list query shape: every read is scoped by user and live rows
+        # (deleted_at IS NULL is an equality lookup, so the sort column still
+        # follows in order; MySQL has no partial indexes), then either sorted
+        # on a column or filtered by status/priority/category and sorted by
+        # created_at. InnoDB appends the primary key, which serves the id
+        # tiebreaker; ascending indexes also serve the descending scans.
+        # Sync reads deleted rows too, so its index leaves deleted_at out.
+        indexes = [
+            models.Index(fields=['user', 'deleted_at', 'created_at'], name='task_user_created_idx'),
+            models.Index(fields=['user', 'deleted_at', 'updated_at'], name='task_user_updated_idx'),
+            models.Index(fields=['user', 'deleted_at', 'due_date'], name='task_user_due_idx'),
+            models.Index(fields=['user', 'deleted_at', 'title'], name='task_user_title_idx'),
+            models.Index(fields=['user', 'deleted_at', 'status', 'created_at'], name='task_user_status_idx'),
+            models.Index(fields=['user', 'deleted_at', 'priority', 'created_at'], name='task_user_priority_idx'),
+            models.Index(fields=['user', 'deleted_at', 'category', 'created_at'], name='task_user_category_idx'),
+            # Per-category counts (todos.stats.category_task_counts), from the index alone.
+            models.Index(fields=['user', 'deleted_at', 'category', 'status', 'due_date'],
+                         name='task_user_cat_status_idx'),
+            models.Index(fields=['user', 'change_seq'], name='task_user_seq_idx'),
+            models.Index(fields=['deleted_at'], name='task_deleted_idx'),
+        ]
     
+    IMAGE_VARIANT_FIELDS = {'image': 'image_variants'}
+
     def __str__(self):
         return f"{self.title} ({self.user.username})"
 
+    def save(self, *args, **kwargs):
+        from .changes import stamp_change, task_saved
+
+        created = self._state.adding
+        with transaction.atomic(using=kwargs.get('using')):
+            # Sequence lock first, then the task row, as every writer does.
+            stamp_change(self, kwargs)
+            # The stored state, locked until commit: the instance's own
+            # snapshot may predate a concurrent write the delta must build on.
+            previous = None if created else self._locked_state(kwargs.get('using'))
+            self.images_saving(kwargs)
+            super().save(*args, **kwargs)
+            task_saved(self, created, previous, kwargs.get('update_fields'))
+            self.images_saved(kwargs.get('update_fields'))
+
+    def _locked_state(self, using=None):
+        """(status, priority) as stored, with the row locked; None if it is gone."""
+        return (
+            Task._base_manager.using(using or self._state.db).select_for_update()
+            .filter(pk=self.pk).values_list('status', 'priority').first()
+        )
+
+    def thumbnails_built(self):
+        """Variants were stored by a queryset update; record that as a change."""
+        from .changes import next_change_seq
+
+        with transaction.atomic():
+            seq = next_change_seq(self.user_id)
+            Task._base_manager.filter(pk=self.pk).update(change_seq=seq)
+
+    @property
+    def live_category(self):
+        """The task's category, or None if that category was deleted."""
+        category = self.category
+        return category if category is not None and category.deleted_at is None else None
+
+    def delete(self, using=None, keep_parents=False):
+        """Soft delete: one flag update; the purge job removes the row later."""
+        from .changes import soft_delete, task_deleted
+
+        if self.deleted_at is not None:
+            return 0, {}
+        with transaction.atomic(using=using):
+            if not soft_delete(self, using):
+                return 0, {}
+            # Locked by the update; status and priority are what the counters lose.
+            task_deleted(self, self._locked_state(using))
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None):
+        return super().delete(using=using)
+
+
+class TaskStats(models.Model):
+    """Per-user task counters by status and priority, kept in step with Task writes."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_stats'
+    )
+    total = models.IntegerField(default=0)
+    not_started = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    extreme = models.IntegerField(default=0)
+    moderate = models.IntegerField(default=0)
+    low = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'Task stats'
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}"
+
+
+class TaskDailyStats(models.Model):
+    """
+    Per-user, per-day task activity behind the trends endpoint (todos.rollups).
+    created/completed are kept by Task writes; overdue is the snapshot taken
+    by `manage.py rollup_task_stats`, None until it has run for that day.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='daily_task_stats'
+    )
+    day = models.DateField()
+    created = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    overdue = models.IntegerField(blank=True, null=True)
+
+    class Meta:
+        verbose_name_plural = 'Task daily stats'
+        constraints = [
+            # Also the index for the trends range read.
+            models.UniqueConstraint(fields=['user', 'day'], name='task_daily_stats_user_day_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Stats for user {self.user_id} on {self.day}"
+
+
+class ChangeSequence(models.Model):
+    """
+    Per-user counter behind delta sync. Every Task/Category write takes the
+    next value inside its transaction and keeps this row locked until
+    commit, so for one user sequence order is commit order.
+
+    Soft-deleted rows are the sync tombstones. Once the purge job removes
+    them, tokens at or below `purged_through` may have missed deletions.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='change_sequence'
+    )
+    value = models.BigIntegerField(default=0)
+    # When `value` last moved; Last-Modified of v2 reads (todos.versioning)
+    changed_at = models.DateTimeField(null=True, blank=True)
+    purged_through = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Change sequence for user {self.user_id}: {self.value}"
+
@@ -0,0 +1,74 @@
+"""
+Hard-delete soft-deleted tasks and categories after the retention period.
+
+Runs in small transactions (`manage.py purge_deleted`, e.g. from cron), so
+it never holds many row locks at once. Tasks todos.detach has not detached
+from an expired category yet are detached in batches first, so its final
+DELETE has no SET NULL fan-out.
+Each batch advances the owners' ChangeSequence.purged_through: sync tokens
+older than a purged deletion can no longer see it and must reload. Purged
+tasks release their images (common.blobs).
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from todos.detach import detach_category
+from todos.models import Category, ChangeSequence, Task
+
+BATCH_SIZE = 500
+
+
+def _cutoff(retention_days: int | None):
+    if retention_days is None:
+        retention_days = getattr(settings, "TODOS_SOFT_DELETE_RETENTION_DAYS", 30)
+    return timezone.now() - timedelta(days=retention_days)
+
+
+def _advance_horizon(rows, using):
+    """rows: (id, user_id, change_seq) of deleted rows about to be purged."""
+    horizon = defaultdict(int)
+    for _, user_id, seq in rows:
+        horizon[user_id] = max(horizon[user_id], seq)
+    for user_id, seq in sorted(horizon.items()):
+        ChangeSequence.objects.using(using).filter(
+            user_id=user_id, purged_through__lt=seq
+        ).update(purged_through=seq)
+
+
+def _expired(manager, cutoff, batch_size: int, using) -> list:
+    return list(
+        manager.using(using)
+        .filter(deleted_at__lt=cutoff)
+        .order_by("deleted_at")
+        .values_list("id", "user_id", "change_seq")[:batch_size]
+    )
+
+
+def release_task_images(tasks, using):
+    release = getattr(Task._meta.get_field("image").storage, "release", None)
+    if release:
+        release([name for name in tasks.values_list("image", flat=True) if name], using)
+
+
+def purge_deleted(retention_days: int | None = None, batch_size: int = BATCH_SIZE, using=None) -> dict:
+    cutoff = _cutoff(retention_days)
+    counts = {"categories": 0, "tasks": 0, "tasks_detached": 0}
+    while rows := _expired(Category.all_objects, cutoff, batch_size, using):
+        for category_id, _, _ in rows:
+            counts["tasks_detached"] += detach_category(category_id, batch_size, using)
+        with transaction.atomic(using=using):
+            _advance_horizon(rows, using)
+            Category.all_objects.using(using).filter(id__in=[r[0] for r in rows]).delete()
+        counts["categories"] += len(rows)
+    while rows := _expired(Task.all_objects, cutoff, batch_size, using):
+        with transaction.atomic(using=using):
+            _advance_horizon(rows, using)
+            tasks = Task.all_objects.using(using).filter(id__in=[r[0] for r in rows])
+            release_task_images(tasks, using)
+            tasks.delete()
+        counts["tasks"] += len(rows)
+    return counts
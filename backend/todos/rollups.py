@@ -0,0 +1,181 @@
+"""
+Daily task rollups (TaskDailyStats) and their resampling for trends.
+
+Task writes add to today's row inside their transaction, through
+todos.changes:
+- created:   tasks created that day;
+- completed: net completions that day (+1 when a task becomes Completed,
+             -1 when one is reopened; deleting a task changes neither).
+
+`manage.py rollup_task_stats` runs nightly, after midnight: it records each
+user's overdue count (open tasks due before the end of the day) for the day
+just ended, and recounts `created` from Task.created_at, repairing drift
+from writes that bypass the hooks. Task has no completion timestamp, so
+`completed` only comes from writes.
+
+Days are dates in settings.TIME_ZONE. Trends read only these rows, never Task.
+"""
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from todos.models import Task, TaskDailyStats
+from todos.schedule import InvalidWindow
+
+COMPLETED = "Completed"
+BUCKETS = ("day", "week", "month")
+DEFAULT_DAYS = 365
+MAX_DAYS = 3 * 366
+BATCH_SIZE = 500
+
+
+def transition_counts(transitions) -> dict:
+    """Rollup increments for (old, new) task state pairs; None = absent."""
+    created = completed = 0
+    for old, new in transitions:
+        if new is None:
+            continue
+        if old is None:
+            created += 1
+        completed += (new[0] == COMPLETED) - (old is not None and old[0] == COMPLETED)
+    return {field: n for field, n in (("created", created), ("completed", completed)) if n}
+
+
+def record(user_id: int, transitions, using=None):
+    """
+    Add today's increments for `transitions`; must run inside the write's
+    transaction, after the user's change sequence row is locked, so two
+    writers never race to create the same day's row.
+    """
+    counts = transition_counts(transitions)
+    if not counts:
+        return
+    rows = TaskDailyStats.objects.using(using).filter(user_id=user_id, day=timezone.localdate())
+    values = {field: F(field) + n for field, n in counts.items()}
+    if not rows.update(**values):
+        TaskDailyStats.objects.using(using).get_or_create(user_id=user_id, day=timezone.localdate())
+        rows.update(**values)
+
+
+# ---- Nightly catch-up ----
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    zone = timezone.get_current_timezone()
+    start = datetime.combine(day, time.min, tzinfo=zone)
+    return start, datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+
+
+def _upsert(rows: dict, field: str, using):
+    """rows: {(user_id, day): value}; sets `field`, creating missing rows."""
+    using = using or router.db_for_write(TaskDailyStats)
+    # MySQL upserts on any unique key and rejects an explicit target.
+    target = ["user", "day"] if connections[using].features.supports_update_conflicts_with_target else None
+    TaskDailyStats.objects.using(using).bulk_create(
+        [TaskDailyStats(user_id=user_id, day=day, **{field: value}) for (user_id, day), value in rows.items()],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=target,
+        update_fields=[field],
+    )
+
+
+def recount_created(first: date, last: date, using=None) -> int:
+    """
+    Recount `created` for days first..last from Task.created_at; soft-deleted
+    tasks still count, purged ones are gone, so stay within the retention period.
+    """
+    lower, _ = _day_bounds(first)
+    _, upper = _day_bounds(last)
+    counts = (
+        Task.all_objects.using(using)
+        .filter(created_at__gte=lower, created_at__lt=upper)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("user_id", "day")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    rows = {(user_id, day): n for user_id, day, n in counts}
+    with transaction.atomic(using=using):
+        TaskDailyStats.objects.using(using).filter(day__gte=first, day__lte=last).update(created=0)
+        _upsert(rows, "created", using)
+    return len(rows)
+
+
+def snapshot_overdue(day: date, using=None) -> int:
+    """Overdue count at the end of `day` for every user with tasks; one grouped query."""
+    _, end = _day_bounds(day)
+    overdue = Q(due_date__lt=end) & ~Q(status=COMPLETED)
+    counts = (
+        Task.objects.using(using)
+        .values_list("user_id")
+        .annotate(n=Count("id", filter=overdue))
+        .order_by()
+    )
+    rows = {(user_id, day): n for user_id, n in counts}
+    with transaction.atomic(using=using):
+        _upsert(rows, "overdue", using)
+    return len(rows)
+
+
+# ---- Trends ----
+
+
+def trend_window(start: date | None, end: date | None) -> tuple[date, date]:
+    end = end or timezone.localdate()
+    start = start or end - timedelta(days=DEFAULT_DAYS - 1)
+    if end < start:
+        raise InvalidWindow("end must not be before start.")
+    if (end - start).days >= MAX_DAYS:
+        raise InvalidWindow(f"A trends window spans at most {MAX_DAYS} days.")
+    return start, end
+
+
+def trend_rows(user_id: int, start: date, end: date) -> list[tuple]:
+    return list(
+        TaskDailyStats.objects.filter(user_id=user_id, day__gte=start, day__lte=end)
+        .order_by("day")
+        .values_list("day", "created", "completed", "overdue")
+    )
+
+
+def _bucket_starts(days: np.ndarray, bucket: str) -> np.ndarray:
+    if bucket == "week":
+        # Day 0 (1970-01-01) was a Thursday; weeks start on Monday.
+        return days - (days.astype(np.int64) + 3) % 7
+    if bucket == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    return days
+
+
+def resample(rows: list[tuple], start: date, end: date, bucket: str) -> dict:
+    """
+    Dense series over start..end: created/completed summed per bucket,
+    overdue as the last snapshot in the bucket (None if there is none).
+    Buckets are labelled by their first day; the first may begin before `start`.
+    """
+    calendar = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    periods = np.unique(_bucket_starts(calendar, bucket))
+    created = np.zeros(len(periods), dtype=np.int64)
+    completed = np.zeros(len(periods), dtype=np.int64)
+    last = np.full(len(periods), -1, dtype=np.int64)
+    overdue = np.empty(0)
+    if rows:
+        days, created_in, completed_in, overdue_in = zip(*rows)
+        index = np.searchsorted(periods, _bucket_starts(np.array(days, dtype="datetime64[D]"), bucket))
+        np.add.at(created, index, created_in)
+        np.add.at(completed, index, completed_in)
+        overdue = np.array(overdue_in, dtype=float)  # None -> nan
+        known = np.flatnonzero(~np.isnan(overdue))
+        # Rows are in day order, so the highest position is the period-end snapshot.
+        np.maximum.at(last, index[known], known)
+    return {
+        "periods": periods.astype(str).tolist(),
+        "created": created.tolist(),
+        "completed": completed.tolist(),
+        "overdue": [None if position < 0 else int(overdue[position]) for position in last.tolist()],
+    }
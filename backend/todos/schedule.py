@@ -0,0 +1,72 @@
+"""
+Tasks by due date, for calendar views.
+
+A window is a run of whole days in the caller's time zone. Its tasks come
+from one range scan on the (user, deleted_at, due_date) index and its
+per-day counts from one grouped query over the same range, bucketed by
+local date in the database, so the cost depends on the window, not on the
+user's total task count.
+
+MySQL needs its time zone tables loaded (mysql_tzinfo_to_sql) to bucket by
+anything other than UTC.
+"""
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from todos.models import Task
+from todos.stats import COUNTER_FIELDS, state_delta
+
+MAX_DAYS = 92
+MAX_TASKS = 1000
+
+
+class InvalidWindow(ValueError):
+    pass
+
+
+def window(start: date, end: date, tz: str) -> tuple[datetime, datetime, ZoneInfo]:
+    """[lower, upper) datetimes covering start..end inclusive in `tz`."""
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise InvalidWindow(f"Unknown time zone '{tz}'.")
+    if end < start:
+        raise InvalidWindow("end must not be before start.")
+    if (end - start).days >= MAX_DAYS:
+        raise InvalidWindow(f"A calendar window spans at most {MAX_DAYS} days.")
+    lower = datetime.combine(start, time.min, tzinfo=zone)
+    upper = datetime.combine(end + timedelta(days=1), time.min, tzinfo=zone)
+    return lower, upper, zone
+
+
+def _in_window(user_id: int, lower: datetime, upper: datetime):
+    return Task.objects.filter(user_id=user_id, due_date__gte=lower, due_date__lt=upper)
+
+
+def window_tasks(user_id: int, lower: datetime, upper: datetime, fields, limit: int = MAX_TASKS) -> list[dict]:
+    """Up to limit + 1 rows, by due date; the extra row only signals truncation."""
+    return list(
+        _in_window(user_id, lower, upper)
+        .order_by("due_date", "id")
+        .values(*fields)[: limit + 1]
+    )
+
+
+def day_counts(user_id: int, lower: datetime, upper: datetime, zone: ZoneInfo) -> list[dict]:
+    """Per local day with tasks due: the TaskStats counters for that day, in date order."""
+    rows = (
+        _in_window(user_id, lower, upper)
+        .annotate(day=TruncDate("due_date", tzinfo=zone))
+        .values_list("day", "status", "priority")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    days = {}
+    for day, status, priority, n in rows:
+        counts = days.setdefault(day, dict.fromkeys(COUNTER_FIELDS, 0))
+        for field, value in state_delta(None, (status, priority)).items():
+            counts[field] += value * n
+    return [{"date": day.isoformat(), **days[day]} for day in sorted(days)]
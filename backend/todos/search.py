@@ -0,0 +1,160 @@
+"""
+Full-text search over Task title and description.
+
+- MySQL: FULLTEXT index on (title, description), queried in boolean mode
+  with every term required and prefix-matched. InnoDB drops stopwords and
+  terms shorter than innodb_ft_min_token_size from the index, and a required
+  "+term*" it cannot match makes the whole query empty, so those terms are
+  matched with icontains instead.
+- SQLite: FTS5 external-content table kept in sync by triggers.
+- Other backends fall back to icontains.
+
+InnoDB only indexes committed rows, so writes become searchable at commit.
+The index, table and triggers are created by migration 0002, which keeps
+its own copy of the DDL; this module is only used at runtime.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from todos.models import Task
+
+TASK_TABLE = Task._meta.db_table
+FTS_TABLE = "todos_task_fts"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"title, description, content='{TASK_TABLE}', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TASK_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TASK_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    f"VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON {TASK_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    f"VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+
+def search_terms(text: str) -> list[str]:
+    return _TERM_RE.findall(text or "")
+
+
+# alias -> (innodb_ft_min_token_size, stopwords), read once per process
+_mysql_fulltext_config = {}
+
+
+def _mysql_fulltext(alias: str) -> tuple[int, frozenset]:
+    config = _mysql_fulltext_config.get(alias)
+    if config is None:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT @@innodb_ft_min_token_size, @@innodb_ft_enable_stopword, @@innodb_ft_server_stopword_table"
+            )
+            min_token_size, enabled, table = cursor.fetchone()
+            stopwords = frozenset()
+            if enabled:
+                if table:
+                    schema, name = table.split("/", 1)
+                    cursor.execute(f"SELECT value FROM `{schema}`.`{name}`")
+                else:
+                    cursor.execute("SELECT value FROM INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD")
+                stopwords = frozenset(value.lower() for value, in cursor.fetchall())
+        config = _mysql_fulltext_config[alias] = (int(min_token_size), stopwords)
+    return config
+
+
+def _mysql_split(terms: list[str], min_token_size: int, stopwords: frozenset) -> tuple[list[str], list[str]]:
+    """(terms the FULLTEXT index can match, terms it never indexes)."""
+    indexed, unindexed = [], []
+    for term in terms:
+        if len(term) < min_token_size or term.lower() in stopwords:
+            unindexed.append(term)
+        else:
+            indexed.append(term)
+    return indexed, unindexed
+
+
+def _mysql_query(terms: list[str]) -> str:
+    return " ".join(f"+{term}*" for term in terms)
+
+
+def _sqlite_query(terms: list[str]) -> str:
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_tasks(qs, text: str, rank: bool = False):
+    """
+    Filter a Task queryset to rows matching every term in `text`.
+    With rank=True, also annotate a `relevance` score (higher is better).
+    """
+    terms = search_terms(text)
+    if not terms:
+        return qs.none()
+    vendor = connections[qs.db].vendor
+    if vendor == "mysql":
+        terms, unindexed = _mysql_split(terms, *_mysql_fulltext(qs.db))
+        qs = _contains_all(qs, unindexed)
+        if not terms:
+            return qs.annotate(relevance=Value(0.0, output_field=FloatField())) if rank else qs
+        match = f"MATCH ({TASK_TABLE}.title, {TASK_TABLE}.description) AGAINST (%s IN BOOLEAN MODE)"
+        query = _mysql_query(terms)
+        qs = qs.filter(RawSQL(match, (query,), output_field=BooleanField()))
+        if rank:
+            qs = qs.annotate(relevance=RawSQL(match, (query,), output_field=FloatField()))
+        return qs
+    if vendor == "sqlite":
+        query = _sqlite_query(terms)
+        qs = qs.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (query,))
+        )
+        if rank:
+            # bm25() is lower-is-better; negate so relevance sorts like MySQL's score.
+            qs = qs.annotate(relevance=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {TASK_TABLE}.id",
+                (query,),
+                output_field=FloatField(),
+            ))
+        return qs
+    qs = _contains_all(qs, terms)
+    if rank:
+        qs = qs.annotate(relevance=Value(0.0, output_field=FloatField()))
+    return qs
+
+
+def _contains_all(qs, terms: list[str]):
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description__icontains=term)
+    return qs.filter(condition)
+
+
+def install_sqlite_fts(conn):
+    """
+    (Re)create the FTS5 table and triggers. SQLite migrations that rebuild
+    todos_task drop its triggers, so this runs after every migrate and
+    rebuilds the index whenever triggers had to be recreated.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+            (f"{FTS_TABLE}_a_",),
+        )
+        missing = cursor.fetchone()[0] < 3
+        for statement in _SQLITE_FTS_SQL:
+            cursor.execute(statement)
+        if missing:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def ensure_sqlite_fts(sender, using, **kwargs):
+    """post_migrate hook: restore FTS triggers after SQLite table rebuilds."""
+    conn = connections[using]
+    if conn.vendor == "sqlite" and TASK_TABLE in conn.introspection.table_names():
+        install_sqlite_fts(conn)
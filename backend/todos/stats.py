@@ -0,0 +1,135 @@
+"""
+Per-user task counters (TaskStats).
+
+Every Task write applies a delta to the user's TaskStats row inside the
+write's transaction, so the statistics endpoints are one primary-key
+lookup. A missing row is rebuilt from the Task table on first use;
+`manage.py rebuild_task_stats` repairs drift from writes that bypass
+Task.save/delete (queryset.update(), raw SQL, admin bulk actions).
+"""
+from collections import Counter
+
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from todos.models import Task, TaskStats
+
+STATUS_COUNTERS = {
+    "Not Started": "not_started",
+    "In Progress": "in_progress",
+    "Completed": "completed",
+}
+PRIORITY_COUNTERS = {
+    "Extreme": "extreme",
+    "Moderate": "moderate",
+    "Low": "low",
+}
+COUNTER_FIELDS = ("total", *STATUS_COUNTERS.values(), *PRIORITY_COUNTERS.values())
+
+
+def _counters(state) -> Counter:
+    """Counter increments contributed by one task in `state` = (status, priority)."""
+    status, priority = state
+    counts = Counter(total=1)
+    if status in STATUS_COUNTERS:
+        counts[STATUS_COUNTERS[status]] += 1
+    if priority in PRIORITY_COUNTERS:
+        counts[PRIORITY_COUNTERS[priority]] += 1
+    return counts
+
+
+def state_delta(old=None, new=None) -> dict:
+    """Counter changes for a task moving from state `old` to `new` (None = absent)."""
+    delta = Counter()
+    if new is not None:
+        delta.update(_counters(new))
+    if old is not None:
+        delta.subtract(_counters(old))
+    return {field: n for field, n in delta.items() if n}
+
+
+def apply_delta(user_id: int, delta: dict, using=None):
+    """Add `delta` to the user's counters; must run inside the write's transaction."""
+    if not delta:
+        return
+    updated = TaskStats.objects.using(using).filter(user_id=user_id).update(
+        **{field: F(field) + n for field, n in delta.items()}
+    )
+    if not updated:
+        # No row yet: count from source, which already includes this write.
+        rebuild_user_stats(user_id, using=using)
+
+
+def count_tasks(queryset) -> dict:
+    """Counters for a Task queryset, from one grouped query."""
+    counts = Counter()
+    rows = queryset.values_list("status", "priority").annotate(n=Count("id")).order_by()
+    for status, priority, n in rows:
+        for field, value in _counters((status, priority)).items():
+            counts[field] += value * n
+    return {field: counts[field] for field in COUNTER_FIELDS}
+
+
+def rebuild_user_stats(user_id: int, using=None) -> TaskStats:
+    counts = count_tasks(Task.objects.using(using).filter(user_id=user_id))
+    stats, _ = TaskStats.objects.using(using).update_or_create(user_id=user_id, defaults=counts)
+    return stats
+
+
+def get_user_stats(user_id: int) -> TaskStats:
+    try:
+        return TaskStats.objects.get(pk=user_id)
+    except TaskStats.DoesNotExist:
+        return rebuild_user_stats(user_id)
+
+
+def category_counts_queryset(user_id: int, category_ids):
+    return (
+        Task.objects.filter(user_id=user_id, category_id__in=category_ids)
+        .values("category_id")
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="Completed")),
+            overdue=Count("id", filter=Q(due_date__lt=timezone.now()) & ~Q(status="Completed")),
+        )
+        .order_by()
+    )
+
+
+async def last_overdue_at(user_id: int) -> float:
+    """
+    When the most recently overdue of the user's open tasks passed its due
+    date (timestamp; 0.0 if none). Between writes, overdue counts change
+    exactly when this does, so it versions them alongside the change sequence.
+    """
+    passed = (
+        await Task.objects.filter(user_id=user_id, due_date__lt=timezone.now())
+        .exclude(status="Completed")
+        .aaggregate(latest=Max("due_date"))
+    )["latest"]
+    return passed.timestamp() if passed else 0.0
+
+
+def category_task_counts(user_id: int, category_ids) -> dict:
+    """
+    {category_id: {"total", "completed", "overdue"}} over live tasks, in one
+    grouped query on task_user_cat_status_idx. Categories without tasks are absent.
+    """
+    return {row.pop("category_id"): row for row in category_counts_queryset(user_id, category_ids)}
+
+
+def stats_payload(stats: TaskStats) -> dict:
+    """Statistics response shared by v1 and v2."""
+    total = stats.total or 0
+    completed = stats.completed or 0
+    in_progress = stats.in_progress or 0
+    not_started = stats.not_started or 0
+    return {
+        "total": total,
+        "completed": completed,
+        "in_progress": in_progress,
+        "not_started": not_started,
+        "completed_percentage": round((completed / total * 100), 2) if total else 0,
+        "in_progress_percentage": round((in_progress / total * 100), 2) if total else 0,
+        "not_started_percentage": round((not_started / total * 100), 2) if total else 0,
+    }
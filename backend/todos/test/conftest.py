@@ -0,0 +1,21 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username='testuser',
+        email='test@example.com',
+        name='Test User',
+        password='testpass123',
+    )
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    """Store uploads and variants under a per-test MEDIA_ROOT."""
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
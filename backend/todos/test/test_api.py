@@ -1,9 +1,11 @@
 import pytest
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
 from rest_framework.test import APIClient
 from rest_framework import status
 from todos.models import Task, Category
+from todos.search import _mysql_split
 from io import BytesIO
 from PIL import Image
 
@@ -204,6 +206,13 @@ class TestTaskFiltering:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
         assert response.data['results'][0]['priority'] == 'Extreme'
+
+
+
+# Full-text indexes (InnoDB FULLTEXT) only see committed rows.
+@pytest.mark.django_db(transaction=True)
+class TestTaskSearch:
+    """Test full-text task search."""
     
     def test_search_tasks(self, authenticated_client, user):
         """Test searching tasks."""
@@ -224,6 +233,57 @@ class TestTaskFiltering:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
         assert 'Python' in response.data['results'][0]['title']
+    
+    def test_search_ordering_by_relevance(self, authenticated_client, user):
+        """Test ordering=relevance puts the best match first."""
+        Task.objects.create(
+            title='Groceries',
+            description='Buy milk and a birthday cake',
+            user=user,
+        )
+        Task.objects.create(
+            title='Birthday party',
+            description='Birthday cake, birthday candles, birthday card',
+            user=user,
+        )
+        
+        url = reverse('task-list')
+        response = authenticated_client.get(url, {'search': 'birthday', 'ordering': 'relevance'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert response.data['results'][0]['title'] == 'Birthday party'
+    
+    def test_search_follows_updates(self, authenticated_client, user):
+        """Test the search index tracks title changes and deletes."""
+        task = Task.objects.create(title='Old title', description='Desc', user=user)
+        task.title = 'Renamed entry'
+        task.save()
+        
+        url = reverse('task-list')
+        assert len(authenticated_client.get(url, {'search': 'Old'}).data['results']) == 0
+        assert len(authenticated_client.get(url, {'search': 'Renamed'}).data['results']) == 1
+        
+        task.delete()
+        assert len(authenticated_client.get(url, {'search': 'Renamed'}).data['results']) == 0
+    
+    def test_mysql_split_unindexed_terms(self):
+        """Test stopwords and terms below the min token size stay out of the MATCH query."""
+        assert _mysql_split(['The', 'go', 'to', 'market'], 3, frozenset({'the', 'to'})) == (
+            ['market'],
+            ['The', 'go', 'to'],
+        )
+    
+    @pytest.mark.skipif(connection.vendor != 'mysql', reason='InnoDB FULLTEXT only')
+    def test_search_with_stopwords_and_short_terms(self, authenticated_client, user):
+        """Test stopwords and short terms still match instead of emptying the search."""
+        Task.objects.create(title='Go to the market', description='', user=user)
+        Task.objects.create(title='Market research', description='', user=user)
+        
+        url = reverse('task-list')
+        results = authenticated_client.get(url, {'search': 'go to the market'}).data['results']
+        assert [t['title'] for t in results] == ['Go to the market']
+        assert len(authenticated_client.get(url, {'search': 'the'}).data['results']) == 1
 
 
 @pytest.mark.django_db
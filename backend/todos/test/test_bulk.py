@@ -0,0 +1,93 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from todos.api.v2.schemas import TaskBulkUpdate, TaskCreate
+from todos.bulk import apply_bulk
+from todos.models import Task, Category, TaskStats
+from todos.stats import COUNTER_FIELDS, count_tasks
+
+User = get_user_model()
+
+
+@pytest.fixture
+def other_user():
+    return User.objects.create_user(
+        username='otheruser',
+        email='other@example.com',
+        name='Other User',
+        password='testpass123',
+    )
+
+
+@pytest.fixture
+def category(user):
+    return Category.objects.create(name='Work', user=user)
+
+
+def counters_match(user):
+    stats = TaskStats.objects.get(pk=user.pk)
+    source = count_tasks(Task.objects.filter(user=user))
+    return {field: getattr(stats, field) for field in COUNTER_FIELDS} == source
+
+
+@pytest.mark.django_db
+class TestBulkTasks:
+    """Test set-wise bulk create, update and delete."""
+
+    def test_create_reports_ids_in_order(self, user, category):
+        """Test created items get their own ids back, in request order."""
+        results = apply_bulk(user.pk, create=[
+            TaskCreate(title=f'Task {i}', category_id=category.id if i % 2 else None)
+            for i in range(5)
+        ])
+
+        ids = [item['id'] for item in results['create']]
+        assert [item['status'] for item in results['create']] == ['created'] * 5
+        assert [Task.objects.get(pk=pk).title for pk in ids] == [f'Task {i}' for i in range(5)]
+        assert counters_match(user)
+
+    def test_foreign_category_is_item_error(self, user, other_user):
+        """Test another user's category fails only that item."""
+        foreign = Category.objects.create(name='Theirs', user=other_user)
+        results = apply_bulk(user.pk, create=[
+            TaskCreate(title='Mine'),
+            TaskCreate(title='Bad', category_id=foreign.id),
+        ])
+
+        assert results['create'][0]['status'] == 'created'
+        assert results['create'][1]['status'] == 'error'
+        assert Task.objects.filter(user=user).count() == 1
+
+    def test_update_groups_and_counts(self, user):
+        """Test identical updates share one statement and counters follow."""
+        tasks = [Task.objects.create(title=f'T{i}', description='', user=user) for i in range(3)]
+        items = [TaskBulkUpdate(id=t.id, status='Completed') for t in tasks]
+        items.append(TaskBulkUpdate(id=tasks[0].id, title='again'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            results = apply_bulk(user.pk, update=items)
+
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "todos_task"')
+                   or q['sql'].startswith('UPDATE `todos_task`')]
+        assert len(updates) == 1
+        assert [item['status'] for item in results['update']] == ['updated'] * 3 + ['error']
+        assert Task.objects.filter(user=user, status='Completed').count() == 3
+        assert counters_match(user)
+
+    def test_update_and_delete_check_ownership(self, user, other_user):
+        """Test tasks of other users are reported missing and left alone."""
+        theirs = Task.objects.create(title='Theirs', description='', user=other_user)
+        mine = Task.objects.create(title='Mine', description='', user=user)
+
+        results = apply_bulk(
+            user.pk,
+            update=[TaskBulkUpdate(id=theirs.id, title='Hijacked')],
+            delete=[theirs.id, mine.id],
+        )
+
+        assert results['update'][0]['status'] == 'error'
+        assert [item['status'] for item in results['delete']] == ['error', 'deleted']
+        assert Task.objects.get(pk=theirs.pk).title == 'Theirs'
+        assert not Task.objects.filter(pk=mine.pk).exists()
+        assert counters_match(user)
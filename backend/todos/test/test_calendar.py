@@ -0,0 +1,76 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from todos.api.v2.views import TASK_ROW_FIELDS
+from todos.models import Task
+from todos.schedule import InvalidWindow, day_counts, window, window_tasks
+
+User = get_user_model()
+
+
+def due(user, title, when, **kwargs):
+    return Task.objects.create(title=title, description='', user=user, due_date=when, **kwargs)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.django_db
+class TestCalendar:
+    """Test tasks and per-day counts for a calendar window."""
+
+    def test_days_follow_time_zone(self, user):
+        """Test tasks bucket by local date and the window edges are local midnights."""
+        due(user, 'Late evening', utc(2026, 3, 1, 2, 0), status='Completed')
+        due(user, 'Morning', utc(2026, 3, 1, 15, 0), priority='Extreme')
+        due(user, 'Next month', utc(2026, 4, 1, 5, 0))
+        lower, upper, zone = window(date(2026, 2, 28), date(2026, 3, 31), 'America/New_York')
+
+        tasks = window_tasks(user.pk, lower, upper, TASK_ROW_FIELDS)
+        days = day_counts(user.pk, lower, upper, zone)
+
+        assert [row['title'] for row in tasks] == ['Late evening', 'Morning']
+        assert [(day['date'], day['total'], day['completed'], day['extreme']) for day in days] == [
+            ('2026-02-28', 1, 1, 0),
+            ('2026-03-01', 1, 0, 1),
+        ]
+
+    def test_only_live_tasks_of_user(self, user):
+        """Test other users' tasks, deleted tasks and undated tasks are left out."""
+        other = User.objects.create_user(username='other', email='o@example.com', password='testpass123')
+        due(user, 'Mine', utc(2026, 5, 10, 12))
+        due(other, 'Theirs', utc(2026, 5, 10, 12))
+        due(user, 'Deleted', utc(2026, 5, 10, 12)).delete()
+        due(user, 'Undated', None)
+        lower, upper, zone = window(date(2026, 5, 1), date(2026, 5, 31), 'UTC')
+
+        assert [row['title'] for row in window_tasks(user.pk, lower, upper, TASK_ROW_FIELDS)] == ['Mine']
+        assert [day['total'] for day in day_counts(user.pk, lower, upper, zone)] == [1]
+
+    def test_two_queries_and_cap(self, user):
+        """Test a window costs two queries and the task list stops at its cap."""
+        for hour in range(5):
+            due(user, f'T{hour}', utc(2026, 6, 1, hour))
+        lower, upper, zone = window(date(2026, 6, 1), date(2026, 6, 1), 'UTC')
+
+        with CaptureQueriesContext(connection) as ctx:
+            tasks = window_tasks(user.pk, lower, upper, TASK_ROW_FIELDS, limit=3)
+            days = day_counts(user.pk, lower, upper, zone)
+
+        assert len(ctx.captured_queries) == 2
+        assert len(tasks) == 4  # limit + 1 signals truncation
+        assert days[0]['total'] == 5
+
+    @pytest.mark.parametrize('start,end,tz', [
+        (date(2026, 1, 2), date(2026, 1, 1), 'UTC'),
+        (date(2026, 1, 1), date(2026, 12, 31), 'UTC'),
+        (date(2026, 1, 1), date(2026, 1, 31), 'Mars/Olympus'),
+    ])
+    def test_invalid_window(self, start, end, tz):
+        """Test reversed, oversized and unknown-zone windows are rejected."""
+        with pytest.raises(InvalidWindow):
+            window(start, end, tz)
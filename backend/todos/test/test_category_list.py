@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from todos.api.v2.schemas import CategoryListParams
+from todos.api.v2.views import category_list
+from todos.list_cache import task_list_cache
+from todos.models import Category, Task
+
+
+class FakeRequest:
+    """Minimal stand-in for a Bolt request."""
+
+    scope = {'scheme': 'http', 'server': ('testserver', 80)}
+    path = '/api/v2/categories/'
+    query = {}
+    headers = {}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    task_list_cache.reset()
+    yield
+    task_list_cache.reset()
+
+
+def page(user, **params):
+    response = async_to_sync(category_list)(FakeRequest(), CategoryListParams(**params), user_id=user.pk)
+    return response.content
+
+
+@pytest.mark.django_db
+class TestCategoryList:
+    """Test the paginated v2 category list and its task counts."""
+
+    def test_pages(self, user):
+        """Test pages follow name order and say where the next one starts."""
+        for name in ['C', 'A', 'B']:
+            Category.objects.create(name=name, user=user)
+
+        first = page(user, limit=2)
+        last = page(user, limit=2, offset=2)
+
+        assert [c['name'] for c in first['results']] == ['A', 'B']
+        assert (first['count'], first['next_offset']) == (3, 2)
+        assert [c['name'] for c in last['results']] == ['C']
+        assert last['next_offset'] is None
+
+    def test_counts(self, user):
+        """Test total, completed and overdue counts over live tasks, in one grouped query."""
+        work = Category.objects.create(name='Work', user=user)
+        empty = Category.objects.create(name='Zzz', user=user)
+        past = timezone.now() - timedelta(days=1)
+        Task.objects.create(title='Late', description='', user=user, category=work, due_date=past)
+        Task.objects.create(title='Done', description='', user=user, category=work, due_date=past,
+                            status='Completed')
+        Task.objects.create(title='Gone', description='', user=user, category=work).delete()
+
+        with CaptureQueriesContext(connection) as ctx:
+            results = page(user, with_counts=True)['results']
+
+        counts = [q['sql'] for q in ctx.captured_queries if 'GROUP BY' in q['sql']]
+        assert len(counts) == 1
+        assert results[0]['task_counts'] == {'total': 2, 'completed': 1, 'overdue': 1}
+        assert results[1]['id'] == empty.id
+        assert results[1]['task_counts'] == {'total': 0, 'completed': 0, 'overdue': 0}
+        assert 'task_counts' not in page(user)['results'][0]
+
+    def test_cached_until_a_write(self, user):
+        """Test repeat reads are cached and a task write invalidates them."""
+        work = Category.objects.create(name='Work', user=user)
+        page(user, with_counts=True)
+
+        with CaptureQueriesContext(connection) as ctx:
+            page(user, with_counts=True)
+        assert len(ctx.captured_queries) == 2  # the data version and the last passed due date
+
+        Task.objects.create(title='New', description='', user=user, category=work)
+        assert page(user, with_counts=True)['results'][0]['task_counts']['total'] == 1
+
+    def test_overdue_follows_the_clock(self, user, monkeypatch):
+        """Test a due date passing without a write refreshes the counts and the ETag."""
+        work = Category.objects.create(name='Work', user=user)
+        now = timezone.now()
+        Task.objects.create(title='Soon', description='', user=user, category=work,
+                            due_date=now + timedelta(hours=1))
+        params = CategoryListParams(with_counts=True)
+        before = async_to_sync(category_list)(FakeRequest(), params, user_id=user.pk)
+        assert before.content['results'][0]['task_counts']['overdue'] == 0
+
+        monkeypatch.setattr(timezone, 'now', lambda: now + timedelta(hours=2))
+        request = FakeRequest()
+        request.headers = {'if-none-match': before.headers['ETag']}
+        after = async_to_sync(category_list)(request, params, user_id=user.pk)
+
+        assert after.status_code == 200
+        assert after.content['results'][0]['task_counts']['overdue'] == 1
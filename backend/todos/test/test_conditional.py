@@ -0,0 +1,98 @@
+from email.utils import formatdate
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from todos.versioning import get_data_version
+from todos.models import Task, Category
+from todos.api.v2.conditional import validators
+
+
+class FakeRequest:
+    """Minimal stand-in for a Bolt request."""
+
+    scope = {'scheme': 'http', 'server': ('testserver', 80)}
+
+    def __init__(self, path='/api/v2/todos/', query=None, headers=None):
+        self.path = path
+        self.query = query or {}
+        self.headers = headers or {}
+
+
+def check(user, **kwargs):
+    return async_to_sync(validators)(FakeRequest(**kwargs), user.pk)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Test ETag / Last-Modified validators for v2 reads."""
+
+    def test_matching_etag_is_fresh(self, user):
+        """Test If-None-Match with the current ETag is a 304."""
+        headers, fresh = check(user)
+        assert not fresh
+
+        _, fresh = check(user, headers={'if-none-match': headers['ETag']})
+        assert fresh
+
+    def test_task_write_invalidates(self, user):
+        """Test a task write changes the ETag."""
+        headers, _ = check(user)
+        Task.objects.create(title='New', description='', user=user)
+
+        new_headers, fresh = check(user, headers={'if-none-match': headers['ETag']})
+        assert not fresh
+        assert new_headers['ETag'] != headers['ETag']
+
+    def test_category_write_invalidates(self, user):
+        """Test a category write changes the ETag."""
+        headers, _ = check(user)
+        Category.objects.create(name='Home', user=user)
+
+        _, fresh = check(user, headers={'if-none-match': headers['ETag']})
+        assert not fresh
+
+    def test_version_is_the_committed_sequence(self, user):
+        """Test validators survive a cache flush, as another worker would see them."""
+        Task.objects.create(title='New', description='', user=user)
+        headers, _ = check(user)
+        caches['default'].clear()
+
+        _, fresh = check(user, headers={'if-none-match': headers['ETag']})
+        assert fresh
+
+    def test_etag_varies_by_query(self, user):
+        """Test different filters never share an ETag."""
+        headers, _ = check(user, query={'status': 'Completed'})
+        other, _ = check(user, query={'status': 'In Progress'})
+
+        assert headers['ETag'] != other['ETag']
+
+    def test_if_modified_since(self, user):
+        """Test If-Modified-Since with the current Last-Modified is a 304."""
+        headers, _ = check(user)
+
+        _, fresh = check(user, headers={'if-modified-since': headers['Last-Modified']})
+        assert fresh
+
+    def test_if_modified_since_same_second(self, user):
+        """Test a header naming the second of the last change is not a 304."""
+        Task.objects.create(title='New', description='', user=user)
+        _, modified = async_to_sync(get_data_version)(user.pk)
+
+        _, fresh = check(user, headers={'if-modified-since': formatdate(int(modified), usegmt=True)})
+        assert not fresh
+
+    def test_no_last_modified_within_the_change_second(self, user, monkeypatch):
+        """Test Last-Modified is withheld until the second of the change is over."""
+        Task.objects.create(title='New', description='', user=user)
+        _, modified = async_to_sync(get_data_version)(user.pk)
+
+        monkeypatch.setattr('todos.api.v2.conditional.time.time', lambda: modified)
+        headers, _ = check(user)
+        assert 'Last-Modified' not in headers
+
+        monkeypatch.setattr('todos.api.v2.conditional.time.time', lambda: int(modified) + 1)
+        headers, _ = check(user)
+        _, fresh = check(user, headers={'if-modified-since': headers['Last-Modified']})
+        assert fresh
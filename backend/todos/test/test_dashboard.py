@@ -0,0 +1,42 @@
+import pytest
+from asgiref.sync import async_to_sync
+from todos.api.v2.schemas import TaskFilters
+from todos.api.v2.views import dashboard
+from todos.models import Category, Task
+
+
+class FakeRequest:
+    """Minimal stand-in for a Bolt request."""
+
+    scope = {'scheme': 'http', 'server': ('testserver', 80)}
+    path = '/api/v2/dashboard/'
+    query = {}
+    headers = {}
+
+
+@pytest.mark.django_db
+class TestDashboard:
+    """Test the combined dashboard payload."""
+
+    def test_sections(self, user):
+        """Test profile, categories, statistics and tasks come back together."""
+        work = Category.objects.create(name='Work', user=user)
+        Task.objects.create(title='Open', description='', user=user, category=work)
+        Task.objects.create(title='Done', description='', user=user, status='Completed')
+
+        payload = async_to_sync(dashboard)(FakeRequest(), TaskFilters(), user_id=user.pk)
+
+        assert payload['user']['username'] == 'testuser'
+        assert [c['name'] for c in payload['categories']] == ['Work']
+        assert payload['statistics']['total'] == 2
+        assert [t['title'] for t in payload['tasks']] == ['Done', 'Open']
+
+    def test_task_filters_apply(self, user):
+        """Test the task section takes the task list's filters."""
+        Task.objects.create(title='Open', description='', user=user)
+        Task.objects.create(title='Done', description='', user=user, status='Completed')
+
+        payload = async_to_sync(dashboard)(FakeRequest(), TaskFilters(status='Completed'), user_id=user.pk)
+
+        assert [t['title'] for t in payload['tasks']] == ['Done']
+        assert payload['statistics']['completed'] == 1
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from todos.api.v2.views import category_detach_progress
+from todos.detach import category_detacher, detach_category
+from todos.models import Category, Task
+
+
+def category_with_tasks(user, n, name='Work'):
+    category = Category.objects.create(name=name, user=user)
+    Task.objects.bulk_create(
+        Task(title=f'T{i}', description='', user=user, category=category) for i in range(n)
+    )
+    return category
+
+
+@pytest.mark.django_db
+class TestDetach:
+    """Test deleted categories' tasks are detached after the delete, in batches."""
+
+    def test_delete_only_schedules(self, user, monkeypatch, django_capture_on_commit_callbacks):
+        """Test the delete leaves tasks alone and queues the category once committed."""
+        submitted = []
+        monkeypatch.setattr(category_detacher, 'submit', lambda *args: submitted.append(args))
+        category = category_with_tasks(user, 3)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category.delete()
+
+        assert submitted == [(category.pk, 'default')]
+        assert Task.objects.filter(category_id=category.pk).count() == 3
+        assert all(task.live_category is None for task in Task.objects.all())
+
+    def test_batches_record_progress(self, user):
+        """Test every batch adds to the category's progress."""
+        category = category_with_tasks(user, 5)
+        category.delete()
+
+        assert detach_category(category.pk, batch_size=2) == 5
+
+        category = Category.all_objects.get(pk=category.pk)
+        assert (category.tasks_to_detach, category.tasks_detached) == (5, 5)
+        assert category.detached_at is not None
+        assert not Task.objects.filter(category_id=category.pk).exists()
+
+    def test_progress_endpoint(self, user):
+        """Test progress is readable for deleted categories only."""
+        category = category_with_tasks(user, 2)
+        category.delete()
+        detach_category(category.pk)
+
+        progress = async_to_sync(category_detach_progress)(category.pk, user_id=user.pk)
+
+        assert (progress['tasks_to_detach'], progress['tasks_detached'], progress['done']) == (2, 2, True)
+
+    def test_command_finishes_pending(self, user):
+        """Test the command detaches categories the worker never got to."""
+        category_with_tasks(user, 2).delete()
+        category_with_tasks(user, 1, name='Home').delete()
+        out = io.StringIO()
+
+        call_command('detach_categories', stdout=out)
+
+        assert 'Detached 3 task(s) from 2 deleted category(ies).' in out.getvalue()
+        assert not Category.all_objects.filter(detached_at__isnull=True).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDetachWorker:
+    """Test the background worker end to end."""
+
+    def test_worker_detaches(self, user):
+        """Test a committed delete is detached by the worker thread."""
+        category = category_with_tasks(user, 3)
+
+        category.delete()
+        category_detacher.shutdown()
+
+        assert Category.all_objects.get(pk=category.pk).tasks_detached == 3
+        assert category_detacher.stats()['pending'] == 0
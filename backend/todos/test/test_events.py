@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db.models import F
+from todos.api.v2.views import _event_stream
+from todos.events import event_bus
+from todos.models import Task, ChangeSequence
+
+
+@pytest.fixture(autouse=True)
+def bus():
+    event_bus.reset()
+    yield event_bus
+    event_bus.reset()
+
+
+def parse(chunk):
+    """(event, id, data) for an SSE message; ('heartbeat', None, None) for a comment."""
+    if chunk.startswith(b':'):
+        return 'heartbeat', None, None
+    fields = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+    return fields['event'], fields.get('id'), json.loads(fields['data'])
+
+
+def create_task(user, title):
+    return sync_to_async(Task.objects.create)(title=title, description='', user=user)
+
+
+class TestEventBus:
+    """Test subscriptions keep the newest sequence number only."""
+
+    def test_publish_from_other_thread_coalesces(self):
+        """Test many publishes from a worker thread wake a waiting stream once."""
+
+        async def scenario():
+            subscription = event_bus.subscribe(1)
+            worker = threading.Thread(target=lambda: [event_bus.publish(1, n) for n in range(1, 101)])
+            worker.start()
+            await sync_to_async(worker.join, thread_sensitive=False)()
+            woke = await subscription.wait(1)
+            again = await subscription.wait(0.01)
+            subscription.close()
+            return woke, again, subscription.seq
+
+        assert async_to_sync(scenario)() == (True, False, 100)
+        assert event_bus.user_ids() == []
+
+    def test_other_users_not_woken(self):
+        """Test a publish only reaches the user's own subscriptions."""
+
+        async def scenario():
+            subscription = event_bus.subscribe(1)
+            event_bus.publish(2, 5)
+            woke = await subscription.wait(0.01)
+            subscription.close()
+            return woke
+
+        assert async_to_sync(scenario)() is False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEventStream:
+    """Test the SSE stream of task changes."""
+
+    def test_changes_then_stats_then_heartbeat(self, user):
+        """Test a committed write is streamed with its token and new counters."""
+
+        async def scenario():
+            subscription = event_bus.subscribe(user.pk)
+            stream = _event_stream(subscription, 0, None, heartbeat=0.05)
+            events = [parse(await anext(stream))]
+            await create_task(user, 'A')
+            for _ in range(3):
+                events.append(parse(await anext(stream)))
+            await stream.aclose()
+            return events
+
+        ready, changes, stats, heartbeat = async_to_sync(scenario)()
+
+        assert ready[0] == 'ready'
+        assert changes[0] == 'changes'
+        assert [task['title'] for task in changes[2]['tasks']] == ['A']
+        assert changes[1] == changes[2]['token']
+        assert stats[0] == 'stats' and stats[2]['total'] == 1
+        assert heartbeat[0] == 'heartbeat'
+        assert event_bus.user_ids() == []
+
+    def test_slow_consumer_gets_one_delta(self, user):
+        """Test writes made while the client is not reading arrive as one event."""
+
+        async def scenario():
+            subscription = event_bus.subscribe(user.pk)
+            stream = _event_stream(subscription, 0, None, heartbeat=0.05)
+            await anext(stream)
+            for title in ('A', 'B', 'C'):
+                await create_task(user, title)
+            event = parse(await anext(stream))
+            await stream.aclose()
+            return event
+
+        event, _, data = async_to_sync(scenario)()
+
+        assert event == 'changes'
+        assert sorted(task['title'] for task in data['tasks']) == ['A', 'B', 'C']
+
+    def test_deletes_are_streamed(self, user):
+        """Test a soft delete arrives as a deleted id."""
+        task = Task.objects.create(title='Gone', description='', user=user)
+        since = ChangeSequence.objects.get(user=user).value
+
+        async def scenario():
+            subscription = event_bus.subscribe(user.pk)
+            stream = _event_stream(subscription, since, None, heartbeat=0.05)
+            await anext(stream)
+            await sync_to_async(task.delete)()
+            event = parse(await anext(stream))
+            await stream.aclose()
+            return event
+
+        assert async_to_sync(scenario)()[2]['deleted']['tasks'] == [task.id]
+
+    def test_token_ahead_resets(self, user):
+        """Test a token the server never issued gets a reset event."""
+        Task.objects.create(title='A', description='', user=user)
+
+        async def scenario():
+            subscription = event_bus.subscribe(user.pk)
+            subscription.notify(1)
+            stream = _event_stream(subscription, 50, None, heartbeat=0.05)
+            await anext(stream)
+            event = parse(await anext(stream))
+            await stream.aclose()
+            return event
+
+        assert async_to_sync(scenario)() == ('reset', '1', {'token': '1'})
+
+    def test_polling_backend_sees_other_workers(self, user, settings):
+        """Test the poll backend picks up sequence changes it was not told about."""
+        settings.TODOS_EVENTS = {'BACKEND': 'poll', 'POLL_INTERVAL': 0.01}
+        Task.objects.create(title='A', description='', user=user)
+
+        async def scenario():
+            subscription = event_bus.subscribe(user.pk)
+            await subscription.wait(1)
+            # A write committed by another process: no publish in this one.
+            await sync_to_async(
+                ChangeSequence.objects.filter(user=user).update
+            )(value=F('value') + 1)
+            woke = await subscription.wait(1)
+            subscription.close()
+            await asyncio.sleep(0.05)  # poller exits once nobody is subscribed
+            return woke, subscription.seq
+
+        assert async_to_sync(scenario)() == (True, 2)
+        assert event_bus.backend.polls > 0
@@ -0,0 +1,157 @@
+import functools
+import io
+import json
+import os
+import tracemalloc
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from todos.api.v2.schemas import TaskImportParams
+from todos.api.v2.views import task_import
+from todos.importer import TaskImporter, iter_records
+from todos.models import Task, Category, TaskStats
+from todos.stats import COUNTER_FIELDS, count_tasks
+from todos.test.test_export import export
+
+
+MEMORY_CEILING = 16 * 1024 * 1024
+
+
+def run_import(user, text, fmt, **kwargs):
+    stream = io.BytesIO(text.encode())
+    return TaskImporter(user.pk, **kwargs).run(iter_records(stream, fmt))
+
+
+class FakeUpload:
+    """Minimal stand-in for a Bolt UploadFile."""
+
+    def __init__(self, data, filename):
+        self.raw_file = io.BytesIO(data)
+        self.filename = filename
+        self.content_type = None
+
+
+def ndjson(records):
+    return ''.join(json.dumps(record) + '\n' for record in records)
+
+
+@pytest.mark.django_db
+class TestTaskImport:
+    """Test streaming CSV/NDJSON task import."""
+
+    def test_csv_rows_and_errors(self, user):
+        """Test valid rows import and invalid rows are reported by row number."""
+        Category.objects.create(name='Work', user=user)
+        text = (
+            'title,priority,status,due_date,category_name\n'
+            'First,Low,Completed,2026-01-02T10:00:00+00:00,Work\n'
+            ',Low,Completed,,\n'
+            'Third,Urgent,,,\n'
+            'Fourth,,,,Missing\n'
+        )
+
+        report = run_import(user, text, 'csv')
+
+        assert (report['processed'], report['created'], report['failed']) == (4, 1, 3)
+        assert [error['row'] for error in report['errors']] == [2, 3, 4]
+        task = Task.objects.get(user=user)
+        assert (task.title, task.priority, task.category.name) == ('First', 'Low', 'Work')
+
+    def test_invalid_utf8(self, user):
+        """Test undecodable bytes are reported as row errors, not raised."""
+        lines = [b'{"title": "First"}\n', b'{"title": "\xff"}\n', b'{"title": "Third"}\n']
+        report = TaskImporter(user.pk).run(iter_records(io.BytesIO(b''.join(lines)), 'ndjson'))
+
+        assert (report['created'], report['failed'], report['errors'][0]['row']) == (2, 1, 2)
+
+        data = b'\xef\xbb\xbftitle\nFirst\nBad \xff\nLast\n'
+        report = TaskImporter(user.pk).run(iter_records(io.BytesIO(data), 'csv'))
+
+        assert (report['created'], report['failed'], report['errors'][0]['row']) == (1, 1, 2)
+        assert 'import stopped' in report['errors'][0]['detail']
+
+    def test_ndjson_chunks_and_counters(self, user):
+        """Test rows insert in fixed-size chunks, one INSERT each, and counters follow."""
+        text = ndjson({'title': f'Task {i}', 'status': 'In Progress'} for i in range(25))
+        text += 'not json\n'
+
+        with CaptureQueriesContext(connection) as ctx:
+            report = run_import(user, text, 'ndjson', chunk_size=10)
+
+        table = connection.ops.quote_name(Task._meta.db_table)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith(f'INSERT INTO {table} ')]
+        assert len(inserts) == 3
+        assert report['created'] == 25
+        assert report['errors'][0]['row'] == 26
+        stats = TaskStats.objects.get(pk=user.pk)
+        source = count_tasks(Task.objects.filter(user=user))
+        assert {field: getattr(stats, field) for field in COUNTER_FIELDS} == source
+
+    def test_endpoint_steps_per_chunk(self, user, monkeypatch):
+        """Test the endpoint hands the executor one chunk at a time."""
+        steps = []
+        step = TaskImporter.step
+        monkeypatch.setattr(TaskImporter, 'step', lambda self, records: steps.append(1) or step(self, records))
+        monkeypatch.setattr('todos.api.v2.views.TaskImporter', functools.partial(TaskImporter, chunk_size=2))
+        upload = FakeUpload(ndjson([{'title': f'T{i}'} for i in range(5)]).encode(), 'tasks.ndjson')
+
+        report = async_to_sync(task_import)(upload, TaskImportParams(), user_id=user.pk)
+
+        assert (report['created'], len(steps)) == (5, 3)
+
+    def test_create_categories(self, user):
+        """Test unknown categories are created once when asked to."""
+        text = ndjson({'title': f'T{i}', 'category_name': 'New'} for i in range(3))
+
+        report = run_import(user, text, 'ndjson', create_categories=True)
+
+        assert report['created'] == 3
+        assert Category.objects.filter(user=user, name='New').count() == 1
+
+    def test_export_round_trip(self, user):
+        """Test a v2 CSV export imports back unchanged."""
+        Category.objects.create(name='Work', user=user)
+        Task.objects.create(title='A', description='x, "y"', priority='Extreme',
+                            category=Category.objects.get(), user=user)
+        body = export(user, format='csv')
+
+        report = run_import(user, body, 'csv')
+
+        assert report['created'] == 1
+        copies = Task.objects.filter(user=user, title='A').values_list(
+            'description', 'priority', 'category__name')
+        assert len(set(copies)) == 1
+
+    def test_command(self, user, tmp_path):
+        """Test the management command imports a file and prints a summary."""
+        path = tmp_path / 'tasks.ndjson'
+        path.write_text(ndjson([{'title': 'From file'}]))
+        out = io.StringIO()
+
+        call_command('import_tasks', str(path), user='testuser', stdout=out)
+
+        assert Task.objects.filter(user=user, title='From file').exists()
+        assert 'Imported 1 of 1 rows' in out.getvalue()
+
+    @pytest.mark.slow
+    def test_memory_flat_for_large_file(self, user, tmp_path):
+        """Test importing a large file stays under a fixed memory ceiling (TODOS_IMPORT_TEST_ROWS=100000 for the full run)."""
+        count = int(os.environ.get('TODOS_IMPORT_TEST_ROWS', 10_000))
+        path = tmp_path / 'tasks.ndjson'
+        with path.open('w') as f:
+            for i in range(count):
+                f.write(json.dumps({'title': f'Task {i}', 'description': 'Imported task'}) + '\n')
+
+        tracemalloc.start()
+        try:
+            with path.open('rb') as stream:
+                report = TaskImporter(user.pk).run(iter_records(stream, 'ndjson'))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert report['created'] == count
+        assert peak < MEMORY_CEILING
@@ -0,0 +1,90 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from django.db.models import F
+from todos.api.v2.schemas import TaskFilters
+from todos.api.v2.views import _cached_task_list_page
+from todos.models import ChangeSequence, Task
+from todos.list_cache import LocalLRUCache, DjangoCacheBackend, task_list_cache
+from todos.versioning import get_data_version
+
+
+FILTERS = (None, None, None, None, '-created_at', 20, 0, 'offset', None, None)
+
+
+@pytest.fixture
+def list_cache():
+    task_list_cache.reset()
+    yield task_list_cache
+    task_list_cache.reset()
+
+
+class TestLocalLRUCache:
+    """Test the in-process LRU backend."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the entry bound drops the least recently used key."""
+        cache = LocalLRUCache(max_entries=2, timeout=60)
+        async_to_sync(cache.aset)('a', 1)
+        async_to_sync(cache.aset)('b', 2)
+        async_to_sync(cache.aget)('a')
+        async_to_sync(cache.aset)('c', 3)
+
+        assert async_to_sync(cache.aget)('a') == 1
+        assert async_to_sync(cache.aget)('b') is None
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        """Test entries are dropped after the TTL."""
+        cache = LocalLRUCache(max_entries=2, timeout=-1)
+        async_to_sync(cache.aset)('a', 1)
+
+        assert async_to_sync(cache.aget)('a') is None
+
+
+@pytest.mark.django_db
+class TestTaskListCache:
+    """Test sequence-keyed task list caching."""
+
+    def test_hit_and_miss_counters(self, user, list_cache):
+        """Test lookups are counted and cached pages are returned."""
+        seq, _ = async_to_sync(get_data_version)(user.pk)
+        assert async_to_sync(list_cache.get)(user.pk, seq, FILTERS) is None
+        async_to_sync(list_cache.set)(user.pk, seq, FILTERS, ['page'])
+
+        assert async_to_sync(list_cache.get)(user.pk, seq, FILTERS) == ['page']
+        assert list_cache.stats()['hits'] == 1
+        assert list_cache.stats()['misses'] == 1
+
+    def test_write_moves_sequence(self, user, list_cache):
+        """Test a task write advances the committed sequence, making earlier entries unreachable."""
+        seq, _ = async_to_sync(get_data_version)(user.pk)
+        async_to_sync(list_cache.set)(user.pk, seq, FILTERS, ['page'])
+        Task.objects.create(title='New', description='', user=user)
+        new_seq, _ = async_to_sync(get_data_version)(user.pk)
+
+        assert new_seq == seq + 1
+        assert async_to_sync(list_cache.get)(user.pk, new_seq, FILTERS) is None
+
+    def test_follows_sequence_committed_elsewhere(self, user, list_cache):
+        """Test a sequence advanced by another worker's commit retires cached pages here."""
+        task = Task.objects.create(title='Old', description='', user=user)
+
+        def titles():
+            version = async_to_sync(get_data_version)(user.pk)
+            page = async_to_sync(_cached_task_list_page)(TaskFilters(), user.pk, None, version)
+            return [t['title'] for t in page]
+
+        assert titles() == ['Old']
+        Task.all_objects.filter(pk=task.pk).update(title='New')
+        assert titles() == ['Old']
+        ChangeSequence.objects.filter(user=user).update(value=F('value') + 1)
+        assert titles() == ['New']
+
+    @override_settings(TODOS_LIST_CACHE={'BACKEND': 'django'})
+    def test_django_backend(self, user, list_cache):
+        """Test the shared backend is selected from settings."""
+        async_to_sync(list_cache.set)(user.pk, 1, FILTERS, ['page'])
+
+        assert isinstance(list_cache.backend, DjangoCacheBackend)
+        assert async_to_sync(list_cache.get)(user.pk, 1, FILTERS) == ['page']
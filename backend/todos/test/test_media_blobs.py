@@ -0,0 +1,146 @@
+import io
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from PIL import Image
+from common.blobs import media_storage, sweep
+from common.models import MediaBlob
+from common.thumbnails import thumbnail_pipeline, variant_name
+from todos.models import Task
+from todos.purge import purge_deleted
+
+
+@pytest.fixture(autouse=True)
+def no_thumbnails(media, monkeypatch):
+    """Every test here stores files; variants are not what they check."""
+    monkeypatch.setattr(thumbnail_pipeline, 'schedule', lambda *args, **kwargs: None)
+
+
+def png(color=(10, 200, 10)):
+    buffer = io.BytesIO()
+    Image.new('RGB', (32, 32), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def with_image(django_capture_on_commit_callbacks):
+    def create(user, data, title='Pic'):
+        with django_capture_on_commit_callbacks(execute=True):
+            return Task.objects.create(title=title, description='', user=user, image=ContentFile(data, name='pic.png'))
+    return create
+
+
+def stored_files(root):
+    return [name for _, _, names in os.walk(os.path.join(root, 'blobs')) for name in names]
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage:
+    """Test uploads are stored once per content with a reference count."""
+
+    def test_duplicates_share_one_blob(self, user, with_image, media):
+        """Test a repeated upload only adds a reference."""
+        first = with_image(user, png())
+        second = with_image(user, png(), title='Copy')
+        other = with_image(user, png((0, 0, 255)), title='Other')
+
+        assert first.image.name == second.image.name != other.image.name
+        assert first.image.name.startswith('blobs/')
+        assert len(stored_files(media)) == 2
+        assert MediaBlob.objects.get(name=first.image.name).refs == 2
+
+    def test_replacing_releases(self, user, with_image, django_capture_on_commit_callbacks):
+        """Test replacing and clearing images release their blobs once committed."""
+        task = with_image(user, png())
+        name = task.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            task.image = ContentFile(png((0, 0, 255)), name='new.png')
+            task.save()
+        assert MediaBlob.objects.get(name=name).refs == 0
+
+        replaced = task.image.name
+        with django_capture_on_commit_callbacks(execute=True):
+            task.image = None
+            task.save()
+        assert MediaBlob.objects.get(name=replaced).refs == 0
+
+    def test_same_content_keeps_one_reference(self, user, with_image, django_capture_on_commit_callbacks):
+        """Test re-uploading identical bytes to the same row adds no reference."""
+        task = with_image(user, png())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            task.image = ContentFile(png(), name='again.png')
+            task.save()
+
+        assert MediaBlob.objects.get(name=task.image.name).refs == 1
+
+    def test_failed_save_adds_no_reference(self, user, monkeypatch, django_capture_on_commit_callbacks):
+        """Test a blob stored by a save whose INSERT fails stays unreferenced."""
+        def failing_insert(*args, **kwargs):
+            raise IntegrityError('insert failed')
+
+        monkeypatch.setattr(Task, '_do_insert', failing_insert)
+        task = Task(title='Pic', description='', user=user, image=ContentFile(png(), name='pic.png'))
+
+        with django_capture_on_commit_callbacks(execute=True), pytest.raises(IntegrityError):
+            task.save()
+
+        assert not MediaBlob.objects.filter(refs__gt=0).exists()
+
+    def test_purge_releases(self, user, with_image):
+        """Test purging deleted tasks releases their images."""
+        task = with_image(user, png())
+        with_image(user, png(), title='Keep')
+        task.delete()
+
+        purge_deleted(retention_days=0)
+
+        assert MediaBlob.objects.get().refs == 1
+
+
+@pytest.mark.django_db
+class TestSweep:
+    """Test batched collection of unreferenced blobs."""
+
+    def test_collects_released_blobs(self, user, with_image, media):
+        """Test a released blob and its thumbnails are deleted; a named one is kept."""
+        gone = with_image(user, png())
+        kept = with_image(user, png((0, 0, 255)), title='Kept')
+        digest = MediaBlob.objects.get(name=gone.image.name).digest
+        plain = media_storage().plain()
+        plain.save(variant_name(digest, 32, 'webp'), ContentFile(b'w'))
+        plain.save(f'thumbs/{digest[:2]}/{digest}.json', ContentFile(b'{"widths": [32], "formats": ["webp"]}'))
+        Task.objects.filter(pk=gone.pk).update(image=None)
+        # Counts are hints: a blob at zero that a row still names survives.
+        MediaBlob.objects.update(refs=0)
+
+        counts = sweep(grace=0, batch_size=1)
+
+        assert (counts['scanned'], counts['collected'], counts['recounted']) == (2, 1, 1)
+        assert list(MediaBlob.objects.values_list('name', 'refs')) == [(kept.image.name, 1)]
+        assert stored_files(media) == [os.path.basename(kept.image.name)]
+        assert os.listdir(os.path.join(media, 'thumbs', digest[:2])) == []
+
+    def test_grace_and_reconcile(self, user, with_image):
+        """Test recent blobs are skipped and --reconcile repairs counts left high."""
+        task = with_image(user, png())
+        Task.all_objects.filter(pk=task.pk).delete()
+
+        assert sweep()['scanned'] == 0
+        assert sweep(grace=0)['scanned'] == 0
+        assert sweep(reconcile=True, grace=0)['collected'] == 1
+        assert not MediaBlob.objects.exists()
+
+    def test_command(self, user, with_image):
+        """Test the command reports what it collected."""
+        task = with_image(user, png())
+        Task.all_objects.filter(pk=task.pk).delete()
+        out = io.StringIO()
+
+        call_command('sweep_media', '--reconcile', '--grace', '0', stdout=out)
+
+        assert 'Collected 1 of 1 blob(s)' in out.getvalue()
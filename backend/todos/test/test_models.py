@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
 from todos.models import Task, Category
+from todos.purge import purge_deleted
 
 User = get_user_model()
 
@@ -151,16 +152,18 @@ class TestModelRelationships:
         assert task in category.tasks.all()
     
     def test_delete_category_sets_task_category_to_null(self, user, category):
-        """Test that deleting a category sets task category to null."""
+        """Test that a deleted category reads as null, and is cleared on purge."""
         task = Task.objects.create(
             title='Test Task',
             description='Description',
             user=user,
             category=category,
         )
-        category_id = category.id
         category.delete()
         
+        task.refresh_from_db()
+        assert task.live_category is None
+        
+        purge_deleted(retention_days=0)
         task.refresh_from_db()
         assert task.category is None
-
@@ -0,0 +1,118 @@
+import pytest
+from asgiref.sync import async_to_sync
+from datetime import timedelta
+from django_bolt.exceptions import BadRequest
+from django.utils import timezone
+from todos.models import Task
+from todos.api.v2.pagination import (
+    InvalidCursor,
+    NEXT,
+    decode_cursor,
+    encode_cursor,
+    order_fields,
+    row_key,
+)
+from todos.api.v2.schemas import ALLOWED_ORDERING, TaskFilters
+from todos.api.v2.views import _task_list_page
+
+
+@pytest.fixture
+def tasks(user):
+    now = timezone.now()
+    created = []
+    for i in range(12):
+        created.append(Task.objects.create(
+            title=f'Task {i % 5}',
+            description='Desc',
+            priority=['Extreme', 'Moderate', 'Low'][i % 3],
+            status=['Not Started', 'In Progress', 'Completed'][i % 3],
+            # Duplicates and NULLs exercise the tiebreakers
+            due_date=None if i % 4 == 0 else now + timedelta(days=i % 3),
+            user=user,
+        ))
+    return created
+
+
+def page(user, ordering, limit, cursor=None):
+    filters = TaskFilters(ordering=ordering, limit=limit, pagination='cursor', cursor=cursor)
+    return async_to_sync(_task_list_page)(filters, user.pk, None)
+
+
+def walk(user, ordering, limit):
+    """Follow next_cursor to the end, then prev_cursor back to the start, through the view helpers."""
+    pages = [page(user, ordering, limit)]
+    assert pages[0]['prev_cursor'] is None
+    while pages[-1]['next_cursor']:
+        pages.append(page(user, ordering, limit, pages[-1]['next_cursor']))
+    forward = [t['id'] for p in pages for t in p['results']]
+    backward = list(pages[-1]['results'])
+    current = pages[-1]
+    while current['prev_cursor']:
+        current = page(user, ordering, limit, current['prev_cursor'])
+        backward[:0] = current['results']
+    return forward, [t['id'] for t in backward]
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    """Test keyset pagination helpers for the v2 task list."""
+
+    @pytest.mark.parametrize('ordering', ALLOWED_ORDERING)
+    def test_pages_cover_every_row_once(self, user, tasks, ordering):
+        """Test forward and backward walks match the full ordered list."""
+        expected = list(Task.objects.filter(user=user).order_by(*order_fields(ordering)).values_list('id', flat=True))
+        forward, backward = walk(user, ordering, limit=5)
+
+        assert forward == expected
+        assert backward == expected
+
+    def test_page_cursors(self, user, tasks):
+        """Test which of next_cursor / prev_cursor each page carries."""
+        first = page(user, '-created_at', 5)
+        middle = page(user, '-created_at', 5, first['next_cursor'])
+        last = page(user, '-created_at', 5, middle['next_cursor'])
+
+        assert (first['prev_cursor'], bool(first['next_cursor'])) == (None, True)
+        assert bool(middle['prev_cursor']) and bool(middle['next_cursor'])
+        assert (bool(last['prev_cursor']), last['next_cursor']) == (True, None)
+        assert len(last['results']) == 2
+        assert page(user, '-created_at', 5, last['prev_cursor'])['results'] == middle['results']
+
+    def test_bad_cursor_is_400(self, user):
+        """Test a cursor the helpers reject becomes a 400, not a server error."""
+        with pytest.raises(BadRequest):
+            page(user, '-created_at', 5, encode_cursor('-created_at', NEXT, ['2026-01-01T00:00:00', 'x']))
+
+    def test_cursor_round_trip(self, tasks):
+        """Test cursors decode back to the row's sort key."""
+        task = tasks[1]
+        cursor = encode_cursor('-due_date', NEXT, row_key('-due_date', task))
+        direction, key = decode_cursor(cursor, '-due_date')
+
+        assert direction == NEXT
+        assert key == [task.due_date, task.id]
+
+    def test_cursor_rejects_other_ordering(self, tasks):
+        """Test a cursor cannot be replayed under a different ordering."""
+        cursor = encode_cursor('title', NEXT, row_key('title', tasks[0]))
+
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, '-title')
+
+    def test_cursor_rejects_garbage(self):
+        """Test malformed cursors raise InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor('not-a-cursor', '-created_at')
+
+    @pytest.mark.parametrize('ordering,values', [
+        ('-created_at', ['2026-01-01T00:00:00+00:00', 'abc']),
+        ('-created_at', ['2026-01-01T00:00:00+00:00', True]),
+        ('-created_at', [None, 1]),
+        ('-created_at', [12, 1]),
+        ('title', [['x'], 1]),
+        ('priority', [{'a': 1}, '2026-01-01T00:00:00+00:00', 1]),
+    ])
+    def test_cursor_rejects_mistyped_keys(self, ordering, values):
+        """Test well-formed cursors with wrongly typed key values raise InvalidCursor."""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(encode_cursor(ordering, NEXT, values), ordering)
@@ -0,0 +1,137 @@
+import json
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from todos.models import Task, Category
+from todos.api.v2.pagination import order_fields
+from todos.api.v2.schemas import ALLOWED_ORDERING
+from todos.api.v2.views import TASK_ROW_FIELDS
+from todos.schedule import window
+from todos.stats import category_counts_queryset
+
+User = get_user_model()
+
+FILTER_SHAPES = ['status', 'priority', 'category']
+
+
+@pytest.fixture
+def seeded_user():
+    """A few users with enough rows that the planner prefers real indexes."""
+    users = [
+        User.objects.create_user(
+            username=f'planuser{i}',
+            email=f'plan{i}@example.com',
+            password='testpass123',
+        )
+        for i in range(3)
+    ]
+    for user in users:
+        category = Category.objects.create(name='Work', user=user)
+        Task.objects.bulk_create(
+            Task(
+                title=f'Task {i}',
+                description='Desc',
+                priority=Task.PRIORITY_CHOICES[i % 3][0],
+                status=Task.STATUS_CHOICES[i % 3][0],
+                user=user,
+                category=category if i % 2 else None,
+            )
+            for i in range(200)
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {Task._meta.db_table}')
+    return users[0]
+
+
+def list_queryset(user, ordering='-created_at', **filters):
+    """Same query shape as the v2 task_list page fetch."""
+    qs = Task.objects.filter(user=user)
+    if 'status' in filters:
+        qs = qs.filter(status=filters['status'])
+    if 'priority' in filters:
+        qs = qs.filter(priority=filters['priority'])
+    if 'category' in filters:
+        qs = qs.filter(category_id=filters['category'])
+    return qs.order_by(*order_fields(ordering)).values(*TASK_ROW_FIELDS)[:20]
+
+
+def plan_problems(qs):
+    """Return the reasons a list query plan would sort or scan, per backend."""
+    table = Task._meta.db_table
+    problems = []
+    if connection.vendor == 'mysql':
+        def walk(node):
+            if isinstance(node, dict):
+                if node.get('using_filesort'):
+                    problems.append('filesort')
+                if node.get('table_name') == table and node.get('access_type') == 'ALL':
+                    problems.append('full table scan')
+                for value in node.values():
+                    walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+        walk(json.loads(qs.explain(format='json')))
+    elif connection.vendor == 'sqlite':
+        plan = qs.explain()
+        if 'USE TEMP B-TREE FOR ORDER BY' in plan:
+            problems.append('filesort')
+        for line in plan.splitlines():
+            if f'SCAN {table} ' in f'{line} ' or line.rstrip().endswith(f'SCAN {table}'):
+                problems.append('full table scan')
+    else:
+        pytest.skip(f'No plan checks for {connection.vendor}')
+    return problems
+
+
+@pytest.mark.django_db
+class TestTaskListQueryPlans:
+    """Every v2 task list query shape must be served by an index, without sorting."""
+
+    @pytest.mark.parametrize('ordering', ALLOWED_ORDERING)
+    def test_ordering_uses_index(self, seeded_user, ordering):
+        """Test each ordering walks an index in order."""
+        assert plan_problems(list_queryset(seeded_user, ordering)) == []
+
+    @pytest.mark.parametrize('shape', FILTER_SHAPES)
+    def test_filter_uses_index(self, seeded_user, shape):
+        """Test each filter with the default ordering walks an index in order."""
+        values = {
+            'status': 'Completed',
+            'priority': 'Low',
+            'category': seeded_user.categories.get().id,
+        }
+        qs = list_queryset(seeded_user, **{shape: values[shape]})
+
+        assert plan_problems(qs) == []
+
+    def test_calendar_uses_index(self, seeded_user):
+        """Test the calendar window is a range scan on the due date index."""
+        lower, upper, _ = window(date(2026, 1, 1), date(2026, 1, 31), 'UTC')
+        qs = (
+            Task.objects.filter(user=seeded_user, due_date__gte=lower, due_date__lt=upper)
+            .order_by('due_date', 'id')
+            .values(*TASK_ROW_FIELDS)
+        )
+
+        assert plan_problems(qs) == []
+
+    def test_sync_uses_index(self, seeded_user):
+        """Test the delta sync scan walks the change sequence index."""
+        qs = (
+            Task.objects.filter(user=seeded_user, change_seq__gt=0)
+            .order_by('change_seq', 'id')
+            .values(*TASK_ROW_FIELDS)
+        )
+
+        assert plan_problems(qs) == []
+
+    def test_category_counts_use_index(self, seeded_user):
+        """Test per-category counts read only the category counts index."""
+        qs = category_counts_queryset(seeded_user.pk, [seeded_user.categories.get().id])
+
+        if connection.vendor == 'sqlite':
+            assert 'COVERING INDEX task_user_cat_status_idx' in qs.explain()
+        assert 'full table scan' not in plan_problems(qs)
@@ -0,0 +1,121 @@
+import io
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from todos.api.v2.schemas import TaskBulkUpdate, TaskCreate
+from todos.bulk import apply_bulk
+from todos.models import Task, TaskDailyStats
+from todos.rollups import resample, trend_rows, trend_window
+from todos.schedule import InvalidWindow
+
+
+def today_row(user):
+    return TaskDailyStats.objects.get(user=user, day=timezone.localdate())
+
+
+@pytest.mark.django_db
+class TestDailyRollups:
+    """Test daily rollups kept by task writes and the nightly command."""
+
+    def test_writes_update_today(self, user):
+        """Test creates count once and completions count net of reopenings."""
+        task = Task.objects.create(title='A', description='', user=user)
+        Task.objects.create(title='B', description='', user=user, status='Completed')
+        task.status = 'Completed'
+        task.save()
+        task.status = 'In Progress'
+        task.save()
+        task.delete()
+
+        row = today_row(user)
+        assert (row.created, row.completed, row.overdue) == (2, 1, None)
+
+    def test_bulk_writes(self, user):
+        """Test bulk creates and updates add to the same row."""
+        keep = Task.objects.create(title='Keep', description='', user=user)
+        apply_bulk(
+            user.pk,
+            create=[TaskCreate(title='Bulk', status='Completed')],
+            update=[TaskBulkUpdate(id=keep.id, status='Completed')],
+        )
+
+        row = today_row(user)
+        assert (row.created, row.completed) == (2, 2)
+
+    def test_command_snapshots_overdue(self, user):
+        """Test the nightly command records overdue and recounts created."""
+        yesterday = timezone.localdate() - timedelta(days=1)
+        past = timezone.now() - timedelta(days=3)
+        Task.objects.create(title='Late', description='', user=user, due_date=past)
+        Task.objects.create(title='Done', description='', user=user, due_date=past, status='Completed')
+        Task.objects.create(title='Later', description='', user=user, due_date=timezone.now() + timedelta(days=3))
+        Task.objects.filter(user=user).update(created_at=past)
+        out = io.StringIO()
+
+        call_command('rollup_task_stats', days=7, stdout=out)
+
+        row = TaskDailyStats.objects.get(user=user, day=yesterday)
+        assert row.overdue == 1
+        assert TaskDailyStats.objects.get(user=user, day=timezone.localdate(past)).created == 3
+        # Today is outside the recount; the live writes' count stands.
+        assert TaskDailyStats.objects.get(user=user, day=timezone.localdate()).created == 3
+        assert f'Rolled up {yesterday}' in out.getvalue()
+
+    def test_trends_read_rollups_only(self, user):
+        """Test the trends read never queries the Task table."""
+        Task.objects.create(title='A', description='', user=user)
+        start, end = trend_window(None, None)
+
+        with CaptureQueriesContext(connection) as ctx:
+            rows = trend_rows(user.pk, start, end)
+
+        assert len(ctx.captured_queries) == 1
+        assert '"todos_task"' not in ctx.captured_queries[0]['sql']
+        assert rows[-1][1] == 1
+
+
+class TestResample:
+    """Test resampling daily rows into day, week and month buckets."""
+
+    rows = [
+        (date(2026, 1, 30), 2, 1, 4),   # Friday
+        (date(2026, 1, 31), 1, 0, None),
+        (date(2026, 2, 2), 3, 2, 6),    # Monday
+        (date(2026, 2, 3), 0, 1, 5),
+    ]
+
+    def test_day(self):
+        """Test daily buckets are dense, with gaps as zero and unknown overdue."""
+        series = resample(self.rows, date(2026, 1, 30), date(2026, 2, 3), 'day')
+
+        assert series['periods'] == ['2026-01-30', '2026-01-31', '2026-02-01', '2026-02-02', '2026-02-03']
+        assert series['created'] == [2, 1, 0, 3, 0]
+        assert series['overdue'] == [4, None, None, 6, 5]
+
+    def test_week(self):
+        """Test weeks start on Monday and overdue is the last snapshot."""
+        series = resample(self.rows, date(2026, 1, 30), date(2026, 2, 3), 'week')
+
+        assert series['periods'] == ['2026-01-26', '2026-02-02']
+        assert series['created'] == [3, 3]
+        assert series['completed'] == [1, 3]
+        assert series['overdue'] == [4, 5]
+
+    def test_month(self):
+        """Test months sum their days."""
+        series = resample(self.rows, date(2026, 1, 1), date(2026, 3, 31), 'month')
+
+        assert series['periods'] == ['2026-01-01', '2026-02-01', '2026-03-01']
+        assert series['created'] == [3, 3, 0]
+        assert series['overdue'] == [4, 5, None]
+
+    def test_window_limits(self):
+        """Test reversed and oversized windows are rejected."""
+        with pytest.raises(InvalidWindow):
+            trend_window(date(2026, 2, 1), date(2026, 1, 1))
+        with pytest.raises(InvalidWindow):
+            trend_window(date(2020, 1, 1), date(2026, 1, 1))
@@ -0,0 +1,47 @@
+import json
+import pytest
+from django.utils import timezone
+from todos.models import Task, Category
+from todos.api.v2.views import (
+    CATEGORY_ROW_FIELDS,
+    TASK_ROW_FIELDS,
+    _category_payload,
+    _task_payload,
+    _task_payloads,
+)
+
+@pytest.fixture
+def category(user):
+    return Category.objects.create(name='Work', color='#FF6767', user=user)
+
+
+@pytest.mark.django_db
+class TestBatchedPayloads:
+    """Test the values()-based list serialization matches the per-row helpers."""
+
+    @pytest.mark.parametrize('base_url', [None, 'http://testserver'])
+    def test_task_payloads_identical(self, user, category, base_url):
+        """Test batched task payloads are byte-identical to _task_payload."""
+        Task.objects.create(title='Plain', description='', user=user)
+        Task.objects.create(
+            title='Full',
+            description='Desc',
+            priority='Extreme',
+            status='Completed',
+            due_date=timezone.now(),
+            image='tasks/photo.jpg',
+            user=user,
+            category=category,
+        )
+        qs = Task.objects.filter(user=user).order_by('-created_at', '-id')
+
+        expected = [_task_payload(t, base_url) for t in qs.select_related('category')]
+        batched = _task_payloads(list(qs.values(*TASK_ROW_FIELDS)), base_url)
+
+        assert json.dumps(batched) == json.dumps(expected)
+
+    def test_category_payloads_identical(self, user, category):
+        """Test category payloads from rows match payloads from instances."""
+        row = Category.objects.filter(pk=category.pk).values(*CATEGORY_ROW_FIELDS).get()
+
+        assert json.dumps(_category_payload(row)) == json.dumps(_category_payload(category))
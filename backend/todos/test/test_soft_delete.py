@@ -0,0 +1,113 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from todos.bulk import apply_bulk
+from todos.models import Task, Category, ChangeSequence, TaskStats
+from todos.purge import purge_deleted
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+    """Test soft delete of tasks and categories."""
+
+    def test_deleted_task_is_hidden(self, user):
+        """Test a deleted task leaves the default manager but keeps its row."""
+        task = Task.objects.create(title='Gone', description='', user=user)
+
+        task.delete()
+
+        assert not Task.objects.filter(pk=task.pk).exists()
+        assert Task.all_objects.get(pk=task.pk).deleted_at is not None
+
+    def test_category_delete_leaves_tasks(self, user):
+        """Test deleting a category does not touch its tasks."""
+        category = Category.objects.create(name='Work', user=user)
+        for i in range(3):
+            Task.objects.create(title=f'T{i}', description='', category=category, user=user)
+
+        category.delete()
+
+        assert Task.objects.filter(category_id=category.id).count() == 3
+        assert all(task.live_category is None for task in Task.objects.filter(user=user))
+
+    def test_category_name_reusable(self, user):
+        """Test a deleted category's name can be used again."""
+        Category.objects.create(name='Work', user=user).delete()
+
+        Category.objects.create(name='Work', user=user)
+
+        assert Category.all_objects.filter(user=user, name='Work').count() == 2
+
+    def test_stats_follow_deletes(self, user):
+        """Test counters drop for single and bulk deletes."""
+        tasks = [Task.objects.create(title=f'T{i}', description='', user=user) for i in range(3)]
+
+        tasks[0].delete()
+        apply_bulk(user.pk, delete=[tasks[1].id])
+
+        assert TaskStats.objects.get(pk=user.pk).total == 1
+        assert Task.all_objects.filter(user=user, deleted_at__isnull=False).count() == 2
+
+    def test_concurrent_deletes_count_once(self, user):
+        """Test a second copy deleting an already deleted row changes nothing."""
+        task = Task.objects.create(title='A', description='', user=user)
+        category = Category.objects.create(name='Work', user=user)
+        copies = [(Task.objects.get(pk=task.pk), Category.objects.get(pk=category.pk)) for _ in range(2)]
+        assert copies[0][0].delete() == (1, {'todos.Task': 1})
+        assert copies[0][1].delete() == (1, {'todos.Category': 1})
+        stamped = (Task.all_objects.get(pk=task.pk).change_seq, Category.all_objects.get(pk=category.pk).change_seq)
+
+        assert copies[1][0].delete() == (0, {})
+        assert copies[1][1].delete() == (0, {})
+        assert (Task.all_objects.get(pk=task.pk).change_seq, Category.all_objects.get(pk=category.pk).change_seq) == stamped
+        assert TaskStats.objects.get(pk=user.pk).total == 0
+
+    def test_sequence_locked_before_row(self, user):
+        """Test delete takes the change sequence lock before touching the task row, as bulk writes do."""
+        task = Task.objects.create(title='A', description='', user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            task.delete()
+
+        def first(model):
+            table = connection.ops.quote_name(model._meta.db_table)
+            return next(i for i, q in enumerate(queries.captured_queries) if table in q['sql'])
+
+        assert first(ChangeSequence) < first(Task)
+
+    def test_purge_removes_expired_rows(self, user):
+        """Test purge detaches tasks, hard-deletes rows and advances the horizon."""
+        category = Category.objects.create(name='Work', user=user)
+        kept = Task.objects.create(title='Kept', description='', category=category, user=user)
+        gone = Task.objects.create(title='Gone', description='', user=user)
+        category.delete()
+        gone.delete()
+        horizon = Task.all_objects.get(pk=gone.pk).change_seq
+
+        counts = purge_deleted(retention_days=0, batch_size=1)
+
+        assert counts == {'categories': 1, 'tasks': 1, 'tasks_detached': 1}
+        assert not Category.all_objects.filter(user=user).exists()
+        assert list(Task.all_objects.filter(user=user)) == [kept]
+        assert Task.objects.get(pk=kept.pk).category_id is None
+        assert ChangeSequence.objects.get(user=user).purged_through == horizon
+
+    def test_purge_keeps_recent_rows(self, user):
+        """Test rows deleted within the retention period are kept."""
+        Task.objects.create(title='Recent', description='', user=user).delete()
+
+        assert purge_deleted(retention_days=30)['tasks'] == 0
+        assert Task.all_objects.filter(user=user).count() == 1
+
+    def test_command(self, user):
+        """Test the management command purges and prints a summary."""
+        Task.objects.create(title='Gone', description='', user=user).delete()
+        out = io.StringIO()
+
+        call_command('purge_deleted', days=0, stdout=out)
+
+        assert not Task.all_objects.filter(user=user).exists()
+        assert 'Purged 1 task(s)' in out.getvalue()
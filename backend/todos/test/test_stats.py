@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from todos.models import ChangeSequence, Task, TaskStats
+from todos.stats import COUNTER_FIELDS, count_tasks, get_user_stats
+
+
+def counters(user):
+    stats = TaskStats.objects.get(pk=user.pk)
+    return {field: getattr(stats, field) for field in COUNTER_FIELDS}
+
+
+def source_counts(user):
+    return count_tasks(Task.objects.filter(user=user))
+
+
+@pytest.mark.django_db
+class TestTaskStatsCounters:
+    """Test per-user counters follow every Task write."""
+
+    def test_create_counts(self, user):
+        """Test creating tasks increments total, status and priority."""
+        Task.objects.create(title='A', description='', status='Completed', priority='Low', user=user)
+        Task.objects.create(title='B', description='', user=user)
+
+        assert counters(user) == source_counts(user)
+        assert counters(user)['completed'] == 1
+        assert counters(user)['moderate'] == 1
+        assert counters(user)['total'] == 2
+
+    def test_status_change_moves_count(self, user):
+        """Test changing status moves one count between buckets."""
+        task = Task.objects.create(title='A', description='', user=user)
+        task = Task.objects.get(pk=task.pk)
+        task.status = 'In Progress'
+        task.priority = 'Extreme'
+        task.save(update_fields=['status', 'priority'])
+
+        assert counters(user) == source_counts(user)
+        assert counters(user)['not_started'] == 0
+        assert counters(user)['in_progress'] == 1
+
+    def test_stale_instances_count_once(self, user):
+        """Test two copies loaded before either write do not double-count."""
+        task = Task.objects.create(title='A', description='', user=user)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = 'Completed'
+        first.save()
+        second.status = 'Completed'
+        second.save()
+
+        assert counters(user) == source_counts(user)
+        assert counters(user)['completed'] == 1
+
+    def test_sequence_locked_before_task_row(self, user):
+        """Test save takes the change sequence lock before reading the task row, as bulk writes do."""
+        task = Task.objects.create(title='A', description='', user=user)
+        task.status = 'Completed'
+
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+
+        def first(model):
+            table = connection.ops.quote_name(model._meta.db_table)
+            return next(i for i, q in enumerate(queries.captured_queries) if table in q['sql'])
+
+        assert first(ChangeSequence) < first(Task)
+
+    def test_update_fields_ignores_unsaved_changes(self, user):
+        """Test fields left out of update_fields do not move counters."""
+        task = Task.objects.create(title='A', description='', user=user)
+        task.status = 'Completed'
+        task.save(update_fields=['title'])
+
+        assert counters(user) == source_counts(user)
+
+    def test_delete_decrements(self, user):
+        """Test deleting a task removes its counts."""
+        task = Task.objects.create(title='A', description='', status='Completed', user=user)
+        Task.objects.get(pk=task.pk).delete()
+
+        assert counters(user) == source_counts(user)
+        assert counters(user)['total'] == 0
+
+    def test_missing_row_is_rebuilt(self, user):
+        """Test stats are recounted from source when the row is missing."""
+        Task.objects.create(title='A', description='', user=user)
+        TaskStats.objects.filter(pk=user.pk).delete()
+
+        assert get_user_stats(user.pk).total == 1
+
+    def test_rebuild_command_repairs_drift(self, user):
+        """Test the repair command recomputes counters from source."""
+        Task.objects.create(title='A', description='', user=user)
+        Task.objects.filter(user=user).update(status='Completed')  # bypasses Task.save
+        assert counters(user) != source_counts(user)
+
+        call_command('rebuild_task_stats', user=[user.pk])
+
+        assert counters(user) == source_counts(user)
@@ -0,0 +1,93 @@
+import pytest
+from todos.api.v2.schemas import TaskBulkUpdate, TaskCreate
+from todos.api.v2.views import CATEGORY_ROW_FIELDS, TASK_ROW_FIELDS
+from todos.bulk import apply_bulk
+from todos.models import Task, Category
+from todos.purge import purge_deleted
+from todos.sync import changes_since, current_seq
+
+
+def delta(user, since, limit=500):
+    return changes_since(user.pk, since, limit, TASK_ROW_FIELDS, CATEGORY_ROW_FIELDS)
+
+
+@pytest.mark.django_db
+class TestDeltaSync:
+    """Test changes since a sync token, with soft-deleted rows as tombstones."""
+
+    def test_only_changes_after_token(self, user):
+        """Test a token returns later writes only, then nothing."""
+        old = Task.objects.create(title='Old', description='', user=user)
+        token = current_seq(user.pk)
+        Task.objects.create(title='New', description='', user=user)
+        old.title = 'Old, renamed'
+        old.save(update_fields=['title'])
+
+        changes = delta(user, token)
+
+        assert sorted(row['title'] for row in changes['tasks']) == ['New', 'Old, renamed']
+        assert delta(user, changes['seq'])['tasks'] == []
+
+    def test_deletes_leave_tombstones(self, user):
+        """Test deleted tasks and categories are reported by id."""
+        category = Category.objects.create(name='Work', user=user)
+        task = Task.objects.create(title='In category', description='', category=category, user=user)
+        gone = Task.objects.create(title='Gone', description='', user=user)
+        token = current_seq(user.pk)
+        gone_id, category_id = gone.id, category.id
+        gone.delete()
+        category.delete()
+
+        changes = delta(user, token)
+
+        assert changes['deleted_tasks'] == [gone_id]
+        assert changes['deleted_categories'] == [category_id]
+        # Soft-deleting the category leaves its tasks untouched.
+        assert changes['tasks'] == []
+        assert Task.objects.get(pk=task.id).category_id == category_id
+
+    def test_bulk_writes_are_tracked(self, user):
+        """Test bulk create, update and delete advance the sequence."""
+        keep = Task.objects.create(title='Keep', description='', user=user)
+        drop = Task.objects.create(title='Drop', description='', user=user)
+        token = current_seq(user.pk)
+        apply_bulk(
+            user.pk,
+            create=[TaskCreate(title='Bulk')],
+            update=[TaskBulkUpdate(id=keep.id, status='Completed')],
+            delete=[drop.id],
+        )
+
+        changes = delta(user, token)
+
+        assert sorted(row['title'] for row in changes['tasks']) == ['Bulk', 'Keep']
+        assert changes['deleted_tasks'] == [drop.id]
+
+    def test_pages_do_not_split_a_write(self, user):
+        """Test paging never cuts through rows sharing one sequence value."""
+        Task.objects.create(title='First', description='', user=user)
+        apply_bulk(user.pk, create=[TaskCreate(title=f'Bulk {i}') for i in range(5)])
+        Task.objects.create(title='Last', description='', user=user)
+
+        first = delta(user, 0, limit=2)
+        second = delta(user, first['seq'], limit=2)
+
+        assert first['has_more'] is True
+        assert len(first['tasks']) == 6
+        assert [row['title'] for row in second['tasks']] == ['Last']
+
+    def test_unknown_token_resets(self, user):
+        """Test a token ahead of the sequence asks the client to reload."""
+        Task.objects.create(title='A', description='', user=user)
+
+        assert delta(user, current_seq(user.pk) + 10)['reset'] is True
+
+    def test_token_before_purge_resets(self, user):
+        """Test a token older than purged rows asks the client to reload."""
+        task = Task.objects.create(title='A', description='', user=user)
+        token = current_seq(user.pk)
+        task.delete()
+        purge_deleted(retention_days=0)
+
+        assert delta(user, token)['reset'] is True
+        assert delta(user, current_seq(user.pk))['reset'] is False
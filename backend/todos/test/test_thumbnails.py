@@ -0,0 +1,145 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from common import thumbnails
+from common.thumbnails import build, render, thumbnail_pipeline
+from todos.api.v2.views import _task_payload
+from todos.models import Task
+
+
+@pytest.fixture
+def variants(settings, media):
+    settings.IMAGE_VARIANTS = {'WIDTHS': [160, 480], 'FORMATS': ['webp', 'jpeg'], 'WORKERS': 1}
+    yield
+    thumbnail_pipeline.shutdown()
+
+
+def png(width, height, color=(200, 30, 30, 128)):
+    buffer = io.BytesIO()
+    Image.new('RGBA', (width, height), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class TestRender:
+    """Test resized variant encoding."""
+
+    def test_widths_and_formats(self):
+        """Test every width is encoded in every format, keeping the aspect ratio."""
+        variants = render(png(1200, 600), [160, 480], ['webp', 'jpeg'], 80)
+
+        assert set(variants) == {(160, 'webp'), (160, 'jpeg'), (480, 'webp'), (480, 'jpeg')}
+        with Image.open(io.BytesIO(variants[(480, 'jpeg')])) as image:
+            assert (image.format, image.size, image.mode) == ('JPEG', (480, 240), 'RGB')
+        with Image.open(io.BytesIO(variants[(160, 'webp')])) as image:
+            assert (image.format, image.mode) == ('WEBP', 'RGBA')
+
+    def test_never_upscales(self):
+        """Test a small image yields one variant at its own width."""
+        variants = render(png(100, 100), [160, 480], ['webp'], 80)
+
+        assert list(variants) == [(100, 'webp')]
+
+
+@pytest.mark.usefixtures('variants')
+class TestBuild:
+    """Test content-addressed variant storage."""
+
+    def test_same_content_renders_once(self):
+        """Test a second upload of identical bytes reuses the stored variants."""
+        calls = []
+
+        def counting_render(*args):
+            calls.append(args)
+            return render(*args)
+
+        data = png(800, 400)
+        first = build(default_storage, default_storage.save('tasks/a.png', ContentFile(data)), counting_render)
+        second = build(default_storage, default_storage.save('tasks/b.png', ContentFile(data)), counting_render)
+
+        assert len(calls) == 1
+        assert first == second
+        assert first['widths'] == [160, 480]
+        assert default_storage.exists(thumbnails.variant_name(first['digest'], 160, 'webp'))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('variants')
+class TestPipeline:
+    """Test variants are built after an upload commits and exposed in payloads."""
+
+    def test_upload_builds_variants(self, user):
+        """Test saving a task image fills image_variants and the payload srcsets."""
+        task = Task.objects.create(title='Pic', description='', user=user,
+                                   image=ContentFile(png(1000, 500), name='pic.png'))
+        thumbnail_pipeline.shutdown()
+
+        task.refresh_from_db()
+        assert task.image_variants['widths'] == [160, 480]
+        payload = _task_payload(task, 'http://testserver')
+        assert payload['thumbnails']['webp'].startswith('http://testserver/media/thumbs/')
+        assert payload['thumbnails']['jpeg'].endswith(' 480w')
+
+    def test_only_image_changes_schedule(self, user, monkeypatch):
+        """Test other saves leave variants alone and a new image clears them."""
+        submitted = []
+        monkeypatch.setattr(thumbnail_pipeline, 'submit', lambda *args: submitted.append(args))
+        task = Task.objects.create(title='Pic', description='', user=user,
+                                   image=ContentFile(png(300, 300), name='pic.png'))
+        Task.objects.filter(pk=task.pk).update(image_variants={'digest': 'x', 'widths': [160], 'formats': ['webp']})
+        task = Task.objects.get(pk=task.pk)
+
+        task.title = 'Renamed'
+        task.save()
+        assert len(submitted) == 1
+        assert Task.objects.get(pk=task.pk).image_variants is not None
+
+        task.image = ContentFile(png(300, 300, (0, 0, 255, 255)), name='other.png')
+        task.save()
+        assert len(submitted) == 2
+        assert Task.objects.get(pk=task.pk).image_variants is None
+
+    def test_new_image_clears_variants_in_one_update(self, user, monkeypatch):
+        """Test replacing an image nulls its variants in the save's own UPDATE."""
+        monkeypatch.setattr(thumbnail_pipeline, 'submit', lambda *args: None)
+        task = Task.objects.create(title='Pic', description='', user=user,
+                                   image=ContentFile(png(300, 300), name='pic.png'))
+        Task.objects.filter(pk=task.pk).update(image_variants={'digest': 'x', 'widths': [160], 'formats': ['webp']})
+        task = Task.objects.get(pk=task.pk)
+        task.image = ContentFile(png(300, 300, (0, 0, 255, 255)), name='other.png')
+
+        with CaptureQueriesContext(connection) as ctx:
+            task.save(update_fields=['image', 'updated_at'])
+
+        table = connection.ops.quote_name(Task._meta.db_table)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(f'UPDATE {table}')]
+        assert len(updates) == 1
+        assert Task.objects.get(pk=task.pk).image_variants is None
+
+    def test_profile_picture(self, user):
+        """Test profile pictures get variants too."""
+        user.profile_picture = ContentFile(png(600, 600), name='me.png')
+        user.save()
+        thumbnail_pipeline.shutdown()
+
+        user.refresh_from_db()
+        assert user.profile_picture_variants['widths'] == [160, 480]
+
+    def test_backfill_command(self, user, monkeypatch):
+        """Test the command builds variants the pipeline never got to."""
+        monkeypatch.setattr(thumbnail_pipeline, 'submit', lambda *args: None)
+        task = Task.objects.create(title='Pic', description='', user=user,
+                                   image=ContentFile(png(500, 500), name='pic.png'))
+        Task.objects.create(title='No pic', description='', user=user)
+        out = io.StringIO()
+
+        call_command('build_thumbnails', stdout=out)
+
+        task.refresh_from_db()
+        assert task.image_variants['widths'] == [160, 480]
+        assert 'Task: built variants for 1 image(s)' in out.getvalue()
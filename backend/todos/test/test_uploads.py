@@ -0,0 +1,94 @@
+import hashlib
+import io
+import os
+
+import pytest
+from PIL import Image
+from common.thumbnails import thumbnail_pipeline
+from common.uploads import UploadRejected, UploadTooLarge, clear_image, inspect_image, store_image
+from todos.models import Task
+
+
+def png(width=64, height=64):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (10, 200, 10)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class TestInspectImage:
+    """Test checking and hashing an upload Bolt has already received."""
+
+    def test_hash_type_and_name(self):
+        """Test the hash and type come from the bytes and the file is rewound, not copied."""
+        data = png()
+        source = io.BytesIO(data)
+        image = inspect_image(source, chunk_size=5)
+
+        assert image.file is source
+        assert image.sha256 == hashlib.sha256(data).hexdigest()
+        assert image.content_type == 'image/png'
+        assert image.name == image.sha256[:32] + '.png'
+        assert image.size == len(data)
+        assert image.read() == data
+
+    @pytest.mark.parametrize('head,content_type', [
+        (b'\xff\xd8\xff\xe0' + bytes(8), 'image/jpeg'),
+        (b'GIF89a' + bytes(6), 'image/gif'),
+        (b'RIFF\x10\x00\x00\x00WEBPVP8 ', 'image/webp'),
+    ])
+    def test_signatures(self, head, content_type):
+        """Test JPEG, GIF and WebP signatures are recognised."""
+        assert inspect_image(io.BytesIO(head + bytes(100))).content_type == content_type
+
+    def test_not_an_image(self):
+        """Test a body without an image signature is rejected."""
+        with pytest.raises(UploadRejected):
+            inspect_image(io.BytesIO(b'<?php echo 1; ?>more'))
+
+    def test_too_large(self):
+        """Test the size limit is checked before anything is read."""
+        with pytest.raises(UploadTooLarge):
+            inspect_image(io.BytesIO(png(400, 400) + bytes(10000)), max_size=2500)
+
+
+@pytest.mark.django_db
+class TestStoreImage:
+    """Test storing uploads on tasks and profiles."""
+
+    def test_task_image(self, user, media, monkeypatch):
+        """Test the upload is written to the field's storage and queues thumbnails."""
+        submitted = []
+        monkeypatch.setattr(thumbnail_pipeline, 'schedule', lambda *args, **kwargs: submitted.append(args))
+        task = Task.objects.create(title='Pic', description='', user=user)
+        seq = task.change_seq
+
+        store_image(task, 'image', io.BytesIO(png()))
+
+        task.refresh_from_db()
+        assert task.image.name.startswith('blobs/') and task.image.name.endswith('.png')
+        assert os.path.exists(os.path.join(media, task.image.name))
+        assert task.change_seq > seq
+        assert len(submitted) == 1
+
+        clear_image(task, 'image')
+        task.refresh_from_db()
+        assert not task.image
+
+    def test_rejected_upload_keeps_image(self, user):
+        """Test a rejected upload leaves the row alone."""
+        task = Task.objects.create(title='Pic', description='', user=user)
+
+        with pytest.raises(UploadRejected):
+            store_image(task, 'image', io.BytesIO(b'not an image at all'))
+
+        task.refresh_from_db()
+        assert not task.image
+
+    def test_profile_picture(self, user, media, monkeypatch):
+        """Test profile pictures go through the same path."""
+        monkeypatch.setattr(thumbnail_pipeline, 'schedule', lambda *args, **kwargs: None)
+
+        store_image(user, 'profile_picture', io.BytesIO(png()))
+
+        user.refresh_from_db()
+        assert user.profile_picture.name.startswith('blobs/')
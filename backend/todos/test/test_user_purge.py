@@ -0,0 +1,104 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.utils import timezone
+from todos.models import Category, ChangeSequence, Task, TaskStats
+from todos.user_purge import Throttle, purge_deleted_users
+
+User = get_user_model()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def deleted_long_ago(user, days=40):
+    user.delete()
+    User.objects.filter(pk=user.pk).update(deleted_at=timezone.now() - timedelta(days=days))
+
+
+def with_data(user, tasks=3):
+    category = Category.objects.create(name='Work', user=user)
+    for i in range(tasks):
+        Task.objects.create(title=f'T{i}', description='', user=user, category=category)
+
+
+@pytest.mark.django_db
+class TestPurgeDeletedUsers:
+    """Test deleted users' data is purged in batches after the retention period."""
+
+    def test_purges_expired_users_only(self, user):
+        """Test only users deleted before the cutoff lose their data."""
+        recent = User.objects.create_user(username='recent', email='r@example.com', password='testpass123')
+        live = User.objects.create_user(username='live', email='l@example.com', password='testpass123')
+        for owner in (user, recent, live):
+            with_data(owner)
+        deleted_long_ago(user)
+        recent.delete()
+
+        counts = purge_deleted_users(batch_size=2, max_rows_per_second=0)
+
+        assert (counts['users'], counts['tasks'], counts['categories']) == (1, 3, 1)
+        assert not Task.all_objects.filter(user=user).exists()
+        assert not Category.all_objects.filter(user=user).exists()
+        assert not TaskStats.objects.filter(user=user).exists()
+        assert not ChangeSequence.objects.filter(user=user).exists()
+        assert User.objects.get(pk=user.pk).data_purged_at is not None
+        assert Task.objects.filter(user__in=[recent, live]).count() == 6
+
+    def test_resumes(self, user, monkeypatch):
+        """Test a run interrupted after a batch picks up the rest next time."""
+        with_data(user, tasks=5)
+        deleted_long_ago(user)
+        real_delete = QuerySet.delete
+        calls = []
+
+        def failing_delete(qs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError('interrupted')
+            return real_delete(qs)
+
+        monkeypatch.setattr(QuerySet, 'delete', failing_delete)
+        with pytest.raises(RuntimeError):
+            purge_deleted_users(batch_size=2, max_rows_per_second=0)
+        monkeypatch.undo()
+
+        assert Task.all_objects.filter(user=user).count() == 3
+        assert purge_deleted_users(batch_size=2, max_rows_per_second=0)['tasks'] == 3
+        assert purge_deleted_users(max_rows_per_second=0)['users'] == 0
+
+    def test_rate_limit(self, user):
+        """Test batches are paced to the configured rows per second."""
+        with_data(user, tasks=4)
+        deleted_long_ago(user)
+        clock = FakeClock()
+        throttle = Throttle(2, clock=clock, sleep=clock.sleep)
+
+        counts = purge_deleted_users(batch_size=2, throttle=throttle)
+
+        assert sum(clock.slept) == pytest.approx(2.5)  # 5 rows at 2 rows/s
+        assert counts['rows_per_second'] == pytest.approx(2.0)
+
+    def test_command(self, user):
+        """Test the command reports rows and throughput."""
+        with_data(user, tasks=1)
+        deleted_long_ago(user)
+        out = io.StringIO()
+
+        call_command('purge_deleted_users', '--max-rows-per-second', '0', stdout=out)
+
+        assert 'Purged 1 task(s) and 1 category(ies) of 1 deleted user(s)' in out.getvalue()
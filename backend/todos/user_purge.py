@@ -0,0 +1,144 @@
+"""
+Hard-delete the tasks and categories of deleted users after a retention period.
+
+User.delete only flags the account. `manage.py purge_deleted_users` (e.g.
+nightly from cron) finds accounts deleted longer than RETENTION_DAYS ago and
+removes their data:
+
+- tasks, then categories, BATCH_SIZE rows per transaction (tasks first,
+  so category deletes have nothing to SET NULL);
+- then their TaskStats, TaskDailyStats and ChangeSequence rows, and the
+  profile picture reference; the User row itself stays.
+
+Task images and the profile picture are released to the media storage
+(common.blobs). Batches are paced to at most MAX_ROWS_PER_SECOND. Every
+batch commits on its own and User.data_purged_at is set last, so an
+interrupted run resumes where it stopped. The last run's figures,
+including rows per second, are in common.metrics under
+"deleted_user_purge".
+
+Settings: TODOS_DELETED_USER_PURGE.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from common import metrics
+from todos.models import Category, ChangeSequence, Task, TaskDailyStats, TaskStats
+from todos.purge import release_task_images
+
+DEFAULTS = {
+    "RETENTION_DAYS": 30,
+    "BATCH_SIZE": 500,
+    "MAX_ROWS_PER_SECOND": 2000,  # 0: no limit
+}
+
+_last_run = {}
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "TODOS_DELETED_USER_PURGE", {})}
+
+
+class Throttle:
+    """Sleeps as needed to keep the running average under `rate` rows per second."""
+
+    def __init__(self, rate: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.clock = clock
+        self.sleep = sleep
+        self.started = clock()
+        self.rows = 0
+
+    def __call__(self, rows: int):
+        self.rows += rows
+        if self.rate:
+            ahead = self.rows / self.rate - (self.clock() - self.started)
+            if ahead > 0:
+                self.sleep(ahead)
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+
+def pending_users(retention_days: int | None = None, using=None):
+    if retention_days is None:
+        retention_days = config()["RETENTION_DAYS"]
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return get_user_model()._base_manager.using(using).filter(
+        is_deleted=True, deleted_at__lt=cutoff, data_purged_at__isnull=True
+    )
+
+
+def _purge_batches(queryset, batch_size: int, throttle: Throttle, using, before_delete=None) -> int:
+    purged = 0
+    while ids := list(queryset.values_list("id", flat=True)[:batch_size]):
+        with transaction.atomic(using=using):
+            rows = queryset.model._base_manager.using(using).filter(id__in=ids)
+            if before_delete:
+                before_delete(rows)
+            rows.delete()
+        purged += len(ids)
+        throttle(len(ids))
+    return purged
+
+
+def purge_user_data(user, batch_size: int, throttle: Throttle, using=None) -> dict:
+    counts = {
+        "tasks": _purge_batches(
+            Task.all_objects.using(using).filter(user_id=user.pk).order_by("id"),
+            batch_size, throttle, using,
+            before_delete=lambda rows: release_task_images(rows, using),
+        ),
+        "categories": _purge_batches(
+            Category.all_objects.using(using).filter(user_id=user.pk).order_by("id"),
+            batch_size, throttle, using,
+        ),
+    }
+    with transaction.atomic(using=using):
+        for model in (TaskStats, TaskDailyStats, ChangeSequence):
+            model.objects.using(using).filter(user_id=user.pk).delete()
+        users = type(user)._base_manager.using(using).filter(pk=user.pk)
+        picture = users.values_list("profile_picture", flat=True).get()
+        release = getattr(type(user)._meta.get_field("profile_picture").storage, "release", None)
+        if picture and release:
+            release([picture], using)
+        users.update(profile_picture=None, profile_picture_variants=None, data_purged_at=timezone.now())
+    return counts
+
+
+def purge_deleted_users(
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    max_rows_per_second: float | None = None,
+    using=None,
+    throttle: Throttle | None = None,
+) -> dict:
+    conf = config()
+    batch_size = batch_size or conf["BATCH_SIZE"]
+    if throttle is None:
+        rate = conf["MAX_ROWS_PER_SECOND"] if max_rows_per_second is None else max_rows_per_second
+        throttle = Throttle(rate)
+    counts = {"users": 0, "tasks": 0, "categories": 0}
+    for user in pending_users(retention_days, using).order_by("deleted_at", "pk").iterator():
+        for key, n in purge_user_data(user, batch_size, throttle, using).items():
+            counts[key] += n
+        counts["users"] += 1
+    elapsed = throttle.elapsed
+    counts["seconds"] = round(elapsed, 3)
+    counts["rows_per_second"] = round((counts["tasks"] + counts["categories"]) / elapsed, 1) if elapsed else 0
+    _last_run.clear()
+    _last_run.update(counts, finished_at=timezone.now().isoformat())
+    return counts
+
+
+def stats() -> dict:
+    return dict(_last_run)
+
+
+metrics.register("deleted_user_purge", stats)
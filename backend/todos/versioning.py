@@ -0,0 +1,19 @@
+"""
+Per-user data version for Task and Category reads.
+
+The version is the user's committed ChangeSequence (value, changed_at), one
+primary-key read. Every Task/Category write takes the next sequence number
+inside its transaction (todos.changes.next_change_seq), so the version moves
+exactly when committed data does and every worker process sees the same one.
+Readers derive ETag/Last-Modified from it and key cached list pages on it.
+"""
+from todos.models import ChangeSequence
+
+
+async def get_data_version(user_id: int) -> tuple[int, float]:
+    """(sequence value, last_modified_timestamp) for the user's task/category data."""
+    row = await ChangeSequence.objects.filter(pk=user_id).values_list("value", "changed_at").afirst()
+    if row is None:
+        return 0, 0.0
+    value, changed_at = row
+    return value, changed_at.timestamp() if changed_at else 0.0